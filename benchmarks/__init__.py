@@ -0,0 +1,3 @@
+# -*- coding: utf-8
+
+# Benchmark suite for the Unke library, run it with: python -m benchmarks --help
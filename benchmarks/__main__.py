@@ -0,0 +1,65 @@
+# -*- coding: utf-8
+
+import argparse
+import json
+import sys
+
+from . import generator
+from . import suite
+
+
+def main(arguments=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Unke benchmark suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmark on a generated document')
+    defaults = generator.Settings()
+    for name in generator.Settings.__slots__:
+        run_parser.add_argument('--' + name.replace('_', '-'), type=type(getattr(defaults, name)),
+                                default=getattr(defaults, name))
+    run_parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs per case')
+    run_parser.add_argument('--case', action='append', dest='cases', help='Case to run, can be repeated')
+    run_parser.add_argument('--output', help='File to write the JSON results to, standard output by default')
+
+    compare_parser = commands.add_parser('compare', help='Compare two results and flag regressions')
+    compare_parser.add_argument('old', help='JSON results of the baseline run')
+    compare_parser.add_argument('new', help='JSON results of the run to check')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='Relative increase that counts as regression, 0.1 by default')
+
+    generate_parser = commands.add_parser('generate', help='Write a generated document to standard output')
+    for name in generator.Settings.__slots__:
+        generate_parser.add_argument('--' + name.replace('_', '-'), type=type(getattr(defaults, name)),
+                                     default=getattr(defaults, name))
+
+    args = parser.parse_args(arguments)
+    if args.command == 'compare':
+        with open(args.old) as file:
+            old = json.load(file)
+        with open(args.new) as file:
+            new = json.load(file)
+        rows = suite.compare(old, new, args.threshold)
+        for row in rows:
+            print('{}{}\t{}\t: {} -> {} ({:+.1f} %)'.format(
+                'REGRESSION ' if row['regression'] else '', row['case'], row['metric'],
+                row['old'], row['new'], row['change'] * 100
+            ))
+        return 1 if any(row['regression'] for row in rows) else 0
+
+    settings = generator.Settings(**{name: getattr(args, name) for name in generator.Settings.__slots__})
+    if args.command == 'generate':
+        sys.stdout.write(generator.generate(settings))
+        return 0
+    results = suite.run(settings, args.repeat, args.cases,
+                        lambda name: print('Running {} ...'.format(name), file=sys.stderr))
+    text = json.dumps(results, indent=4)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
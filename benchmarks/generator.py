@@ -0,0 +1,118 @@
+# -*- coding: utf-8
+
+import random
+import string
+
+
+# Characters of generated names and strings
+_name_characters = string.ascii_letters
+_string_characters = string.ascii_letters + string.digits + ' '
+# The lexer only skips the slashes of single line comments and lexes the rest of the line,
+# so their text must consist of tokens that are valid on a line of their own
+_comment_characters = string.ascii_letters + ' '
+
+
+class Settings:
+    """
+    Shape of a synthetic document
+    """
+    __slots__ = ('width', 'depth', 'properties', 'list_size', 'string_length', 'comment_density', 'seed')
+
+    def __init__(self, width: int = 6, depth: int = 4, properties: int = 4, list_size: int = 8,
+                 string_length: int = 16, comment_density: float = 0.1, seed: int = 0):
+        """
+        :param width: Number of children of every object above the deepest level
+        :param depth: Number of levels below the root object
+        :param properties: Number of properties of every object
+        :param list_size: Number of items of list properties
+        :param string_length: Length of string values
+        :param comment_density: Probability of a comment in front of a line, between 0 and 1
+        :param seed: Seed of the random generator, the same settings always generate the same document
+        """
+        if width < 0 or depth < 0 or properties < 0 or list_size < 0 or string_length < 0:
+            raise ValueError('Document settings must not be negative')
+        if not 0 <= comment_density <= 1:
+            raise ValueError('Comment density must be between 0 and 1')
+        self.width = width
+        self.depth = depth
+        self.properties = properties
+        self.list_size = list_size
+        self.string_length = string_length
+        self.comment_density = comment_density
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @property
+    def object_count(self) -> int:
+        return sum(self.width ** level for level in range(self.depth + 1))
+
+
+def generate(settings: Settings) -> str:
+    """
+    Generate a synthetic Unke document
+    Every object has the same number of properties: ints, floats, booleans, strings and lists
+    of numbers or strings, in turns. Comments are single line or multi-line comments in front of lines.
+    :param settings: Shape of the document
+    :return: Unke text
+    """
+    generator = random.Random(settings.seed)
+    names = [_random_name(generator, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(8)]
+    keys = [_random_name(generator, 'abcdefghijklmnopqrstuvwxyz') for _ in range(max(settings.properties, 1))]
+    lines = []
+
+    def comment(indentation: str):
+        if generator.random() < settings.comment_density:
+            if generator.random() < 0.5:
+                text = _random_string(generator, settings.string_length, _comment_characters)
+                lines.append(indentation + '// ' + text)
+            else:
+                lines.append(indentation + '/* ' + _random_string(generator, settings.string_length) + ' */')
+
+    # Objects to write as (level, name), None closes the object on top
+    stack = [(0, 'Root')]
+    while stack:
+        entry = stack.pop()
+        if entry is None:
+            level = stack.pop()
+            comment('    ' * level)
+            lines.append('    ' * level + '}')
+            continue
+        level, name = entry
+        indentation = '    ' * level
+        comment(indentation)
+        lines.append(indentation + name + ' {')
+        for i in range(settings.properties):
+            comment(indentation + '    ')
+            lines.append('{}    {}: {}'.format(indentation, keys[i], _value(generator, settings, i)))
+        stack.append(level)
+        stack.append(None)
+        if level < settings.depth:
+            stack.extend((level + 1, generator.choice(names)) for _ in range(settings.width))
+    return '\n'.join(lines) + '\n'
+
+
+def _value(generator: random.Random, settings: Settings, kind: int) -> str:
+    kind %= 6
+    if kind == 0:
+        return str(generator.randint(-1000000, 1000000))
+    if kind == 1:
+        return repr(round(generator.uniform(-1000, 1000), 4))
+    if kind == 2:
+        return 'true' if generator.random() < 0.5 else 'false'
+    if kind == 3:
+        return '"{}"'.format(_random_string(generator, settings.string_length))
+    if kind == 4:
+        return '[' + ', '.join(str(generator.randint(0, 1000)) for _ in range(settings.list_size)) + ']'
+    return '[' + ', '.join(
+        '"{}"'.format(_random_string(generator, settings.string_length)) for _ in range(settings.list_size)
+    ) + ']'
+
+
+def _random_name(generator: random.Random, first: str) -> str:
+    return generator.choice(first) + ''.join(generator.choice(string.ascii_lowercase) for _ in range(7))
+
+
+def _random_string(generator: random.Random, length: int, characters: str = _string_characters) -> str:
+    return ''.join(generator.choice(characters) for _ in range(length))
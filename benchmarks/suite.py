@@ -0,0 +1,130 @@
+# -*- coding: utf-8
+
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import unke
+import unke.convert
+
+from . import generator
+
+
+# Version of the result format
+result_version = 1
+
+
+def cases(text: str, doc: unke.Document, filename: str) -> typing.List[typing.Tuple[str, typing.Callable]]:
+    """
+    Benchmark cases as (name, function)
+    :param text: Text of the generated document
+    :param doc: Parsed document
+    :param filename: Generated document on disk
+    :return: List of cases
+    """
+    return [
+        ('lex', lambda: unke.lexer.lex(text)),
+        ('parse', lambda: unke.loads(text)),
+        ('dump', lambda: unke.dumps(doc)),
+        ('dump_minified', lambda: unke.dumps(doc, beautify=False)),
+        ('to_dict', lambda: unke.convert.document_to_dict(doc)),
+        ('to_json', lambda: unke.convert.document_to_json(doc)),
+        ('fingerprint', lambda: unke.changes.Fingerprints().of(doc.root)),
+        ('load', lambda: unke.load(filename))
+    ]
+
+
+def run(settings: generator.Settings, repeat: int = 5, case_names: typing.Iterable[str] = None,
+        progress: typing.Callable = None) -> dict:
+    """
+    Run the benchmark on a generated document
+    Every case is timed repeat times, the fastest run counts. The peak memory is measured in an extra run
+    with tracemalloc, so tracing does not slow down the timed runs.
+    :param settings: Shape of the generated document
+    :param repeat: Number of timed runs per case
+    :param case_names: Names of the cases to run, all cases by default
+    :param progress: Function called with the name of every case before it is run
+    :return: Results that can be stored as JSON
+    """
+    if repeat < 1:
+        raise ValueError('Each case must be run at least once')
+    text = generator.generate(settings)
+    doc = unke.loads(text)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'benchmark.unk')
+        with open(filename, 'w') as file:
+            file.write(text)
+        selected = cases(text, doc, filename)
+        if case_names is not None:
+            case_names = list(case_names)
+            unknown = set(case_names) - set(name for name, function in selected)
+            if unknown:
+                raise ValueError('Unknown benchmark cases: {}'.format(', '.join(sorted(unknown))))
+            selected = [(name, function) for name, function in selected if name in case_names]
+        for name, function in selected:
+            if progress is not None:
+                progress(name)
+            times = []
+            for i in range(repeat):
+                start = time.perf_counter()
+                function()
+                times.append(time.perf_counter() - start)
+            results[name] = {'time': min(times), 'peak_memory': _peak_memory(function)}
+    return {
+        'version': result_version,
+        'unke_version': unke.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': settings.to_dict(),
+        'document': {'size': len(text.encode('utf-8')), 'objects': settings.object_count},
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def _peak_memory(function: typing.Callable) -> int:
+    tracemalloc.start()
+    try:
+        # The result is kept until the peak is taken, like in real use
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+        del result
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1) -> typing.List[dict]:
+    """
+    Compare two benchmark results
+    :param old: Results of the baseline run
+    :param new: Results of the run to check
+    :param threshold: Relative increase of time or peak memory that counts as regression, e.g. 0.1 for 10 %
+    :return: One entry per case and metric, entries have the keys case, metric, old, new, change and regression
+    """
+    for results in (old, new):
+        if results.get('version') != result_version:
+            raise ValueError('Unsupported benchmark result version {}'.format(results.get('version')))
+    if old['settings'] != new['settings']:
+        raise ValueError('The benchmarks were run on different documents')
+    rows = []
+    for case, old_metrics in old['results'].items():
+        new_metrics = new['results'].get(case)
+        if new_metrics is None:
+            continue
+        for metric in ('time', 'peak_memory'):
+            old_value, new_value = old_metrics[metric], new_metrics[metric]
+            change = (new_value - old_value) / old_value if old_value > 0 else 0.0
+            rows.append({
+                'case': case,
+                'metric': metric,
+                'old': old_value,
+                'new': new_value,
+                'change': change,
+                'regression': change > threshold
+            })
+    return rows
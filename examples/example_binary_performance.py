@@ -0,0 +1,47 @@
+# -*- coding: utf-8
+
+import json
+import timeit
+
+import unke
+import unke.convert
+
+
+# Number of copies of the example document body in the test document
+scale_factor = 2000
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+    text = 'Root {' + body * scale_factor + '}\n'
+    doc = unke.loads(text)
+    json_text = unke.convert.document_to_json(doc)
+    data = unke.dumps_binary(doc)
+
+    time_text = timeit.timeit(lambda: unke.loads(text), number=3) / 3
+    time_json = timeit.timeit(lambda: json.loads(json_text), number=3) / 3
+    time_json_document = timeit.timeit(lambda: unke.convert.json_to_document(json_text), number=3) / 3
+    time_binary = timeit.timeit(lambda: unke.loads_binary(data), number=3) / 3
+    time_dumps = timeit.timeit(lambda: unke.dumps(doc), number=3) / 3
+    time_dumps_binary = timeit.timeit(lambda: unke.dumps_binary(doc), number=3) / 3
+
+    print()
+    print('Size[text]\t\t: {} MB'.format(round(len(text.encode('utf-8')) / 1000000, 2)))
+    print('Size[json]\t\t: {} MB'.format(round(len(json_text.encode('utf-8')) / 1000000, 2)))
+    print('Size[binary]\t\t: {} MB'.format(round(len(data) / 1000000, 2)))
+    print()
+    print('t[loads()]\t\t: {}'.format(time_text))
+    print('t[json.loads()]\t\t: {}'.format(time_json))
+    print('t[json_to_document()]\t: {}'.format(time_json_document))
+    print('t[loads_binary()]\t: {}'.format(time_binary))
+    print()
+    print('t[dumps()]\t\t: {}'.format(time_dumps))
+    print('t[dumps_binary()]\t: {}'.format(time_dumps_binary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import timeit
+
+import unke
+
+
+# Number of copies of the example document body in the test document
+scale_factor = 200
+
+# Number of loads per measurement
+load_count = 10
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'cache.unk')
+        with open(filename, 'w') as file:
+            file.write('Root {' + body * scale_factor + '}\n')
+        print('Document size: {} MB'.format(round(os.path.getsize(filename) / 1000000, 2)))
+
+        cache_directory = os.path.join(directory, 'cache')
+        unke.load(filename, cache=unke.Cache(directory=cache_directory))
+        memory_cache = unke.Cache()
+        unke.load(filename, cache=memory_cache)
+
+        time_parse = timeit.timeit(lambda: unke.load(filename), number=load_count)
+        time_memory = timeit.timeit(lambda: unke.load(filename, cache=memory_cache), number=load_count)
+        # A new cache every time, so the documents are loaded from disk
+        time_disk = timeit.timeit(
+            lambda: unke.load(filename, cache=unke.Cache(directory=cache_directory)), number=load_count
+        )
+
+    print()
+    print('t[parse]\t: {}'.format(time_parse))
+    print('t[memory hit]\t: {}'.format(time_memory))
+    print('t[disk hit]\t: {}'.format(time_disk))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8
+
+import time
+import tracemalloc
+
+import unke
+
+
+# Number of objects in the test document
+object_count = 20000
+
+
+class DictObject:
+    """
+    Object type with an instance dict and containers allocated for every object
+    """
+
+    def __init__(self):
+        self.parent = None
+        self.children = []
+        self.name = ''
+        self.properties = {}
+
+
+# DictObject is no subclass of BaseObject, but the parser does not care
+def load_dict_objects(text):
+    return unke.loads(text, object_type=DictObject)
+
+
+def measure(name, function, text, node_count):
+    start = time.perf_counter()
+    function(text)
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    doc = function(text)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del doc
+    print('t[{}]\t: {} ({} bytes per object)'.format(name, duration, round(size / node_count)))
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    text = 'Root {\n' + (
+        '    Sample {\n'
+        '        identifier: 1\n'
+        '        location: "north"\n'
+        '        Sensor { channel: 2 }\n'
+        '        Marker {}\n'
+        '    }\n'
+    ) * object_count + '}\n'
+    node_count = object_count * 3 + 1
+
+    measure('dict objects', load_dict_objects, text, node_count)
+    measure('slotted objects', unke.loads, text, node_count)
+    measure('columnar document', unke.loads_columnar, text, node_count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8
+
+import time
+
+import unke
+import unke.convert
+from unke.dump import object_to_string
+
+
+# Number of copies of the example document body in the wide test document
+scale_factor = 2000
+
+# Nesting depth of the nested test document, far beyond the recursion limit
+nesting_depth = 20000
+
+
+def count_nodes(doc):
+    count = 0
+    stack = [doc.root]
+    while stack:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, unke.BaseObject):
+            stack.extend(value.children)
+            stack.extend(value.properties.values())
+        elif type(value) == list:
+            stack.extend(value)
+    return count
+
+
+def measure(name, function, nodes):
+    start = time.perf_counter()
+    try:
+        function()
+    except RecursionError:
+        print('t[{}]\t: RecursionError'.format(name))
+        return
+    duration = time.perf_counter() - start
+    print('t[{}]\t: {} ({} µs per node)'.format(name, duration, round(duration / nodes * 1000000, 2)))
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+    nested_text = 'Root {' + 'Wrapper { list: [1, ' * nesting_depth + 'Wrapper {}' + ']}' * nesting_depth + '}'
+    documents = (
+        ('wide', unke.loads('Root {' + ('Wrapper {' + body + '}\n') * scale_factor + '}\n')),
+        ('nested', unke.loads(nested_text))
+    )
+
+    for shape, doc in documents:
+        nodes = count_nodes(doc)
+        dict_value = unke.convert.document_to_dict(doc)
+        print()
+        print('{} document: {} nodes'.format(shape, nodes))
+        measure('object_to_string()', lambda: object_to_string(doc.root, 0, 0, False, False), nodes)
+        measure('dumps()', lambda: unke.dumps(doc, False), nodes)
+        measure('document_to_dict()', lambda: unke.convert.document_to_dict(doc), nodes)
+        measure('dict_to_document()', lambda: unke.convert.dict_to_document(dict_value), nodes)
+        measure('document_to_json()', lambda: unke.convert.document_to_json(doc, 0, True), nodes)
+
+
+if __name__ == '__main__':
+    main()
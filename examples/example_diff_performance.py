@@ -0,0 +1,46 @@
+# -*- coding: utf-8
+
+import time
+
+import unke
+import unke.convert
+
+
+# Number of services in the test document
+service_count = 20000
+
+
+def measure(name, function):
+    start = time.perf_counter()
+    result = function()
+    print('t[{}]\t: {}'.format(name, time.perf_counter() - start))
+    return result
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    text = 'Root {\n' + ''.join(
+        '    Service {{\n'
+        '        name: "service{0}"; port: {1}; hosts: ["a{0}", "b{0}"]\n'
+        '        Limits {{ memory: {2}; cpu: 0.5 }}\n'
+        '    }}\n'.format(i, 8000 + i, 1024 * (i % 4 + 1)) for i in range(service_count)
+    ) + '}\n'
+    old = unke.loads(text)
+    new = unke.loads(text)
+
+    # A deep comparison visits every value of both documents, even to find out that nothing changed
+    measure('deep comparison', lambda: unke.convert.document_to_dict(old) == unke.convert.document_to_dict(new))
+    # The first diff fingerprints both documents, with the cache the fingerprints are kept for the next one
+    measure('diff', lambda: unke.diff(old, new, cache=True))
+
+    # Changes made through the document only drop the fingerprints of the objects they affect
+    new.set_property(new.root.children[service_count // 2].children[0], 'memory', 1)
+    new.remove_child(new.root, new.root.children[-1])
+    changes = measure('diff cached', lambda: unke.diff(old, new, cache=True))
+    for change in changes:
+        print(change)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import unke
+from unke.dump import object_to_string
+
+
+# Number of copies of the example document body in the test documents
+scale_factor = 5000
+
+# Nesting depth of the nested test document
+nesting_depth = 300
+
+
+def measure(name, function):
+    start = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start
+    # Tracing slows down the function, so it is measured a second time
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('t[{}]\t: {} ({} MB peak)'.format(name, duration, round(peak / 1000000, 1)))
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+    documents = (
+        ('wide', unke.loads('Root {' + ('Wrapper {' + body + '}\n') * scale_factor + '}\n')),
+        # Every level of the recursive string building copies the strings of the levels below
+        ('nested', unke.loads('Root {' + ('Wrapper {' + body) * nesting_depth + '}' * nesting_depth + '}\n'))
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'dump.unk')
+        for shape, doc in documents:
+            print()
+            print('{} document: {} MB'.format(shape, round(len(unke.dumps(doc)) / 1000000, 2)))
+            measure('object_to_string()', lambda: object_to_string(doc.root))
+            measure('dumps()', lambda: unke.dumps(doc))
+            measure('dump()', lambda: unke.dump(filename, doc))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8
+
+import time
+
+import unke
+
+
+# Number of objects in the test document
+object_count = 50000
+# Number of lookups per measurement
+lookup_count = 20
+
+
+def measure(name, function):
+    start = time.perf_counter()
+    result = function()
+    print('t[{}]\t: {}'.format(name, time.perf_counter() - start))
+    return result
+
+
+def lookups(function):
+    return lambda: [function(i) for i in range(lookup_count)]
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    text = 'Root {\n' + ''.join(
+        '    ListItem {{ id: {}; Label {{ text: "item" }} }}\n'.format(i) for i in range(object_count)
+    ) + '}\n'
+
+    scanned = measure('loads()', lambda: unke.loads(text))
+    indexed = measure('loads(build_index)', lambda: unke.loads(text, build_index=True))
+
+    print()
+    print('{} lookups each'.format(lookup_count))
+    measure('find_all() scan', lookups(lambda i: scanned.find_all('ListItem')))
+    measure('find_all() index', lookups(lambda i: indexed.find_all('ListItem')))
+    measure('find_by() scan', lookups(lambda i: scanned.find_by(id=i * 1000)))
+    measure('find_by() index', lookups(lambda i: indexed.find_by(id=i * 1000)))
+
+
+if __name__ == '__main__':
+    main()
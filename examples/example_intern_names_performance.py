@@ -0,0 +1,62 @@
+# -*- coding: utf-8
+
+import sys
+import time
+
+import unke
+
+
+# Number of objects in the test document
+object_count = 50000
+
+
+def document_size(doc) -> int:
+    # Size of all objects held by the document, shared objects are counted once
+    seen = set()
+    size = 0
+    stack = [doc.root]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, unke.BaseObject):
+            stack.extend((value.name, value.children, value.properties))
+        elif type(value) == list:
+            stack.extend(value)
+        elif type(value) == dict:
+            stack.extend(value.keys())
+            stack.extend(value.values())
+    return size
+
+
+def measure(name, function):
+    start = time.perf_counter()
+    doc = function()
+    duration = time.perf_counter() - start
+    print('t[{}]\t: {} ({} MB)'.format(name, duration, round(document_size(doc) / 1000000, 2)))
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    text = 'Root {\n' + (
+        '    Sample {\n'
+        '        identifier: 1\n'
+        '        temperature: 21.5\n'
+        '        humidity: 0.4\n'
+        '        location: "north"\n'
+        '        Sensor { channel: 2; enabled: true }\n'
+        '    }\n'
+    ) * object_count + '}\n'
+    print('Document size: {} MB'.format(round(len(text) / 1000000, 2)))
+
+    measure('no interning', lambda: unke.loads(text, intern_names=None))
+    measure('document interning', lambda: unke.loads(text))
+    measure('global interning', lambda: unke.loads(text, intern_names='global'))
+    measure('shared keys', lambda: unke.loads(text, shared_keys=True))
+
+
+if __name__ == '__main__':
+    main()
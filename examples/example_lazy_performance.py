@@ -0,0 +1,47 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import time
+
+import unke
+
+
+# Number of copies of the example document body in the test document
+scale_factor = 20000
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+    body = body.replace('ItemOne', 'Wrapper {\n    ItemOne').replace('ItemTwo', '}\n    ItemTwo', 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'lazy.unk')
+        with open(filename, 'w') as file:
+            file.write('Root {' + body * scale_factor + '}\n')
+        print('Document size: {} MB'.format(round(os.path.getsize(filename) / 1000000, 2)))
+
+        start = time.perf_counter()
+        doc = unke.load(filename)
+        doc.root.children[0]
+        time_eager = time.perf_counter() - start
+
+        start = time.perf_counter()
+        doc = unke.load(filename, lazy=True)
+        doc.root.children[0]
+        time_lazy_first = time.perf_counter() - start
+        len(unke.dumps(doc))
+        time_lazy_all = time.perf_counter() - start
+
+    print()
+    print('t[eager]\t\t\t: {}'.format(time_eager))
+    print('t[lazy, first access]\t\t: {}'.format(time_lazy_first))
+    print('t[lazy, everything accessed]\t: {}'.format(time_lazy_all))
+
+
+if __name__ == '__main__':
+    main()
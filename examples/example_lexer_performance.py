@@ -0,0 +1,50 @@
+# -*- coding: utf-8
+
+import timeit
+
+import unke.lexer
+
+
+# Number of copies of the example document body in the scaled up test documents
+scale_factors = (1, 100, 1000, 10000)
+
+
+def scaled_document(text: str, factor: int) -> str:
+    """
+    Repeat the body of the example document inside a single root object
+    :param text: Unke string of the example document
+    :param factor: Number of copies of the document body
+    :return: Scaled up Unke string
+    """
+    body = text[text.index('{') + 1:text.rindex('}')]
+    return 'Root {' + body * factor + '}\n'
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+
+    print()
+    print('size\t\tlegacy\t\tmaster\t\tspeedup')
+    for factor in scale_factors:
+        scaled_text = scaled_document(text, factor)
+        assert unke.lexer.lex(scaled_text) == unke.lexer.lex_legacy(scaled_text)
+        repetitions = max(1, 1000 // factor)
+        time_legacy = timeit.timeit(
+            lambda: unke.lexer.lex_legacy(scaled_text), number=repetitions
+        ) / repetitions
+        time_master = timeit.timeit(
+            lambda: unke.lexer.lex(scaled_text), number=repetitions
+        ) / repetitions
+        print('{} kB\t\t{:.4f} s\t{:.4f} s\t{}x'.format(
+            len(scaled_text) // 1000,
+            time_legacy,
+            time_master,
+            round(time_legacy / time_master, 2)
+        ))
+
+
+if __name__ == '__main__':
+    main()
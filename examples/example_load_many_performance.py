@@ -0,0 +1,53 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import time
+
+import unke
+
+
+# Number of generated config fragments
+fragment_count = 5000
+
+fragment = """/* Generated fragment {index} */
+Service {{
+    name: "service-{index}"
+    port: {port}
+    enabled: true
+    tags: ["a", "b", "c"]
+    Limits {{
+        cpu: 0.5
+        memory: 512
+    }}
+}}
+"""
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+    print('CPU cores: {}'.format(os.cpu_count()))
+
+    with tempfile.TemporaryDirectory() as directory:
+        filenames = []
+        for i in range(fragment_count):
+            filenames.append(os.path.join(directory, 'fragment_{}.unk'.format(i)))
+            with open(filenames[-1], 'w') as file:
+                file.write(fragment.format(index=i, port=8000 + i))
+        print('Fragments: {}'.format(fragment_count))
+        print()
+
+        start = time.perf_counter()
+        for filename in filenames:
+            unke.load(filename)
+        print('t[load() loop]\t\t: {}'.format(time.perf_counter() - start))
+
+        for executor in ('thread', 'process'):
+            start = time.perf_counter()
+            for filename, doc, error in unke.load_many(filenames, executor=executor):
+                pass
+            print('t[load_many(), {}]\t: {}'.format(executor, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
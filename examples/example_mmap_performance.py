@@ -0,0 +1,59 @@
+# -*- coding: utf-8
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import unke
+
+
+# Number of copies of the example document body in the test document
+scale_factor = 20000
+
+
+def measure(filename, mode):
+    """
+    Load the file in this process and print time and peak memory usage
+    """
+    start = time.perf_counter()
+    if 'read' == mode:
+        with open(filename) as file:
+            unke.loads(file.read())
+    elif 'stream' == mode:
+        unke.load(filename)
+    else:
+        unke.load(filename, mmap=True)
+    # Mapped pages are shared with the page cache, they are not part of the peak
+    print('t[{}]\t: {} ({} MB peak RSS)'.format(
+        mode, time.perf_counter() - start, round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1000)
+    ))
+
+
+def main():
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2])
+        return
+
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'mmap.unk')
+        with open(filename, 'w') as file:
+            file.write('Root {' + body * scale_factor + '}\n')
+        print('Document size: {} MB'.format(round(os.path.getsize(filename) / 1000000, 2)))
+        print()
+
+        # Every mode runs in a fresh process, so the peak memory usage is not shared
+        for mode in ('read', 'stream', 'mmap'):
+            subprocess.run([sys.executable, __file__, filename, mode], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8
+
+import time
+
+import unke
+
+
+# Number of children of the root object
+child_count = 20000
+
+
+def measure(name, function):
+    start = time.perf_counter()
+    result = function()
+    print('t[{}]\t: {}'.format(name, time.perf_counter() - start))
+    return result
+
+
+def next_sibling_by_scan(obj):
+    children = obj.parent.children
+    index = next(i for i, child in enumerate(children) if child is obj)
+    return children[index + 1] if index + 1 < len(children) else None
+
+
+def walk_recursive(obj, result):
+    result.append(obj)
+    for child in obj.children:
+        walk_recursive(child, result)
+    return result
+
+
+def letters(number):
+    # Object names consist of letters only
+    result = ''
+    while True:
+        result = chr(ord('A') + number % 26) + result
+        number //= 26
+        if number == 0:
+            return result
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    text = 'Root {\n' + ''.join(
+        '    Item{} {{ Child {{ value: {} }} }}\n'.format(letters(i), i) for i in range(child_count)
+    ) + '}\n'
+    doc = unke.loads(text)
+    children = doc.root.children
+    names = ['Item' + letters(i) for i in range(child_count)]
+    # The linear scans are only measured for a sample, they take quadratic time
+    sample = child_count // 20
+
+    print()
+    print('Next sibling of {} of {} children'.format(sample, child_count))
+    measure('linear scan', lambda: [next_sibling_by_scan(child) for child in children[-sample:]])
+    measure('next_sibling', lambda: [child.next_sibling for child in children[-sample:]])
+
+    print()
+    print('Child by name, {} lookups'.format(sample))
+    measure('linear scan', lambda: [
+        next(child for child in children if child.name == name) for name in names[-sample:]
+    ])
+    measure('find_child', lambda: [doc.root.find_child(name) for name in names[-sample:]])
+
+    print()
+    print('Walking the document')
+    measure('recursion', lambda: walk_recursive(doc.root, []))
+    measure('walk()', lambda: list(doc.root.walk()))
+    measure('walk(breadth first)', lambda: list(doc.root.walk(unke.Order.BreadthFirst)))
+
+
+if __name__ == '__main__':
+    main()
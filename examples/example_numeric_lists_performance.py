@@ -0,0 +1,43 @@
+# -*- coding: utf-8
+
+import random
+import time
+
+import unke
+import unke.numeric
+
+
+# Number of elements of the test lists
+list_length = 1000000
+
+
+def measure(name, function):
+    start = time.perf_counter()
+    result = function()
+    print('t[{}]\t: {}'.format(name, time.perf_counter() - start))
+    return result
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    random.seed(0)
+    texts = (
+        ('int', ', '.join(str(random.randint(-1000000, 1000000)) for _ in range(list_length))),
+        ('float', ', '.join(str(round(random.uniform(-1000, 1000), 6)) for _ in range(list_length)))
+    )
+    list_types = ('array', 'numpy') if unke.numeric.numpy is not None else ('array',)
+
+    for kind, items in texts:
+        text = 'Root {\n    samples: [' + items + ']\n}\n'
+        print()
+        print('{} list of {} elements'.format(kind, list_length))
+        doc = measure('loads()', lambda: unke.loads(text))
+        measure('dumps()', lambda: unke.dumps(doc))
+        for list_type in list_types:
+            doc = measure('loads({})'.format(list_type), lambda: unke.loads(text, numeric_lists=list_type))
+            measure('dumps({})'.format(list_type), lambda: unke.dumps(doc))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import time
+
+import unke
+
+
+# Number of copies of the example document body in the test document
+scale_factor = 20000
+
+# Numbers of worker processes to measure
+worker_counts = (1, 2, 4, 8)
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+    print('CPU cores: {}'.format(os.cpu_count()))
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+    # Wrap the body in a child block, so the root object has many independent children
+    body = 'Wrapper {' + body + '}\n'
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'parallel.unk')
+        with open(filename, 'w') as file:
+            file.write('Root {' + body * scale_factor + '}\n')
+        print('Document size: {} MB'.format(round(os.path.getsize(filename) / 1000000, 2)))
+        print()
+
+        for workers in worker_counts:
+            start = time.perf_counter()
+            unke.load(filename, workers=workers)
+            print('t[{} workers]\t: {}'.format(workers, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
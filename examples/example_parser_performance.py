@@ -0,0 +1,55 @@
+# -*- coding: utf-8
+
+import timeit
+
+import unke
+import unke.lexer
+
+
+# Number of tiny documents parsed in the "many tiny documents" workload
+tiny_document_count = 20000
+
+# Number of copies of the example document body in the "one huge document" workload
+huge_document_factor = 2000
+
+tiny_document = """Root {
+    a: 1
+    Child { b: "x" }
+}
+"""
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+    huge_document = 'Root {' + body * huge_document_factor + '}\n'
+
+    # Lex once, only the parsing is measured
+    tiny_tokens = unke.lexer.lex(tiny_document)
+    huge_tokens = unke.lexer.lex(huge_document)
+    parser = unke.Parser()
+
+    time_tiny_function = timeit.timeit(
+        lambda: unke.parse(tiny_tokens), number=tiny_document_count
+    )
+    time_tiny_reused = timeit.timeit(
+        lambda: parser.parse(tiny_tokens), number=tiny_document_count
+    )
+    time_huge_function = timeit.timeit(lambda: unke.parse(huge_tokens), number=3) / 3
+    time_huge_reused = timeit.timeit(lambda: parser.parse(huge_tokens), number=3) / 3
+
+    print()
+    print('{} tiny documents:'.format(tiny_document_count))
+    print('t[parse()]\t\t: {}'.format(time_tiny_function))
+    print('t[Parser reused]\t: {}'.format(time_tiny_reused))
+    print()
+    print('One huge document ({} tokens):'.format(len(huge_tokens)))
+    print('t[parse()]\t\t: {}'.format(time_huge_function))
+    print('t[Parser reused]\t: {}'.format(time_huge_reused))
+
+
+if __name__ == '__main__':
+    main()
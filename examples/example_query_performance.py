@@ -0,0 +1,68 @@
+# -*- coding: utf-8
+
+import io
+import time
+
+import unke
+import unke.query
+
+
+# Number of objects in the test document
+object_count = 50000
+
+
+def measure(name, function):
+    start = time.perf_counter()
+    result = function()
+    print('t[{}]\t: {}'.format(name, time.perf_counter() - start))
+    return result
+
+
+def manual_children(doc):
+    return [child for item in doc.root.children if item.name == 'Item'
+            for child in item.children if child.name == 'Child' and child.properties.get('value', 0) > 7]
+
+
+def manual_descendants(doc):
+    result = []
+    stack = [doc.root]
+    while stack:
+        obj = stack.pop()
+        if obj.name == 'Child':
+            result.append(obj)
+        stack.extend(obj.children)
+        for value in obj.properties.values():
+            if isinstance(value, unke.BaseObject):
+                stack.append(value)
+            elif type(value) == list:
+                stack.extend(item for item in value if isinstance(item, unke.BaseObject))
+    return result
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    text = 'Root {\n' + ''.join(
+        '    Item {{\n        Child {{ value: {} }}\n        tags: [1, 2, 3]\n    }}\n'.format(i % 10)
+        for i in range(object_count)
+    ) + '}\n'
+    doc = unke.loads(text)
+    children = unke.query.compile('Root/Item/Child[value>7]')
+    descendants = unke.query.compile('//Child')
+
+    print()
+    print('Root/Item/Child[value>7]')
+    measure('manual traversal', lambda: manual_children(doc))
+    measure('query', lambda: children.find_all(doc))
+    measure('loads() and query', lambda: children.find_all(unke.loads(text)))
+    measure('streaming query', lambda: list(children.iterparse(io.StringIO(text))))
+
+    print()
+    print('//Child')
+    measure('manual traversal', lambda: manual_descendants(doc))
+    measure('query', lambda: descendants.find_all(doc))
+    measure('streaming query', lambda: list(descendants.iterparse(io.StringIO(text))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import time
+
+import unke
+
+
+# Number of copies of the example document body in the test document
+scale_factor = 2000
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'source.unk')
+        with open(filename, 'w') as file:
+            file.write('/* Comments and formatting are kept */\nRoot {' + body * scale_factor + '    last: 0\n}\n')
+        print('Document size: {} MB'.format(round(os.path.getsize(filename) / 1000000, 2)))
+
+        start = time.perf_counter()
+        doc = unke.load(filename, track_positions=True)
+        time_load = time.perf_counter() - start
+
+        # Same size, written in place
+        doc.root.properties['last'] = 1
+        start = time.perf_counter()
+        unke.save_changes(doc)
+        time_in_place = time.perf_counter() - start
+
+        # Different size, the file is written to a temporary file that replaces it
+        doc.root.properties['last'] = 'changed'
+        start = time.perf_counter()
+        unke.save_changes(doc)
+        time_resized = time.perf_counter() - start
+
+        start = time.perf_counter()
+        unke.dump(filename, doc)
+        time_dump = time.perf_counter() - start
+
+    print()
+    print('t[load with positions]\t: {}'.format(time_load))
+    print('t[save in place]\t: {}'.format(time_in_place))
+    print('t[save resized]\t: {}'.format(time_resized))
+    print('t[dump]\t\t\t: {}'.format(time_dump))
+
+
+if __name__ == '__main__':
+    main()
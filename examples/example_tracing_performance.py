@@ -0,0 +1,53 @@
+# -*- coding: utf-8
+
+import time
+
+import unke
+
+
+# Number of objects in the test document
+object_count = 10000
+# Each measurement is repeated, the fastest run is reported
+repeat = 5
+
+
+def measure(functions):
+    # The runs of the functions are interleaved, so they are all affected by the noise of the machine alike
+    durations = {name: [] for name in functions}
+    for _ in range(repeat):
+        for name, function in functions.items():
+            start = time.perf_counter()
+            function()
+            durations[name].append(time.perf_counter() - start)
+    for name in functions:
+        print('t[{}]\t: {}'.format(name, min(durations[name])))
+    return {name: min(values) for name, values in durations.items()}
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    text = 'Root {\n' + (
+        '    Sample {\n'
+        '        identifier: 1; values: [1, 2, 3]\n'
+        '        location: "north"\n'
+        '        Sensor { channel: 2; enabled: true }\n'
+        '    }\n'
+    ) * object_count + '}\n'
+
+    # Without a tracer, loads() uses the same parser as before, the only difference is a single check
+    durations = measure({
+        'parser': lambda: unke.Parser().parse(text),
+        'loads': lambda: unke.loads(text),
+        'loads with stats': lambda: unke.loads(text, tracer=unke.Stats())
+    })
+    print('Overhead without tracer: {:.1f} %'.format((durations['loads'] / durations['parser'] - 1) * 100))
+    print('Overhead with stats: {:.1f} %'.format((durations['loads with stats'] / durations['parser'] - 1) * 100))
+
+    stats = unke.Stats()
+    unke.loads(text, tracer=stats, object_created_hook=lambda obj: None)
+    print(stats.to_dict())
+
+
+if __name__ == '__main__':
+    main()
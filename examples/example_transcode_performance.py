@@ -0,0 +1,70 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import unke
+import unke.convert
+
+
+# Number of copies of the example document body in the test document
+scale_factor = 5000
+
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start
+    # Tracing slows down allocations, so the memory is measured in a second run
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak
+
+
+def pipeline_to_json(source: str, destination: str):
+    with open(destination, 'w') as file:
+        file.write(unke.convert.document_to_json(unke.load(source)))
+
+
+def pipeline_from_json(source: str, destination: str):
+    with open(source) as file:
+        text = file.read()
+    with open(destination, 'w') as file:
+        file.write(unke.dumps(unke.convert.json_to_document(text)))
+
+
+def main():
+    print('Please wait ... this will take some time depending on your machine')
+
+    with open('example_performance.unk') as file:
+        text = file.read()
+    body = text[text.index('{') + 1:text.rindex('}')]
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'source.unk')
+        json_filename = os.path.join(directory, 'source.json')
+        destination = os.path.join(directory, 'destination')
+        with open(source, 'w') as file:
+            file.write('Root {' + ('Wrapper {' + body + '}\n') * scale_factor + '}\n')
+        print('Document size: {} MB'.format(round(os.path.getsize(source) / 1000000, 2)))
+
+        unke.convert.transcode_to_json(source, json_filename)
+
+        results = (
+            ('load() + document_to_json()', measure(lambda: pipeline_to_json(source, destination))),
+            ('transcode_to_json()', measure(lambda: unke.convert.transcode_to_json(source, destination))),
+            ('json_to_document() + dumps()', measure(lambda: pipeline_from_json(json_filename, destination))),
+            ('transcode_from_json()', measure(lambda: unke.convert.transcode_from_json(json_filename, destination)))
+        )
+
+    print()
+    for name, (duration, peak) in results:
+        print('{:<32}: {} (peak memory {} MB)'.format('t[{}]'.format(name), duration, round(peak / 1000000, 2)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8
+
+import asyncio
+import os
+import tempfile
+import unittest
+import unke
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class AsyncioTest(unittest.TestCase):
+    def test_load_dump(self):
+        async def main(filename):
+            doc = await unke.aload(example_filename)
+            await unke.adump(filename, doc)
+            return await unke.aload(filename), await unke.aloads(unke.dumps(doc))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'async.unk')
+            doc, doc_from_string = asyncio.run(main(filename))
+        expected = unke.dumps(unke.load(example_filename))
+        self.assertEqual(unke.dumps(doc), expected)
+        self.assertEqual(unke.dumps(doc_from_string), expected)
+
+    def test_aiterparse(self):
+        async def main():
+            return [event async for event in unke.aiterparse(example_filename)]
+
+        self.assertEqual(asyncio.run(main()), list(unke.iterparse(example_filename)))
+
+    def test_event_loop_lag(self):
+        with open(example_filename) as file:
+            text = file.read()
+        body = text[text.index('{') + 1:text.rindex('}')]
+        unke_text = 'Root {' + body * 300 + '}\n'
+
+        async def tick(done: asyncio.Event, ticks: list):
+            # Count the iterations of the event loop
+            while not done.is_set():
+                ticks[0] += 1
+                await asyncio.sleep(0)
+
+        async def main():
+            done = asyncio.Event()
+            ticks = [0]
+            # Ticks seen by each parse whenever it created an object
+            seen = ([], [])
+            ticker = asyncio.create_task(tick(done, ticks))
+            docs = await asyncio.gather(*(
+                unke.aloads(unke_text, object_created_hook=lambda obj, seen=seen[i]: seen.append(ticks[0]))
+                for i in range(2)
+            ))
+            done.set()
+            await ticker
+            return docs, seen
+
+        docs, seen = asyncio.run(main())
+        self.assertEqual(len(docs[0].root.properties), len(unke.loads(unke_text).root.properties))
+        # Parsing blocking the event loop would stop the ticker until the parse is done
+        for ticks in seen:
+            self.assertGreater(ticks[-1], ticks[0])
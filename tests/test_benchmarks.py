@@ -0,0 +1,41 @@
+# -*- coding: utf-8
+
+import unittest
+import unke
+
+from benchmarks import generator
+from benchmarks import suite
+
+
+class BenchmarksTest(unittest.TestCase):
+    def test_generate(self):
+        settings = generator.Settings(width=3, depth=2, properties=7, list_size=3, comment_density=0.5)
+        text = generator.generate(settings)
+        self.assertEqual(text, generator.generate(settings))
+        self.assertIn('//', text)
+        self.assertIn('/*', text)
+        doc = unke.loads(text)
+        self.assertEqual(len(list(doc.root.walk())), settings.object_count)
+        self.assertEqual(len(doc.root.properties), 7)
+        self.assertEqual(len(doc.root.properties[list(doc.root.properties)[4]]), 3)
+        self.assertNotIn('//', generator.generate(generator.Settings(comment_density=0, depth=1)))
+        with self.assertRaises(ValueError):
+            generator.Settings(comment_density=2)
+
+    def test_run_and_compare(self):
+        settings = generator.Settings(width=2, depth=2)
+        old = suite.run(settings, repeat=1)
+        self.assertEqual(set(old['results']), {name for name, function in suite.cases('', None, '')})
+        new = suite.run(settings, repeat=1, case_names=['parse', 'dump'])
+        self.assertEqual(list(new['results']), ['parse', 'dump'])
+        new['results']['parse']['peak_memory'] = old['results']['parse']['peak_memory'] * 2
+        new['results']['dump']['time'] = old['results']['dump']['time']
+        new['results']['dump']['peak_memory'] = old['results']['dump']['peak_memory']
+        rows = suite.compare(old, new, threshold=0.1)
+        self.assertEqual([(row['case'], row['metric']) for row in rows if row['regression']][-1],
+                         ('parse', 'peak_memory'))
+        self.assertFalse(any(row['regression'] for row in rows if row['case'] == 'dump'))
+        with self.assertRaises(ValueError):
+            suite.run(settings, case_names=['unknown'])
+        with self.assertRaises(ValueError):
+            suite.compare(old, suite.run(generator.Settings(width=1, depth=1), repeat=1))
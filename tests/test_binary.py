@@ -0,0 +1,53 @@
+# -*- coding: utf-8
+
+import os
+import unittest
+import unke
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class BinaryTest(unittest.TestCase):
+    def test_round_trip(self):
+        doc = unke.load(example_filename)
+        item = unke.BoostedObject()
+        item.name = None
+        doc.root.properties['values'] = [[1, [2.5, []]], item, 'ü', True, None, -2 ** 70]
+        data = unke.dumps_binary(doc)
+
+        loaded = unke.loads_binary(data)
+        self.assertEqual(unke.dumps(loaded), unke.dumps(doc))
+        self.assertEqual(unke.dumps_binary(loaded), data)
+        values = loaded.root.properties['values']
+        self.assertIsNone(values[1].name)
+        self.assertEqual(values[2:], ['ü', True, None, -2 ** 70])
+        self.assertIs(loaded.root.children[0].parent, loaded.root)
+        self.assertIsNone(values[1].parent)
+        self.assertEqual(unke.dumps(unke.loads_binary(memoryview(data))), unke.dumps(doc))
+
+    def test_deep_nesting(self):
+        depth = 3000
+        for text in ('Root {' + 'Child { p: 1\n' * depth + '}' * depth + '}',
+                     'Root { a: ' + '[' * depth + '1, Item { x: [2] }' + ']' * depth + ' }'):
+            doc = unke.loads(text)
+            names = []
+            loaded = unke.loads_binary(unke.dumps_binary(doc), object_created_hook=lambda obj: names.append(obj.name))
+            self.assertEqual(unke.dumps(loaded, False), unke.dumps(doc, False))
+            self.assertEqual(names[-1], 'Root')
+
+    def test_invalid(self):
+        data = unke.dumps_binary(unke.loads('Root {\n    a: "text"\n}'))
+        for invalid in (b'', b'UNKB', data[:-1], data + b'\0', b'XXXX' + data[4:]):
+            with self.assertRaises(ValueError):
+                unke.loads_binary(invalid)
+        # Headers whose length matches an empty or cut off body
+        header = unke.binary._header_struct
+        for body_size in (0, 1, 5, len(data) - header.size - 1):
+            invalid = header.pack(b'UNKB', 1, body_size) + data[header.size:header.size + body_size]
+            with self.assertRaises(ValueError):
+                unke.loads_binary(invalid)
+        with self.assertRaises(TypeError):
+            doc = unke.loads('Root {}')
+            doc.root.properties['a'] = (1, 2)
+            unke.dumps_binary(doc)
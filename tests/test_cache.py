@@ -0,0 +1,90 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import unittest
+import unke
+import unke.cache
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filenames = []
+        for i in range(3):
+            self.filenames.append(os.path.join(self.directory.name, '{}.unk'.format(i)))
+            self.write(i, 'Root {\n    index: %d\n    Child {}\n}' % i)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, i: int, unke_text: str):
+        with open(self.filenames[i], 'w') as file:
+            file.write(unke_text)
+        # Make sure the modification time changes
+        os.utime(self.filenames[i], ns=(i, 1000000000 * (i + len(unke_text))))
+
+    def test_hits_and_isolation(self):
+        cache = unke.Cache()
+        doc = unke.load(self.filenames[0], cache=cache)
+        doc.root.properties['index'] = 'changed'
+        doc = unke.load(self.filenames[0], cache=cache)
+        self.assertEqual(doc.root.properties['index'], 0)
+        self.assertIs(doc.root.children[0].parent, doc.root)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Changed files are parsed again
+        self.write(0, 'Root {\n    index: 10\n}')
+        self.assertEqual(unke.load(self.filenames[0], cache=cache).root.properties['index'], 10)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        cache.invalidate(self.filenames[0])
+        unke.load(self.filenames[0], cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_eviction(self):
+        cache = unke.Cache(max_entries=2)
+        for filename in self.filenames + self.filenames[2:]:
+            unke.load(filename, cache=cache)
+        self.assertEqual((len(cache), cache.evictions, cache.hits), (2, 1, 1))
+
+        cache = unke.Cache(max_bytes=1)
+        for filename in self.filenames:
+            unke.load(filename, cache=cache)
+        self.assertEqual((len(cache), cache.evictions), (1, 2))
+
+    def test_disk_store(self):
+        for key in (unke.cache.Key.Stat, unke.cache.Key.Hash):
+            directory = os.path.join(self.directory.name, key)
+            unke.load(self.filenames[1], cache=unke.Cache(directory=directory, key=key))
+            cache = unke.Cache(directory=directory, key=key)
+            doc = unke.load(self.filenames[1], cache=cache)
+            self.assertEqual((cache.disk_hits, cache.misses), (1, 0))
+            self.assertEqual(doc.root.properties['index'], 1)
+
+            cache.invalidate()
+            cache = unke.Cache(directory=directory, key=key)
+            unke.load(self.filenames[1], cache=cache)
+            self.assertEqual((cache.disk_hits, cache.misses), (0, 1))
+
+    def test_disk_store_signature(self):
+        directory = os.path.join(self.directory.name, 'signed')
+        unke.load(self.filenames[1], cache=unke.Cache(directory=directory, secret=b'secret'))
+        # Files signed with another key are not unpickled
+        for secret in (b'other', None):
+            cache = unke.Cache(directory=directory, secret=secret)
+            unke.load(self.filenames[1], cache=cache)
+            self.assertEqual((cache.disk_hits, cache.misses), (0, 1))
+        cache = unke.Cache(directory=directory)
+        unke.load(self.filenames[1], cache=cache)
+        self.assertEqual((cache.disk_hits, cache.misses), (1, 0))
+
+        disk_filename, = [os.path.join(directory, name) for name in os.listdir(directory)]
+        with open(disk_filename, 'r+b') as file:
+            data = bytearray(file.read())
+            data[-1] ^= 1
+            file.seek(0)
+            file.write(data)
+        cache = unke.Cache(directory=directory)
+        unke.load(self.filenames[1], cache=cache)
+        self.assertEqual((cache.disk_hits, cache.misses), (0, 1))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8
+
+import pickle
+import unittest
+import unke
+from unke import changes
+
+
+old_text = """
+Root {
+    Service { name: "web"; port: 80; hosts: ["a", "b"] }
+    Service { name: "db"; port: 5432 }
+    Service { name: "cache"; port: 6379; options: Options { size: 1 } }
+    version: 1
+}
+"""
+
+new_text = """
+Root {
+    Service { name: "web"; port: 8080; hosts: ["a", "c", "b"] }
+    Service { name: "cache"; port: 6379; options: Options { size: 2 } }
+    Worker { name: "worker" }
+    version: 1.0
+    enabled: true
+}
+"""
+
+
+def summary(diff):
+    return [(change.type, change.path) for change in diff]
+
+
+class ChangesTest(unittest.TestCase):
+    def test_diff(self):
+        old = unke.loads(old_text)
+        new = unke.loads(new_text)
+        self.assertEqual(summary(unke.diff(old, new)), [
+            (unke.ChangeType.Changed, ('version',)),
+            (unke.ChangeType.Added, ('enabled',)),
+            (unke.ChangeType.Removed, (1,)),
+            (unke.ChangeType.Added, (2,)),
+            (unke.ChangeType.Changed, (0, 'port')),
+            (unke.ChangeType.Added, (0, 'hosts', 1)),
+            (unke.ChangeType.Changed, (1, 'options', 'size'))
+        ])
+        port = unke.diff(old, new)[4]
+        self.assertEqual((port.old, port.new), (80, 8080))
+
+        self.assertEqual(unke.diff(old, unke.loads(old_text)), [])
+        self.assertEqual(summary(unke.diff(unke.Document(), new)), [(unke.ChangeType.Added, ())])
+        self.assertEqual(summary(unke.diff(unke.loads('A { l: [1, 1, 2] }'), unke.loads('A { l: [1, 2] }'))),
+                         [(unke.ChangeType.Removed, ('l', 1))])
+        renamed = unke.loads(old_text.replace('Root', 'Main'))
+        self.assertEqual(summary(unke.diff(old, renamed)), [(unke.ChangeType.Changed, ())])
+
+    def test_fingerprints(self):
+        fingerprints = changes.Fingerprints()
+        values = [1, -1, -2, 1.0, True, '1', [1], None]
+        self.assertEqual(len(set(fingerprints.of(value) for value in values)), len(values))
+        # Property order is ignored
+        self.assertEqual(fingerprints.of(unke.loads('A { a: 1; b: 2 }').root),
+                         fingerprints.of(unke.loads('A { b: 2; a: 1 }').root))
+        self.assertNotEqual(fingerprints.of(unke.loads('A {\n B {}\n C {}\n}').root),
+                            fingerprints.of(unke.loads('A {\n C {}\n B {}\n}').root))
+
+    def test_deep_nesting(self):
+        depth = 3000
+        old = unke.loads('Root { a: ' + '[' * depth + '1' + ']' * depth + ' }')
+        new = unke.loads('Root { a: ' + '[' * depth + '2' + ']' * depth + ' }')
+        self.assertEqual(summary(unke.diff(old, new)), [(unke.ChangeType.Changed, ('a',) + (0,) * depth)])
+
+    def test_cached_fingerprints(self):
+        old = unke.loads(old_text)
+        new = unke.loads(old_text)
+        self.assertEqual(unke.diff(old, new, cache=True), [])
+        self.assertIsNotNone(new.fingerprints)
+        hashes = len(new.fingerprints.hashes)
+
+        # Changes made through the document drop the fingerprints of the changed object and its owners only
+        options = new.root.children[2].properties['options']
+        new.set_property(options, 'size', 3)
+        self.assertEqual(len(new.fingerprints.hashes), hashes - 3)
+        self.assertEqual(summary(unke.diff(old, new, cache=True)), [(unke.ChangeType.Changed, (2, 'options', 'size'))])
+
+        worker = unke.BoostedObject()
+        worker.name = 'Worker'
+        new.add_child(new.root, worker)
+        new.set_name(new.root.children[0], 'Frontend')
+        new.remove_property(new.root, 'version')
+        self.assertEqual(summary(unke.diff(old, new, cache=True)), [
+            (unke.ChangeType.Removed, ('version',)),
+            (unke.ChangeType.Removed, (0,)),
+            (unke.ChangeType.Added, (0,)),
+            (unke.ChangeType.Added, (3,)),
+            (unke.ChangeType.Changed, (2, 'options', 'size'))
+        ])
+        new.remove_child(new.root, worker)
+        self.assertNotIn(id(worker), new.fingerprints.hashes)
+
+        # Changes made directly to the objects are only found without the cache
+        new = unke.loads(old_text)
+        self.assertEqual(unke.diff(old, new, cache=True), [])
+        new.root.properties['version'] = 2
+        new.root.children.pop()
+        self.assertEqual(unke.diff(old, new, cache=True), [])
+        self.assertEqual(summary(unke.diff(old, new)), [
+            (unke.ChangeType.Changed, ('version',)),
+            (unke.ChangeType.Removed, (2,))
+        ])
+
+        # Fingerprints are not pickled
+        self.assertIsNone(pickle.loads(pickle.dumps(new)).fingerprints.hashes.get(id(new.root)))
+
+    def test_columnar(self):
+        old = unke.loads_columnar(old_text)
+        new = unke.loads(new_text)
+        self.assertEqual(summary(unke.diff(old, new)), summary(unke.diff(unke.loads(old_text), new)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8
+
+import os
+import unittest
+import unke
+import unke.convert
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class ColumnarTest(unittest.TestCase):
+    def test_same_as_objects(self):
+        doc = unke.load(example_filename)
+        columnar = unke.load_columnar(example_filename)
+        self.assertEqual(unke.dumps(columnar), unke.dumps(doc))
+        self.assertEqual(unke.convert.document_to_dict(columnar), unke.convert.document_to_dict(doc))
+
+        unke_text = "Root {\n    a: [1, [X { v: 1 }, 2], []]\n    o: O { k: [Y {}] }\n    C { D {} }\n    C {}\n}"
+        self.assertEqual(unke.dumps(unke.loads_columnar(unke_text.encode('utf-8'))), unke.dumps(unke.loads(unke_text)))
+        self.assertIsNone(unke.loads_columnar('').root)
+        with self.assertRaises(unke.ParseException):
+            unke.loads_columnar('Root { a: }')
+
+    def test_navigation(self):
+        doc = unke.loads_columnar("Root {\n    o: O {}\n    C { D {} }\n    C {}\n}")
+        root = doc.root
+        self.assertIsInstance(root, unke.BaseObject)
+        self.assertEqual(doc.object_count, 5)
+        self.assertEqual(root, doc.object_at(0))
+        first, second = root.children
+        self.assertEqual(first.children[0].parent, first)
+        self.assertEqual(first.siblings, [second])
+        self.assertIsNone(root.properties['o'].parent)
+        self.assertEqual(root.properties['o'].name, 'O')
+        with self.assertRaises(TypeError):
+            root.properties['p'] = 1
+        with self.assertRaises(AttributeError):
+            root.name = 'Other'
+        with self.assertRaises(IndexError):
+            doc.object_at(5)
+
+        # Objects of replaced property values are removed and the others numbered again
+        doc = unke.loads_columnar("Root {\n    o: O { P {} }\n    C { a: [X {}, [Y {}]]\n a: 1 }\n    o: [Z {}]\n}")
+        self.assertEqual(doc.object_count, 3)
+        self.assertEqual([doc.object_at(i).name for i in range(3)], ['Root', 'C', 'Z'])
+        self.assertEqual(doc.root.children[0].parent, doc.root)
+        self.assertEqual(doc.root.properties['o'], [doc.object_at(2)])
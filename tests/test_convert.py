@@ -0,0 +1,122 @@
+# -*- coding: utf-8
+
+import io
+import json
+import os
+import tempfile
+import unittest
+import unke
+import unke.convert
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class ConvertTest(unittest.TestCase):
+    def test_round_trip(self):
+        doc = unke.load(example_filename)
+        doc.root.properties['nested'] = [[1, doc.root.children[0]], [], 'text']
+        dict_value = unke.convert.document_to_dict(doc)
+        self.assertEqual(dict_value['children'][0], unke.convert.object_to_dict(doc.root.children[0]))
+        self.assertEqual(dict_value['properties']['nested'][0][1], dict_value['children'][0])
+        for indent, minify in ((0, False), (2, False), (0, True)):
+            self.assertEqual(
+                unke.convert.document_to_json(doc, indent, minify),
+                json.dumps(dict_value, indent=indent if indent > 0 else None,
+                           separators=(',', ':') if minify else None)
+            )
+
+        converted = unke.convert.dict_to_document(dict_value)
+        self.assertEqual(unke.dumps(converted), unke.dumps(doc))
+        self.assertIs(converted.root.children[0].parent, converted.root)
+        self.assertIsNone(converted.root.properties['nested'][0][1].parent)
+
+    def test_deep_nesting(self):
+        depth = 5000
+        doc = unke.loads('Root {' + 'Child { list: [1, ' * depth + 'Leaf {}' + ']}' * depth + '}')
+        dict_value = unke.convert.document_to_dict(doc)
+        self.assertEqual(unke.dumps(unke.convert.dict_to_document(dict_value), False), unke.dumps(doc, False))
+
+        # Too deep for the json module
+        self.assertEqual(
+            unke.convert.document_to_json(doc, 0, True),
+            '{"name":"Root","properties":{},"children":[' +
+            '{"name":"Child","properties":{"list":[1,' * depth +
+            '{"name":"Leaf","properties":{},"children":[]}' +
+            ']},"children":[]}' * depth + ']}'
+        )
+
+        # Read back without recursion as well
+        json_text = unke.convert.document_to_json(doc)
+        self.assertEqual(unke.dumps(unke.convert.json_to_document(json_text), False), unke.dumps(doc, False))
+        self.assertEqual(unke.convert.object_to_json(unke.convert.json_to_object(json_text)), json_text)
+
+    def test_transcode_to_json(self):
+        text = (
+            'Root {\n'
+            '    a: 1; b: "text"\n'
+            '    Child { list: [[], [1.5, Item {}], Item { x: true }] }\n'
+            '    a: [2, 3]\n'
+            '    object: Value { c: false }\n'
+            '}\n'
+        )
+        doc = unke.loads(text)
+        for indent, minify in ((0, False), (2, False), (0, True)):
+            destination = io.StringIO()
+            unke.convert.transcode_to_json(io.StringIO(text), destination, indent, minify)
+            self.assertEqual(destination.getvalue(), unke.convert.document_to_json(doc, indent, minify))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'example.json')
+            unke.convert.transcode_to_json(example_filename, filename)
+            with open(filename) as file:
+                self.assertEqual(file.read(), unke.convert.document_to_json(unke.load(example_filename)))
+
+        with self.assertRaises(unke.ParseException):
+            unke.convert.transcode_to_json(io.StringIO('Root { a: 1 } b'), io.StringIO())
+
+    def test_transcode_from_json(self):
+        text = unke.convert.document_to_json(unke.load(example_filename), 2)
+        text = text[:-1] + ', "extra": [{}], "properties": {"a": 1, "b": "Übersicht", "a": [[], 2.5]}}'
+        for beautify in (True, False):
+            expected = unke.dumps(unke.convert.json_to_document(text), beautify)
+            # Small chunks are read token by token, large chunks mostly at once
+            for chunk_size in (1, 65536):
+                destination = io.StringIO()
+                unke.convert.transcode_from_json(io.StringIO(text), destination, beautify, chunk_size=chunk_size)
+                self.assertEqual(destination.getvalue(), expected)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'example.unk')
+            unke.convert.transcode_from_json(io.BytesIO(text.encode('utf-8')), filename)
+            with open(filename) as file:
+                self.assertEqual(file.read(), unke.dumps(unke.convert.json_to_document(text)))
+
+        for invalid_text in ('{"name": "Root", "properties": {}}', '{"name": "Root", "properties": [], "children": []}',
+                             '{"name": "Root", "properties": {}, "children": []', '[]'):
+            with self.assertRaises(ValueError):
+                unke.convert.transcode_from_json(io.StringIO(invalid_text), io.StringIO(), chunk_size=4)
+
+    def test_transcode_deep_nesting(self):
+        depth = 800
+        nested = ''.join('A { p: ' + str(i) + '; s: "Übersicht"\n' for i in range(depth)) + '}' * depth
+        text = 'Root {\nvalue: ' + nested + '\nother: 1\n' + nested + '\n}'
+        doc = unke.loads(text)
+        json_text = unke.convert.document_to_json(doc)
+        # The last value of a key is kept at the position of the first one
+        value_json = unke.convert.object_to_json(doc.root.properties['value'])
+        duplicates_json = json_text.replace('"value": ' + value_json, '"value": [], "other": 2, "value": ' + value_json)
+        # Buffers of the nested objects are moved to temporary files and appended to the enclosing ones
+        spool_size = unke.convert._spool_size
+        unke.convert._spool_size = 4096
+        try:
+            for source in (json_text, duplicates_json):
+                for chunk_size in (1024, 65536):
+                    destination = io.StringIO()
+                    unke.convert.transcode_from_json(io.StringIO(source), destination, chunk_size=chunk_size)
+                    self.assertEqual(destination.getvalue(), unke.dumps(doc))
+            destination = io.StringIO()
+            unke.convert.transcode_to_json(io.StringIO(text.replace('value:', 'value: 1\nvalue:')), destination)
+            self.assertEqual(destination.getvalue(), json_text)
+        finally:
+            unke.convert._spool_size = spool_size
@@ -0,0 +1,87 @@
+# -*- coding: utf-8
+
+import unittest
+import unke
+
+
+unke_text = """
+Root {
+    Item { id: 1; tags: [1] }
+    Item { id: 2; enabled: true; part: Part { id: 1 } }
+    items: [Item { id: 3 }, [Item { id: 1 }]]
+    Other { id: 1.0 }
+}
+"""
+
+
+def ids(objects):
+    return sorted(id(obj) for obj in objects)
+
+
+class DocumentTest(unittest.TestCase):
+    def assertSameResults(self, indexed, scanned):
+        for name in ('Item', 'Part', 'Root', 'Missing'):
+            self.assertEqual(ids(indexed.find_all(name)), ids(scanned.find_all(name)))
+        for properties in ({'id': 1}, {'id': 1.0}, {'tags': [1]}, {'enabled': 1}, {'enabled': True, 'id': 2}):
+            self.assertEqual(ids(indexed.find_by(**properties)), ids(scanned.find_by(**properties)))
+
+    def test_find(self):
+        doc = unke.loads(unke_text)
+        self.assertIsNone(doc.index)
+        self.assertEqual(len(doc.find_all('Item')), 4)
+        self.assertEqual(sorted(obj.name for obj in doc.find_by(id=1)), ['Item', 'Item', 'Part'])
+        self.assertEqual(len(doc.find_by(tags=[1])), 1)
+        self.assertEqual(doc.find_by(enabled=1), [])
+        with self.assertRaises(ValueError):
+            doc.find_by()
+
+        indexed = unke.loads(unke_text, build_index=True)
+        self.assertIsNotNone(indexed.index)
+        scanned = unke.loads(unke_text)
+        scanned.root = indexed.root
+        self.assertSameResults(indexed, scanned)
+
+        doc.build_index()
+        self.assertEqual(len(doc.find_by(id=1)), 3)
+
+        columnar = unke.loads_columnar(unke_text)
+        self.assertEqual([obj.index for obj in columnar.find_all('Item')], [1, 2, 4, 5])
+        self.assertEqual(len(columnar.find_by(id=1)), 3)
+
+        with self.assertRaises(ValueError):
+            unke.loads(unke_text, lazy=True, build_index=True)
+
+        # Objects in property values assigned again are not part of the document
+        text = 'Root {\n    a: X { id: 1 }\n    B { a: [X { id: 1 }] }\n    a: 2\n    B { a: X {}\n a: [[]] }\n}'
+        for doc in (unke.loads(text, build_index=True), unke.loads(text), unke.loads_columnar(text)):
+            self.assertEqual(len(doc.find_all('X')), 1)
+            self.assertEqual([obj.name for obj in doc.find_by(id=1)], ['X'])
+
+    def test_mutations(self):
+        indexed = unke.loads(unke_text, build_index=True)
+        scanned = unke.loads(unke_text)
+        scanned.root = indexed.root
+        root = indexed.root
+        first, second = root.children[:2]
+
+        indexed.remove_child(root, first)
+        self.assertIsNone(first.parent)
+        self.assertSameResults(indexed, scanned)
+        with self.assertRaises(ValueError):
+            indexed.remove_child(root, first)
+
+        indexed.add_child(second, first)
+        self.assertIs(first.parent, second)
+        self.assertSameResults(indexed, scanned)
+
+        indexed.set_name(second, 'Part')
+        indexed.set_property(first, 'id', 2)
+        indexed.set_property(second, 'part', [unke.loads('Item { id: 1 }').root])
+        self.assertEqual(list(second.properties), ['id', 'enabled', 'part'])
+        indexed.set_property(second, 'tags', [1])
+        self.assertSameResults(indexed, scanned)
+
+        indexed.remove_property(second, 'part')
+        indexed.remove_property(second, 'enabled')
+        self.assertSameResults(indexed, scanned)
+        self.assertEqual(indexed.find_by(enabled=True), [])
@@ -0,0 +1,46 @@
+# -*- coding: utf-8
+
+import array
+import io
+import os
+import unittest
+import unke
+from unke.dump import object_to_string
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class DumpTest(unittest.TestCase):
+    def test_stream_equals_string(self):
+        doc = unke.load(example_filename)
+        child = unke.BoostedObject()
+        child.name = None
+        doc.root.properties['odd_values'] = [[], [child, (1, 2)], None, 'quote"', True, 1.5]
+        for beautify in (True, False):
+            expected = object_to_string(doc.root, 0, 4 if beautify else 0, beautify, beautify)
+            self.assertEqual(unke.dumps(doc, beautify), expected)
+            self.assertEqual(''.join(unke.iterencode(doc, beautify)), expected)
+            stream = io.StringIO()
+            unke.dump_stream(doc, stream, beautify)
+            self.assertEqual(stream.getvalue(), expected)
+
+    def test_deep_nesting(self):
+        depth = 5000
+        doc = unke.loads('Root {' + 'Child { list: [1, ' * depth + 'Leaf {}' + ']}' * depth + '}')
+        text = unke.dumps(doc, False)
+        self.assertEqual(text, 'Root{' + 'Child{list:[1,' * depth + 'Leaf{}' + '];}' * depth + ';}')
+        self.assertEqual(unke.dumps(unke.loads(text), False), text)
+
+    def test_numeric_arrays(self):
+        doc = unke.loads('Root { ints: [1, 2, 3]; floats: [0.5]; empty: []; nested: [[1, 2], [0.5, 1.5]] }')
+        doc.root.properties['chars'] = ['a', 'b']
+        expected = [unke.dumps(doc, beautify) for beautify in (True, False)]
+        doc.root.properties.update({
+            'ints': array.array('q', [1, 2, 3]),
+            'floats': array.array('d', [0.5]),
+            'empty': array.array('i'),
+            'nested': [array.array('b', [1, 2]), array.array('f', [0.5, 1.5])],
+            'chars': array.array('u', 'ab')
+        })
+        self.assertEqual([unke.dumps(doc, beautify) for beautify in (True, False)], expected)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8
+
+import io
+import os
+import unittest
+import unke
+import unke.events
+from unke.events import Event
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class EventsTest(unittest.TestCase):
+    def test_events(self):
+        unke_text = """
+        Root {
+            Child {
+                prop: 7
+            }
+            list: [1, [true], Item {}]
+            object: Value {}
+        }
+        """
+        events = list(unke.iterparse(io.StringIO(unke_text)))
+        self.assertEqual(events, [
+            (Event.StartObject, None, 'Root'),
+            (Event.StartObject, None, 'Child'),
+            (Event.Property, 'prop', 7),
+            (Event.EndObject, None, 'Child'),
+            (Event.StartList, 'list', None),
+            (Event.Property, None, 1),
+            (Event.StartList, None, None),
+            (Event.Property, None, True),
+            (Event.EndList, None, None),
+            (Event.StartObject, None, 'Item'),
+            (Event.EndObject, None, 'Item'),
+            (Event.EndList, 'list', None),
+            (Event.StartObject, 'object', 'Value'),
+            (Event.EndObject, 'object', 'Value'),
+            (Event.EndObject, None, 'Root'),
+        ])
+
+    def test_validation(self):
+        unke_texts = [
+            "Root {\n    list: [\n        1,2,\n    ]\n}",
+            "Root {\n    list: [\n        1\n        2\n    ]\n}",
+            "Root {\n    test: 21\n    list: [\n        1;\n    ]\n}",
+            "Root {\n}\n}",
+            "Root {\n    test: ; 0\n}",
+            "Node {\n    test: [\n        test:\n    ]\n}",
+            "Root {\n    list: [\n}",
+            "Root {\n    a: 1 b: 2\n}",
+            "Root {",
+            "a: Root {}",
+            "Root {\n    a: X {}; b: 1\n}",
+            "Root {\n    [1]\n}",
+            "Root {\n    {}\n}",
+            "Root {\n    a: [1 2]\n}",
+            "Root {\n    a: [1,, 2]\n}",
+            "Root {\n    Child\n}",
+            "Root {\n    a: 1\n} 5",
+            "Root {\n    a: \u00a7\n}",
+            "]",
+            ",",
+        ]
+        # Every token of a valid document removed or repeated
+        unke_text = "Root {\n    Child { a: 1; b: [2, [X {}], 'c'] }\n    d: Y { e: true }\n}"
+        tokens = unke.lexer.lex(unke_text)
+        for i, token in enumerate(tokens):
+            start, end = token[3], tokens[i + 1][3] if i + 1 < len(tokens) else len(unke_text)
+            unke_texts.append(unke_text[:start] + unke_text[end:])
+            unke_texts.append(unke_text[:end] + unke_text[start:])
+
+        for unke_text in unke_texts:
+            try:
+                expected = unke.dumps(unke.loads(unke_text))
+            except unke.ParseException as e:
+                expected = str(e)
+            for source in (lambda: io.StringIO(unke_text), lambda: unke.lexer.lex(unke_text, numeric_lists=True)):
+                try:
+                    events = unke.iterparse(source())
+                    doc = unke.Document()
+                    doc.root = unke.events.materialize(next(events), events)
+                    self.assertEqual(list(events), [])
+                    result = unke.dumps(doc)
+                except unke.ParseException as e:
+                    result = str(e)
+                self.assertEqual(result, expected, unke_text)
+
+    def test_materialize(self):
+        with open(example_filename) as file:
+            expected = unke.dumps(unke.loads(file.read()))
+
+        events = unke.iterparse(example_filename)
+        root = unke.events.materialize(next(events), events)
+        doc = unke.Document()
+        doc.root = root
+        self.assertEqual(unke.dumps(doc), expected)
+        self.assertIs(root.children[0].parent, root)
+
+    def test_materialize_subtree(self):
+        unke_text = "Root {\n    ItemOne {\n        Child {\n            prop: 7\n        }\n    }\n    ItemTwo {}\n}"
+        events = unke.iterparse(io.StringIO(unke_text))
+        names = []
+        subtree = None
+        for event in events:
+            if Event.StartObject == event[0]:
+                names.append(event[2])
+                if 'ItemOne' == event[2]:
+                    subtree = unke.events.materialize(event, events)
+        self.assertEqual(names, ['Root', 'ItemOne', 'ItemTwo'])
+        self.assertEqual(subtree.children[0].properties['prop'], 7)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8
+
+import os
+import unittest
+import unke
+import unke.lazy
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class LazyTest(unittest.TestCase):
+    def test_lazy_equals_eager(self):
+        with open(example_filename) as file:
+            unke_text = file.read()
+        self.assertEqual(unke.dumps(unke.loads(unke_text, lazy=True)), unke.dumps(unke.loads(unke_text)))
+
+    def test_lazy_access(self):
+        unke_text = """
+        Root {
+            ItemOne {
+                list: [1, Item {}, [2]]
+            }
+            ItemTwo {}; object: Value { a: "}" }
+            b: true
+        }
+        """
+        created = []
+        doc = unke.loads(unke_text, lazy=True, object_created_hook=lambda o: created.append(o.name))
+        self.assertEqual(created, ['Root'])
+        self.assertEqual(doc.root.properties['b'], True)
+
+        child = doc.root.children[0]
+        self.assertEqual(created, ['Root', 'Item', 'ItemOne'])
+        self.assertEqual(child.name, 'ItemOne')
+        self.assertIs(child.parent, doc.root)
+        self.assertIs(doc.root.children[0], child)
+        self.assertEqual(child.properties['list'][2], [2])
+        self.assertEqual(doc.root.properties['object'].properties['a'], '}')
+
+    def test_lazy_errors(self):
+        unke_text = "Root {\n    a: 1 b: 2\n    Child {}\n}"
+        with self.assertRaises(unke.ParseException) as eager_context:
+            unke.loads(unke_text)
+        with self.assertRaises(unke.ParseException) as lazy_context:
+            unke.loads(unke_text, lazy=True)
+        self.assertEqual(str(lazy_context.exception), str(eager_context.exception))
+
+        # Errors inside a nested block are raised on first access
+        unke_text = "Root {\n    Child {\n        a: 1 b: 2\n    }\n}"
+        with self.assertRaises(unke.ParseException) as eager_context:
+            unke.loads(unke_text)
+        doc = unke.loads(unke_text, lazy=True)
+        with self.assertRaises(unke.ParseException) as lazy_context:
+            doc.root.children[0]
+        self.assertEqual(str(lazy_context.exception), str(eager_context.exception))
+
+    def test_lazy_shadowed_errors(self):
+        # Spans of properties assigned again are never accessed, their errors are raised right away
+        for unke_text in ('Root {\n a: [1,\n2;\n3]\n a: 5\n B { x: 1 }\n}',
+                          'Root {\n a: X { b: }\n a: [1]\n}'):
+            with self.assertRaises(unke.ParseException) as eager_context:
+                unke.loads(unke_text)
+            with self.assertRaises(unke.ParseException) as lazy_context:
+                unke.loads(unke_text, lazy=True)
+            self.assertEqual(str(lazy_context.exception), str(eager_context.exception))
+        doc = unke.loads('Root {\n a: X { b: 1 }\n a: 5\n}', lazy=True)
+        self.assertEqual(doc.root.properties['a'], 5)
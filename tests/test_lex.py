@@ -1,7 +1,15 @@
 # -*- coding: utf-8
 
+import io
+import os
+import tempfile
 import unittest
 import unke
+import unke.grammar
+import unke.lexer
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
 
 
 class LexTest(unittest.TestCase):
@@ -23,3 +31,151 @@ class LexTest(unittest.TestCase):
         """
         with self.assertRaises(unke.ParseException):
             unke.loads(unke_text)
+
+    def test_legacy_lexer_equivalence(self):
+        unke_text = """
+            Root {
+                /* multi line
+                   comment */
+                intprop: -42
+                floatprop: .5
+                strings: ["a\\"b", 'c\\'d']
+                true_flag: true;false_flag: false
+                Child {}
+                // Comment words are lexed as object tags
+            }
+        """
+        self.assertEqual(unke.lexer.lex(unke_text), unke.lexer.lex_legacy(unke_text))
+
+    def test_legacy_lexer_exception_positions(self):
+        for unke_text in ('Root {\n    a: 1\n    :D\n}', 'Root {\n  /* no end\n}', 'Root {} /*'):
+            messages = []
+            for lex in (unke.lexer.lex, unke.lexer.lex_legacy):
+                try:
+                    messages.append(lex(unke_text))
+                except unke.ParseException as e:
+                    messages.append(str(e))
+            self.assertEqual(messages[0], messages[1])
+
+    def test_iter_lex_chunk_boundaries(self):
+        unke_text = """
+            Root {
+                /* comment spanning chunks */
+                true_flag: true
+                values: [1.5, -2, 'str ing', "€uro"]
+                Child {}
+            }
+        """
+        tokens = unke.lexer.lex(unke_text)
+        for chunk_size in (1, 2, 3, 7, 64):
+            self.assertEqual(list(unke.lexer.iter_lex(io.StringIO(unke_text), chunk_size)), tokens)
+            self.assertEqual(list(unke.lexer.iter_lex(io.BytesIO(unke_text.encode('utf-8')), chunk_size)), tokens)
+
+    def test_iter_lex_numeric_lists(self):
+        unke_text = "Root {\n    ints: [1, 2,\n        3]\n    floats: [1.5, -2.5]\n    mixed: [1, 'a']\n}"
+        tokens = unke.lexer.lex(unke_text, numeric_lists=True)
+        self.assertEqual([token[1] for token in tokens if unke.grammar.Tag.NumericList == token[0]],
+                         ['[1, 2,\n        3]', '[1.5, -2.5]'])
+        for chunk_size in (1, 2, 7, 64):
+            self.assertEqual(list(unke.lexer.iter_lex(io.StringIO(unke_text), chunk_size, True)), tokens)
+        self.assertEqual(list(unke.lexer.iter_lex_bytes(unke_text.encode('utf-8'), numeric_lists=True)), tokens)
+
+    def test_iter_lex_comment_no_end(self):
+        unke_text = "Root {\n/*\n}"
+        with self.assertRaises(unke.ParseException):
+            list(unke.lexer.iter_lex(io.StringIO(unke_text), 2))
+
+    def test_iter_lex_illegal_character(self):
+        # The error is raised right away instead of after reading the rest of the stream
+        class CountingStream(io.StringIO):
+            reads = 0
+
+            def read(self, size=-1):
+                CountingStream.reads += 1
+                return io.StringIO.read(self, size)
+
+        stream = CountingStream('Root { @ ' + 'Item { a: 1 }\n' * 10000 + '}')
+        with self.assertRaises(unke.ParseException) as context:
+            list(unke.lexer.iter_lex(stream, 64))
+        self.assertEqual((context.exception.line, context.exception.col), (1, 7))
+        self.assertEqual(CountingStream.reads, 1)
+
+        # Strings and names starting with "_" are still read until their end
+        unke_text = 'Root {\n    s: "' + 'x' * 1000 + '"\n    _' + 'a' * 1000 + ': 1\n}'
+        for chunk_size in (1, 7, 64):
+            self.assertEqual(list(unke.lexer.iter_lex(io.StringIO(unke_text), chunk_size)), unke.lexer.lex(unke_text))
+
+    def test_parse_token_stream(self):
+        unke_text = "Root {\n    Child {\n        prop: 7\n    }\n}"
+        doc = unke.parse(unke.lexer.iter_lex(io.StringIO(unke_text), 4))
+        self.assertEqual(doc.root.children[0].properties['prop'], 7)
+
+    def test_iter_lex_bytes(self):
+        unke_text = """
+            Root {
+                /* comment */
+                true_flag: true
+                values: [1.5, -2, 'str ing', "€uro"]
+                Child {}
+            }
+        """
+        tokens = [token[:3] for token in unke.lexer.lex(unke_text)]
+        data = unke_text.encode('utf-8')
+        self.assertEqual([token[:3] for token in unke.lexer.iter_lex_bytes(data)], tokens)
+        self.assertEqual([token[:3] for token in unke.lexer.iter_lex_bytes(memoryview(data))], tokens)
+
+    def test_loads_bytes(self):
+        unke_text = "Root {\n    a: '€'\n    Child { b: [1, 2] }\n}"
+        expected = unke.dumps(unke.loads(unke_text))
+        self.assertEqual(unke.dumps(unke.loads(unke_text.encode('utf-8'))), expected)
+        self.assertEqual(unke.dumps(unke.loads(memoryview(unke_text.encode('utf-8')))), expected)
+
+        # Error positions are counted in characters like for strings
+        unke_text = "Root {\n    a: '€€€' b: 2\n}"
+        with self.assertRaises(unke.ParseException) as text_context:
+            unke.loads(unke_text)
+        with self.assertRaises(unke.ParseException) as bytes_context:
+            unke.loads(unke_text.encode('utf-8'))
+        self.assertEqual(str(bytes_context.exception), str(text_context.exception))
+
+        # Text with non-ASCII whitespace is parsed once, the hook is called once per object
+        names = []
+        stats = unke.Stats()
+        unke.loads('Root {\n    A {}\n    B {}\n    C {\xa0}\n}'.encode('utf-8'),
+                   object_created_hook=lambda obj: names.append(obj.name), tracer=stats)
+        self.assertEqual(names, ['A', 'B', 'C', 'Root'])
+        self.assertEqual(stats.parses, 1)
+
+        names.clear()
+        with self.assertRaises(unke.ParseException):
+            unke.loads("Root {\n    A {}\n    B { a: '€' b }\n}".encode('utf-8'),
+                       object_created_hook=lambda obj: names.append(obj.name))
+        self.assertEqual(names, ['A'])
+
+    def test_load_mmap(self):
+        expected = unke.dumps(unke.load(example_filename))
+        self.assertEqual(unke.dumps(unke.load(example_filename, mmap=True)), expected)
+
+    def test_crlf(self):
+        unke_text = 'Root {\r\n    a: 1\r\n    l: [1,\r\n        2]\r\n    Child { b: 2 }\r\n}\r\n'
+        tokens = unke.lexer.lex(unke_text.replace('\r\n', '\n'))
+        self.assertEqual([token[:3] for token in unke.lexer.lex(unke_text)], [token[:3] for token in tokens])
+        self.assertEqual([token[:3] for token in unke.lexer.iter_lex_bytes(unke_text.encode('utf-8'))],
+                         [token[:3] for token in tokens])
+        expected = unke.dumps(unke.loads(unke_text))
+        self.assertEqual(unke.dumps(unke.loads(unke_text.encode('utf-8'))), expected)
+        self.assertEqual(unke.dumps(unke.loads(unke_text, numeric_lists='array')), expected)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'crlf.unk')
+            with open(filename, 'wb') as file:
+                file.write(unke_text.encode('utf-8'))
+            self.assertEqual(unke.dumps(unke.load(filename, mmap=True)), expected)
+
+        # Error positions are the same as for "\n" line breaks
+        unke_text = unke_text.replace('b: 2', 'b: @')
+        with self.assertRaises(unke.ParseException) as text_context:
+            unke.loads(unke_text.replace('\r\n', '\n'))
+        with self.assertRaises(unke.ParseException) as bytes_context:
+            unke.loads(unke_text.encode('utf-8'))
+        self.assertEqual(str(bytes_context.exception), str(text_context.exception))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8
+
+import unittest
+import unke
+
+
+unke_text = """
+Root {
+    A {
+        B { C {} }
+        D {}
+    }
+    E {
+        value: F { G {} }
+        items: [H {}, [I {}]]
+    }
+    A {}
+}
+"""
+
+
+def names(objects):
+    return ''.join(obj.name for obj in objects)
+
+
+class ObjectsTest(unittest.TestCase):
+    def test_navigation(self):
+        for doc in (unke.loads(unke_text), unke.loads_columnar(unke_text)):
+            root = doc.root
+            first, second, third = root.children
+            self.assertIsNone(root.index_in_parent)
+            self.assertIsNone(root.next_sibling)
+            self.assertEqual(second.index_in_parent, 1)
+            self.assertEqual(second.next_sibling, third)
+            self.assertEqual(second.previous_sibling, first)
+            self.assertIsNone(first.previous_sibling)
+            self.assertIsNone(third.next_sibling)
+            self.assertEqual(names(second.siblings), 'AA')
+            self.assertEqual(root.find_children('A'), [first, third])
+            self.assertEqual(root.find_child('E'), second)
+            self.assertIsNone(root.find_child('Missing'))
+
+    def test_navigation_after_changes(self):
+        root = unke.loads(unke_text).root
+        first, second, third = root.children
+        self.assertEqual(root.find_child('E'), second)
+        self.assertIs(third.previous_sibling, second)
+        del root.children[1]
+        self.assertIs(third.previous_sibling, first)
+        self.assertIsNone(root.find_child('E'))
+        new = unke.BoostedObject()
+        new.name = 'E'
+        new.parent = root
+        root.children.insert(0, new)
+        self.assertIs(first.previous_sibling, new)
+        self.assertIs(root.find_child('E'), new)
+        root.children[0] = second
+        root.invalidate_child_names()
+        self.assertIs(root.find_child('E'), second)
+        self.assertEqual(second.siblings, [first, third])
+        self.assertEqual(new.siblings, [second, first, third])
+
+    def test_find_child_after_document_changes(self):
+        doc = unke.loads('Root {\n    A {}\n    B {}\n}')
+        root = doc.root
+        a, b = root.children
+        self.assertIs(root.find_child('B'), b)
+        doc.set_name(b, 'Z')
+        self.assertIsNone(root.find_child('B'))
+        self.assertIs(root.find_child('Z'), b)
+        b.name = 'A'
+        self.assertEqual(root.find_children('A'), [a, b])
+
+        doc.remove_child(root, a)
+        c = unke.BoostedObject()
+        c.name = 'C'
+        doc.add_child(root, c)
+        self.assertEqual(root.find_children('A'), [b])
+        self.assertIs(root.find_child('C'), c)
+
+    def test_walk(self):
+        for doc in (unke.loads(unke_text), unke.loads_columnar(unke_text)):
+            root = doc.root
+            self.assertEqual(names(root.walk()), 'RootABCDEA')
+            self.assertEqual(names(root.walk(unke.Order.BreadthFirst)), 'RootAEABDC')
+            self.assertEqual(names(root.iter_descendants(include_values=True)), 'ABCDEFGHIA')
+            self.assertEqual(names(root.iter_descendants(unke.Order.BreadthFirst, include_values=True)), 'AEABDFHICG')
+            self.assertEqual(names(root.walk(prune=lambda obj: obj.name == 'A')), 'RootAEA')
+            self.assertEqual(names(root.walk(prune=lambda obj: True)), 'Root')
+            with self.assertRaises(ValueError):
+                list(root.walk('random'))
@@ -0,0 +1,99 @@
+# -*- coding: utf-8
+
+import os
+import pickle
+import tempfile
+import unittest
+import unke
+import unke.parallel
+
+
+example_filename = os.path.join(os.path.dirname(__file__), '..', 'examples', 'example_performance.unk')
+
+
+class ParallelTest(unittest.TestCase):
+    def test_parallel_equals_eager(self):
+        expected = unke.dumps(unke.load(example_filename))
+        self.assertEqual(unke.dumps(unke.load(example_filename, workers=2)), expected)
+
+    def test_parents_and_hook(self):
+        unke_text = """
+        Root {
+            ItemOne {
+                Child {}
+                list: [Item {}]
+            }
+            object: Value {}
+            ItemTwo {}
+        }
+        """
+        expected = []
+        created = []
+        unke.loads(unke_text, object_created_hook=lambda o: expected.append(o.name))
+        doc = unke.parallel.loads(unke_text, 2, object_created_hook=lambda o: created.append(o.name))
+        self.assertEqual(created, expected)
+        self.assertIs(doc.root.children[0].parent, doc.root)
+        self.assertIs(doc.root.children[0].children[0].parent, doc.root.children[0])
+        self.assertIsNone(doc.root.properties['object'].parent)
+
+    def test_errors(self):
+        unke_text = "Root {\n    ItemOne {}\n    ItemTwo {\n        a: 1 b: 2\n    }\n}"
+        with self.assertRaises(unke.ParseException) as eager_context:
+            unke.loads(unke_text)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'error.unk')
+            with open(filename, 'w') as file:
+                file.write(unke_text)
+            with self.assertRaises(unke.ParseException) as parallel_context:
+                unke.load(filename, workers=2)
+        self.assertEqual(str(parallel_context.exception), str(eager_context.exception))
+        self.assertEqual((parallel_context.exception.line, parallel_context.exception.col), (4, 14))
+
+        # The hook is called like by the regular parser, never twice for the same object
+        expected = []
+        created = []
+        with self.assertRaises(unke.ParseException):
+            unke.loads(unke_text, object_created_hook=lambda o: expected.append(o.name))
+        with self.assertRaises(unke.ParseException):
+            unke.parallel.loads(unke_text, 2, object_created_hook=lambda o: created.append(o.name))
+        self.assertEqual(created, expected)
+
+        # Errors raised in worker processes keep their position
+        exception = pickle.loads(pickle.dumps(parallel_context.exception))
+        self.assertEqual((str(exception), exception.line, exception.col), (str(eager_context.exception), 4, 14))
+
+    def test_load_many(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = []
+            for i in range(10):
+                filenames.append(os.path.join(directory, '{}.unk'.format(i)))
+                with open(filenames[-1], 'w') as file:
+                    file.write('Root {\n    a: 1 b: 2\n}' if 3 == i else 'Root {\n    index: %d\n}' % i)
+
+            for executor in ('process', 'thread'):
+                results = list(unke.load_many(filenames, workers=2, executor=executor))
+                self.assertEqual([result[0] for result in results], filenames)
+                for i, (filename, doc, error) in enumerate(results):
+                    if 3 == i:
+                        self.assertIsNone(doc)
+                        self.assertIsInstance(error, unke.ParseException)
+                        self.assertEqual(error.line, 2)
+                    else:
+                        self.assertIsNone(error)
+                        self.assertEqual(doc.root.properties['index'], i)
+
+            results = unke.load_many(filenames, workers=2, executor='thread', ordered=False)
+            self.assertEqual(sorted(result[0] for result in results), sorted(filenames))
+
+            # Files that cannot be read or decoded do not stop the others from being loaded
+            missing = os.path.join(directory, 'missing.unk')
+            binary = os.path.join(directory, 'binary.unk')
+            with open(binary, 'wb') as file:
+                file.write(b'Root { a: "\xff" }')
+            for executor in ('process', 'thread'):
+                results = list(unke.load_many([filenames[0], missing, binary, filenames[1]], workers=1,
+                                              executor=executor))
+                self.assertEqual([result[0] for result in results], [filenames[0], missing, binary, filenames[1]])
+                self.assertIsInstance(results[1][2], FileNotFoundError)
+                self.assertIsInstance(results[2][2], UnicodeDecodeError)
+                self.assertEqual(results[3][1].root.properties['index'], 1)
@@ -1,7 +1,10 @@
 # -*- coding: utf-8
 
+import array
 import unittest
 import unke
+import unke.convert
+import unke.query
 
 
 class ParseTest(unittest.TestCase):
@@ -204,3 +207,110 @@ class ParseTest(unittest.TestCase):
         self.assertIsInstance(doc.root, MyTestObject)
         self.assertEqual(doc.root.val, True)
         self.assertEqual(MyTestObject.object_hook_called, True)
+
+    def test_parser_reuse(self):
+        parser = unke.Parser()
+        with self.assertRaises(unke.ParseException):
+            parser.parse("Root {\n    a: [\n}")
+        for i in range(3):
+            doc = parser.parse("Root {{\n    value: {}\n}}".format(i))
+            self.assertEqual(doc.root.properties["value"], i)
+
+    def test_numeric_lists(self):
+        unke_text = """
+        Root {
+            ints: [1, -2, +3]
+            floats: [
+                1.5,
+                -.25
+            ]
+            nested: [[1, 2], [0.5], [1, 2.5], []]
+            big: [1, 100000000000000000000]
+            Child { strings: ["a", "b"] }
+        }
+        """
+        for text in (unke_text, unke_text.encode('utf-8')):
+            doc = unke.loads(text, numeric_lists='array')
+            properties = doc.root.properties
+            self.assertEqual(properties['ints'], array.array('q', [1, -2, 3]))
+            self.assertEqual(properties['floats'], array.array('d', [1.5, -0.25]))
+            self.assertEqual(properties['nested'], [array.array('q', [1, 2]), array.array('d', [0.5]), [1, 2.5], []])
+            self.assertEqual(properties['big'], [1, 100000000000000000000])
+            self.assertEqual(doc.root.children[0].properties['strings'], ['a', 'b'])
+
+        # Errors are reported like without numeric lists
+        for unke_text in ('Root {\n  a: [1,\n  2,]\n}', 'Root {\n  a: [1\n  2]\n}', 'Root {\n  a: [1.]\n}',
+                          'Root {\n  a: [\n\n1]\n  [2]\n}', 'Root {\n  a: 1 [2]\n}', '[1] Root {}'):
+            messages = []
+            for numeric_lists in (None, 'array'):
+                try:
+                    messages.append(unke.loads(unke_text, numeric_lists=numeric_lists))
+                except unke.ParseException as e:
+                    messages.append(str(e))
+            self.assertEqual(messages[0], messages[1])
+
+        with self.assertRaises(ValueError):
+            unke.loads('Root {}', numeric_lists='tuple')
+        with self.assertRaises(ValueError):
+            unke.loads('Root {}', lazy=True, numeric_lists='array')
+
+    def test_numeric_lists_in_other_modules(self):
+        unke_text = 'Root {\n    ints: [1, 2, 3]\n    floats: [0.5]\n    Child { ints: [1, 2, 3] }\n}'
+        doc = unke.loads(unke_text, numeric_lists='array')
+        regular = unke.loads(unke_text)
+        # Serialized like regular lists
+        self.assertEqual(unke.dumps(unke.loads_binary(unke.dumps_binary(doc))), unke.dumps(regular))
+        for indent, minify in ((0, False), (2, True)):
+            self.assertEqual(unke.convert.document_to_json(doc, indent, minify),
+                             unke.convert.document_to_json(regular, indent, minify))
+        self.assertEqual(''.join(unke.convert._iter_json(unke.convert.document_to_dict(doc), None, (', ', ': '))),
+                         unke.convert.document_to_json(regular))
+        # Queried and found like regular lists
+        for path in ('Root.ints[0]', 'Root.ints[-1]', 'Root.ints[3]', 'Root.floats[*]', '//Child.ints[*]'):
+            self.assertEqual(unke.query.find_all(path, doc), unke.query.find_all(path, regular))
+        for indexed in (doc, unke.loads(unke_text, numeric_lists='array', build_index=True)):
+            self.assertEqual(len(indexed.find_by(ints=[1, 2, 3])), 2)
+            self.assertEqual(len(indexed.find_by(floats=array.array('d', [0.5]))), 1)
+
+    def test_intern_names(self):
+        unke_text = "Root {\n    Child { value: 1 }\n    Child { value: 2; other: 3 }\n    Child {}\n}"
+        doc = unke.loads(unke_text)
+        first, second, third = doc.root.children
+        self.assertIs(first.name, second.name)
+        self.assertIs(list(first.properties)[0], list(second.properties)[0])
+
+        other = unke.loads(unke_text, intern_names='global')
+        self.assertIs(other.root.children[0].name, unke.loads(unke_text, intern_names='global').root.children[0].name)
+        self.assertEqual(unke.loads(unke_text, intern_names=None).root.children[1].properties, second.properties)
+
+        for text in (unke_text, unke_text.encode('utf-8')):
+            shared = unke.loads(text, shared_keys=True)
+            self.assertEqual(unke.dumps(shared), unke.dumps(doc))
+            self.assertIs(type(shared.root.children[0].properties), dict)
+            shared.root.children[2].properties['value'] = 4
+            self.assertEqual(shared.root.children[2].properties, {'value': 4})
+            self.assertEqual(shared.root.children[0].properties, {'value': 1})
+
+        # A reused parser does not keep the shapes of earlier documents
+        shared_parser = unke.Parser(shared_keys=True)
+        for name in ('A', 'B', 'C'):
+            shared_parser.parse(name + ' { value: 1 }')
+            self.assertEqual(list(shared_parser._shapes), [name])
+
+        with self.assertRaises(ValueError):
+            unke.loads(unke_text, intern_names='process')
+        with self.assertRaises(ValueError):
+            unke.loads(unke_text, lazy=True, shared_keys=True)
+
+    def test_lazy_containers(self):
+        doc = unke.loads("Root {\n    Child {}\n    value: 1\n}")
+        child = doc.root.children[0]
+        self.assertFalse(hasattr(child, '__dict__'))
+        self.assertIsNone(child._children)
+        self.assertIsNone(child._properties)
+        self.assertEqual(child.properties, {})
+        child.children.append(unke.BoostedObject())
+        self.assertEqual(len(child._children), 1)
+        child.properties = {'value': 2}
+        self.assertEqual(child.children[0].name, '')
+        self.assertEqual(child.props, {'value': 2})
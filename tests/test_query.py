@@ -0,0 +1,89 @@
+# -*- coding: utf-8
+
+import io
+import unittest
+import unke
+import unke.convert
+import unke.query
+
+
+unke_text = """
+Root {
+    ItemOne {
+        Child { prop: 8 }
+        Child { prop: 3 }
+    }
+    ItemOne {
+        Child { prop: 9; flag: true }
+    }
+    ListItem { name: "d" }
+    f: [ListItem { name: "a" }, ListItem { name: "b"; sub: [ListItem { name: "c" }] }, 5]
+    o: Other { Child { prop: 1 } }
+}
+"""
+
+
+def describe(value):
+    if isinstance(value, unke.BaseObject):
+        return repr(unke.convert.object_to_dict(value))
+    if type(value) == list:
+        return '[{}]'.format(', '.join(map(describe, value)))
+    return repr(value)
+
+
+def names(values):
+    return [value.name if isinstance(value, unke.BaseObject) else value for value in values]
+
+
+class QueryTest(unittest.TestCase):
+    def test_find_all(self):
+        doc = unke.loads(unke_text)
+        root = doc.root
+        find = unke.query.find_all
+        expected = root.children[0].children[:1] + root.children[1].children
+        self.assertEqual(find('Root/ItemOne/Child[prop>7]', doc), expected)
+        self.assertEqual(find('Root.f[*].name', doc), ['a', 'b'])
+        self.assertEqual(find('Root.f[-1]', doc), [5])
+        self.assertEqual(find('Root.f[3]', doc), [])
+        self.assertEqual(sorted(find('//ListItem.name', doc)), ['a', 'b', 'c', 'd'])
+        self.assertEqual(find('//ListItem//ListItem.name', doc), ['c'])
+        self.assertEqual(find('//Child[flag=true].prop', doc), [9])
+        self.assertEqual(find('//Child[flag=1]', doc), [])
+        self.assertEqual(find('Root/*/Child[prop<9][prop>3]', doc), [root.children[0].children[0]])
+        self.assertEqual(find('Root.o/Child.prop', doc), [1])
+        self.assertEqual(names(find('//*[name="b"]', doc)), ['ListItem'])
+        self.assertEqual(find('Other', doc), [])
+        self.assertEqual(find('Child', root.children[0].children[0]), [root.children[0].children[0]])
+        self.assertIsNone(unke.query.compile('//Missing').find_first(doc))
+        self.assertIs(unke.query.compile('//Child'), unke.query.compile('//Child'))
+
+        columnar = unke.loads_columnar(unke_text)
+        self.assertEqual(unke.query.find_all('//Child.prop', columnar), find('//Child.prop', doc))
+        self.assertEqual(len(unke.query.find_all('//ListItem', columnar)), 4)
+
+    def test_events(self):
+        doc = unke.loads(unke_text)
+        for path in ('Root/ItemOne/Child[prop>7]', '//ListItem', 'Root.f[*].name', 'Root.f[0]', 'Root.*',
+                     '//ListItem//ListItem', '//*[name]', 'Root.o/Child', '//Child[flag=true].prop', 'X'):
+            query = unke.query.compile(path)
+            expected = query.find_all(doc)
+            matches = list(query.iterparse(io.StringIO(unke_text)))
+            self.assertEqual(sorted(map(describe, matches)), sorted(map(describe, expected)), path)
+        child = next(unke.query.compile('Root/ItemOne/Child').iterparse(io.StringIO(unke_text)))
+        self.assertEqual(child.properties, {'prop': 8})
+
+    def test_events_duplicate_properties(self):
+        # Only the last value of a property assigned again matches, like in the document
+        unke_text = ('Root {\n    a: 1\n    o: Other { Child { prop: 1 } }\n    Child { prop: 2; prop: 3 }\n'
+                     '    a: 4\n    o: [Child { prop: 5 }]\n}')
+        doc = unke.loads(unke_text)
+        for path in ('Root.a', '//Child.prop', '//Child', 'Root.o', '//Other'):
+            query = unke.query.compile(path)
+            matches = list(query.iterparse(io.StringIO(unke_text)))
+            self.assertEqual(list(map(describe, matches)), list(map(describe, query.find_all(doc))), path)
+        self.assertEqual(unke.query.find_all('//Child.prop', doc), [3, 5])
+
+    def test_invalid(self):
+        for path in ('', '.a', 'a//', 'a[', 'a[x>]', 'a b', 'a[1.5]', 'a[x>', 'a[x=y]'):
+            with self.assertRaises(ValueError):
+                unke.query.compile(path)
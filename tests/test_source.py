@@ -0,0 +1,131 @@
+# -*- coding: utf-8
+
+import array
+import os
+import tempfile
+import unittest
+import unke
+
+
+class SourceTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'source.unk')
+        with open(self.filename, 'w') as file:
+            file.write(
+                '/* Settings */\n'
+                'Root {\n'
+                '    /* Window */ width: 640; height: 480\n'
+                '    title: "Übersicht"\n'
+                '    Child { sizes: [1, 2, 3] }\n'
+                '    obsolete: true\n'
+                '}\n'
+            )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self) -> str:
+        with open(self.filename) as file:
+            return file.read()
+
+    def test_save_changes(self):
+        doc = unke.load(self.filename, track_positions=True)
+        doc.root.properties['width'] = 800
+        doc.root.children[0].properties['sizes'][1] = 20
+        self.assertEqual(unke.save_changes(doc), 2)
+        self.assertEqual(
+            self.read(),
+            '/* Settings */\n'
+            'Root {\n'
+            '    /* Window */ width: 800; height: 480\n'
+            '    title: "Übersicht"\n'
+            '    Child { sizes: [1, 20, 3] }\n'
+            '    obsolete: true\n'
+            '}\n'
+        )
+
+        # Positions are tracked again after saving
+        del doc.root.properties['obsolete']
+        doc.root.properties['depth'] = 32
+        child = unke.BoostedObject()
+        child.name = 'Other'
+        child.parent = doc.root
+        doc.root.children.append(child)
+        doc.root.children[0].name = 'Renamed'
+        unke.save_changes(doc)
+        self.assertEqual(
+            self.read(),
+            '/* Settings */\n'
+            'Root {\n'
+            '    /* Window */ width: 800; height: 480\n'
+            '    title: "Übersicht"\n'
+            '    Renamed { sizes: [1, 20, 3] }\n'
+            '    Other {}\n'
+            '    depth: 32\n'
+            '}\n'
+        )
+        self.assertEqual(unke.dumps(unke.load(self.filename)), unke.dumps(doc))
+        self.assertEqual(unke.save_changes(doc), 0)
+        # The positions behind the changes were shifted instead of parsing the file again
+        loaded = unke.load(self.filename, track_positions=True)
+        self.assertEqual((doc.source.root.start, doc.source.root.end),
+                         (loaded.source.root.start, loaded.source.root.end))
+        self.assertEqual(doc.source.root.property_spans, loaded.source.root.property_spans)
+        self.assertEqual(os.listdir(self.directory.name), ['source.unk'])
+
+        # Numeric lists are written like regular lists
+        doc.root.children[0].properties['sizes'] = array.array('q', [4, 5])
+        unke.save_changes(doc)
+        self.assertEqual(unke.load(self.filename).root.children[0].properties['sizes'], [4, 5])
+
+    def test_save_changes_crlf(self):
+        with open(self.filename, 'rb') as file:
+            data = file.read()
+        with open(self.filename, 'wb') as file:
+            file.write(data.replace(b'\n', b'\r\n'))
+        doc = unke.load(self.filename, track_positions=True)
+        self.assertEqual(unke.dumps(doc), unke.dumps(unke.load(self.filename)))
+        doc.root.properties['depth'] = 32
+        unke.save_changes(doc)
+        with open(self.filename, 'rb') as file:
+            self.assertEqual(file.read(), data.replace(b'true\n}', b'true\n    depth: 32\n}').replace(b'\n', b'\r\n'))
+
+    def test_save_changes_nbsp(self):
+        data = self.read().replace('    Child', '\xa0Child')
+        with open(self.filename, 'w') as file:
+            file.write(data)
+        doc = unke.load(self.filename, track_positions=True)
+        self.assertEqual(unke.dumps(doc), unke.dumps(unke.load(self.filename)))
+        doc.root.children[0].properties['sizes'][1] = 20
+        doc.root.properties['obsolete'] = False
+        unke.save_changes(doc)
+        self.assertEqual(self.read(), data.replace('2, 3', '20, 3').replace('true', 'false'))
+
+    def test_save_changes_errors(self):
+        with self.assertRaises(ValueError):
+            unke.save_changes(unke.load(self.filename))
+
+        doc = unke.load(self.filename, track_positions=True)
+        with open(self.filename, 'a') as file:
+            file.write('\n')
+        os.utime(self.filename, ns=(0, 0))
+        with self.assertRaises(ValueError):
+            unke.save_changes(doc)
+
+        # Changes that would alter how the text around them is read are not saved
+        with open(self.filename, 'w') as file:
+            file.write('Root {\n    a: 1\n    Child /* comment */ {}\n}')
+        doc = unke.load(self.filename, track_positions=True)
+        doc.root.children.clear()
+        with self.assertRaises(ValueError):
+            unke.save_changes(doc)
+        self.assertEqual(self.read(), 'Root {\n    a: 1\n    Child /* comment */ {}\n}')
+
+        with open(self.filename, 'w') as file:
+            file.write('Root {\n    a: 1 b: 2\n}')
+        with self.assertRaises(unke.ParseException) as eager_context:
+            unke.load(self.filename)
+        with self.assertRaises(unke.ParseException) as tracking_context:
+            unke.load(self.filename, track_positions=True)
+        self.assertEqual(str(tracking_context.exception), str(eager_context.exception))
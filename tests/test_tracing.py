@@ -0,0 +1,96 @@
+# -*- coding: utf-8
+
+import os
+import tempfile
+import unittest
+import unke
+from unke import grammar
+
+
+unke_text = """
+Root {
+    a: 1; b: [1, [2, 3]]
+    Child { c: "x"
+        Sub { d: true }
+    }
+    other: Other { e: 2.5 }
+}
+"""
+
+
+class RecordingTracer(unke.Tracer):
+    def __init__(self):
+        self.events = []
+
+    def phase_started(self, phase):
+        self.events.append(('start', phase))
+
+    def phase_finished(self, phase, duration):
+        self.events.append(('finish', phase))
+
+    def object_created(self, obj, depth):
+        self.events.append(('object', obj.name, depth))
+
+
+class TracingTest(unittest.TestCase):
+    def assertStats(self, stats):
+        self.assertEqual(stats.parses, 1)
+        self.assertEqual(stats.objects_created, 4)
+        self.assertEqual(stats.lists_created, 2)
+        self.assertEqual(stats.max_depth, 3)
+        self.assertEqual(stats.token_counts[grammar.Tag.BlockStart], 4)
+        self.assertEqual(stats.token_counts[grammar.Tag.PropertyTag], 6)
+        self.assertEqual(stats.to_dict()['tokens']['ListStart'], 2)
+        self.assertGreaterEqual(stats.total_time, stats.lex_time + stats.hook_time)
+
+    def test_loads(self):
+        names = []
+        stats = unke.Stats()
+        doc = unke.loads(unke_text, tracer=stats, object_created_hook=lambda obj: names.append(obj.name))
+        self.assertEqual(unke.dumps(doc), unke.dumps(unke.loads(unke_text)))
+        self.assertStats(stats)
+        self.assertEqual(stats.hook_calls, len(names))
+        self.assertEqual(stats.bytes_read, 0)
+
+        # Statistics add up
+        unke.loads(unke_text.encode('utf-8'), tracer=stats)
+        self.assertEqual(stats.parses, 2)
+        self.assertEqual(stats.objects_created, 8)
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'test.unk')
+            with open(filename, 'w') as file:
+                file.write(unke_text)
+            for mmap in (False, True):
+                stats = unke.Stats()
+                unke.load(filename, mmap=mmap, tracer=stats)
+                self.assertStats(stats)
+                self.assertEqual(stats.bytes_read, len(unke_text.encode('utf-8')))
+            with self.assertRaises(ValueError):
+                unke.load(filename, lazy=True, tracer=unke.Stats())
+
+    def test_numeric_lists(self):
+        stats = unke.Stats()
+        unke.loads('Root { a: [1, 2]; b: [[1.5], [2, "x"]] }', numeric_lists='array', tracer=stats)
+        self.assertEqual(stats.lists_created, 4)
+        self.assertEqual(stats.max_depth, 3)
+
+    def test_callbacks(self):
+        tracer = RecordingTracer()
+        unke.parse('Root {\n    Child {}\n}', tracer=tracer)
+        self.assertEqual(tracer.events, [
+            ('start', 'total'), ('start', 'lex'), ('finish', 'lex'), ('start', 'parse'),
+            ('object', 'Root', 1), ('object', 'Child', 2),
+            ('finish', 'parse'), ('finish', 'total')
+        ])
+
+        # Phases are finished on errors as well
+        tracer = RecordingTracer()
+        with self.assertRaises(unke.ParseException):
+            unke.loads('Root {', tracer=tracer)
+        self.assertEqual(tracer.events[-2:], [('finish', 'parse'), ('finish', 'total')])
+
+
+if __name__ == '__main__':
+    unittest.main()
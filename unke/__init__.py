@@ -1,11 +1,29 @@
 # -*- coding: utf-8
 
+import asyncio
+import concurrent.futures
+import functools
+import mmap as _mmap
 import typing
 
-from .objects import BaseObject, BoostedObject
+from .objects import BaseObject, BoostedObject, Order
 from .document import Document
-from .parser import parse
-from .dump import document_to_string
+from .parser import Parser, TracingParser, parse
+from .events import iterparse, aiterparse
+from . import lexer
+from . import query
+from . import tracing
+from . import lazy as _lazy
+from . import parallel as _parallel
+from . import source as _source
+from .parallel import load_many
+from .cache import Cache
+from .binary import dumps_binary, loads_binary
+from .columnar import ColumnarDocument, ColumnarObject, loads_columnar, load_columnar
+from .source import save_changes
+from .changes import diff, Change, ChangeType
+from .dump import document_to_string, iter_document, document_to_stream
+from .tracing import Tracer, Stats
 from .exceptions import ParseException
 
 
@@ -15,15 +33,88 @@ __license__ = 'MIT'
 __version__ = '0.1.0'
 
 
-def loads(s: str, object_type: BaseObject=BoostedObject, object_created_hook: typing.Callable=None) -> Document:
+def loads(s: str or bytes or memoryview, object_type: BaseObject=BoostedObject,
+          object_created_hook: typing.Callable=None, lazy: bool=False, numeric_lists: str=None,
+          intern_names: str='document', shared_keys: bool=False, build_index: bool=False,
+          tracer: Tracer=None) -> Document:
     """
     Parse Unke string and return resulting document object
-    :param s: String to parse
+    Bytes-like objects are lexed as UTF-8 without decoding them as a whole.
+    With numeric lists, lists of ints only or floats only are lexed and converted as a whole and returned
+    as array.array ('array') or NumPy arrays ('numpy').
+    Object and property names are stored once per document, or once per process with 'global' interning.
+    With shared keys, the property dicts of objects with the same name store their keys only once.
+    With an index, the objects can be looked up by name and properties, see Document.find_all().
+    With a tracer, e.g. Stats, the time spent per phase and the tokens, objects and lists are reported.
+    Without a tracer, the parse is not instrumented at all.
+    Numeric lists, other name interning, shared keys, the index and a tracer are not supported in lazy mode.
+    :param s: String or UTF-8 encoded bytes-like object to parse
     :param object_type: Class to be used to instantiate objects
     :param object_created_hook: Function to be called after an object was created
+    :param lazy: Parse the children and object or list properties of the root object on first access
+    :param numeric_lists: Type of numeric lists, 'array' or 'numpy'
+    :param intern_names: Name interning, None, 'document' or 'global'
+    :param shared_keys: Share the keys of the property dicts of objects with the same name
+    :param build_index: Index the objects by name and properties while parsing
+    :param tracer: Tracer to report to, see Tracer
     :return: Document
     """
-    return parse(s, object_type, object_created_hook)
+    if lazy:
+        _check_default_parser_options(numeric_lists, intern_names, shared_keys, build_index, tracer)
+        return _lazy.loads(s if isinstance(s, str) else str(s, 'utf-8'), object_type, object_created_hook)
+    document_parser = _create_parser(object_type, object_created_hook, numeric_lists, intern_names, shared_keys,
+                                     build_index, tracer)
+    if not isinstance(s, str):
+        return _parse_bytes(s, document_parser)
+    return document_parser.parse(s)
+
+
+def _create_parser(object_type: BaseObject, object_created_hook: typing.Callable, numeric_lists: str,
+                   intern_names: str, shared_keys: bool, build_index: bool, tracer: Tracer) -> Parser:
+    """
+    Create a parser, an instrumented one if a tracer is passed
+    """
+    if tracer is not None:
+        return TracingParser(tracer, object_type, object_created_hook, numeric_lists, intern_names, shared_keys,
+                             build_index)
+    return Parser(object_type, object_created_hook, numeric_lists, intern_names, shared_keys, build_index)
+
+
+def _check_default_parser_options(numeric_lists: str, intern_names: str, shared_keys: bool, build_index: bool,
+                                  tracer: Tracer = None):
+    """
+    Raise a ValueError if parser options are used that a loading mode does not support
+    :param numeric_lists: Type of numeric lists
+    :param intern_names: Name interning
+    :param shared_keys: Share the keys of the property dicts
+    :param build_index: Index the objects while parsing
+    :param tracer: Tracer to report to
+    """
+    if numeric_lists is not None or intern_names != 'document' or shared_keys or build_index or tracer is not None:
+        raise ValueError(
+            'numeric_lists, intern_names, shared_keys, build_index and tracer are not supported in this mode'
+        )
+
+
+def _parse_bytes(data: bytes or memoryview, bytes_parser: Parser) -> Document:
+    """
+    Parse a UTF-8 encoded Unke document and return resulting document object
+    Text with non-ASCII whitespace is decoded and parsed as a string, because only the text patterns match it.
+    In case of an error, the decoded text is parsed again without hook and tracer, so the error position is
+    counted in characters like for strings.
+    :param data: Bytes-like object to parse
+    :param bytes_parser: Parser to use
+    :return: Document
+    """
+    if lexer._text_whitespace_bytes_regex.search(data) is not None:
+        return bytes_parser.parse(str(data, 'utf-8'))
+    try:
+        return bytes_parser.parse(lexer.iter_lex_bytes(data, numeric_lists=bytes_parser.numeric_lists is not None))
+    except ParseException as e:
+        error = e
+    Parser(bytes_parser.object_type, numeric_lists=bytes_parser.numeric_lists).parse(str(data, 'utf-8'))
+    # The tokens are the same, so the error was raised by the hook
+    raise error
 
 
 def dumps(doc: Document, beautify: bool=True, indent: int=4) -> str:
@@ -42,16 +133,101 @@ def dumps(doc: Document, beautify: bool=True, indent: int=4) -> str:
     )
 
 
-def load(filename: str, object_type: BaseObject=BoostedObject, object_created_hook: typing.Callable=None) -> Document:
+def iterencode(doc: Document, beautify: bool=True, indent: int=4) -> typing.Iterator[str]:
+    """
+    Serialize Unke document chunk by chunk
+    The chunks joined together are equal to the string returned by dumps().
+    :param doc: Document to serialize
+    :param beautify: Format for human-readability
+    :param indent: Indentation in spaces
+    :return: Generator of string chunks
+    """
+    return iter_document(
+        doc,
+        indent=indent if beautify else 0,
+        wrap_lines=beautify,
+        spacing=beautify
+    )
+
+
+def dump_stream(doc: Document, fp: typing.TextIO, beautify: bool=True, indent: int=4) -> None:
+    """
+    Serialize Unke document to a text file object without building the whole string in memory
+    :param doc: Document to serialize
+    :param fp: File object to write to
+    :param beautify: Format for human-readability
+    :param indent: Indentation in spaces
+    """
+    document_to_stream(
+        doc,
+        fp,
+        indent=indent if beautify else 0,
+        wrap_lines=beautify,
+        spacing=beautify
+    )
+
+
+def load(filename: str, object_type: BaseObject=BoostedObject, object_created_hook: typing.Callable=None,
+         lazy: bool=False, mmap: bool=False, workers: int=None, cache: Cache=None,
+         track_positions: bool=False, numeric_lists: str=None, intern_names: str='document',
+         shared_keys: bool=False, build_index: bool=False, tracer: Tracer=None) -> Document:
     """
     Load Unke file and return resulting document object
+    The file is read and lexed in chunks, so neither the whole text nor the whole token list is held in memory.
+    In lazy mode, the text is kept in memory instead and only the outline of the root object is parsed.
+    With mmap, the file is memory-mapped and lexed as UTF-8 bytes, only the token values are decoded.
+    With more than one worker, the children and object or list properties of the root object are parsed
+    in a process pool. The object type must be picklable then.
+    With a cache, the document is taken from the cache if the file did not change since it was cached.
+    With position tracking, the source spans of all objects, lists and values are recorded, so changes
+    can be written back with save_changes() without reformatting the rest of the file.
+    Numeric lists, name interning, shared keys, the index and a tracer work as for loads(), the tracer is also
+    told about every chunk read. Only the default name interning without a tracer is supported together with
+    lazy mode, workers, a cache or position tracking. Documents loaded that way can still be indexed with
+    Document.build_index().
     :param filename: Filename to open
     :param object_type: Class to be used to instantiate objects
     :param object_created_hook: Function to be called after an object was created
+    :param lazy: Parse the children and object or list properties of the root object on first access
+    :param mmap: Memory-map the file instead of reading it in chunks
+    :param workers: Number of worker processes
+    :param cache: Cache to use, see Cache
+    :param track_positions: Record the source spans for save_changes()
+    :param numeric_lists: Type of numeric lists, 'array' or 'numpy'
+    :param intern_names: Name interning, None, 'document' or 'global'
+    :param shared_keys: Share the keys of the property dicts of objects with the same name
+    :param build_index: Index the objects by name and properties while parsing
+    :param tracer: Tracer to report to, see Tracer
     :return: Document
     """
+    if lazy or track_positions or cache is not None or (workers is not None and workers > 1):
+        _check_default_parser_options(numeric_lists, intern_names, shared_keys, build_index, tracer)
+    if track_positions:
+        return _source.load(filename, object_type, object_created_hook)
+    if cache is not None:
+        return cache.load(filename, object_type, object_created_hook)
+    if workers is not None and workers > 1 and not lazy:
+        with open(filename, 'r') as file:
+            return _parallel.loads(file.read(), workers, object_type, object_created_hook)
+    if lazy:
+        with open(filename, 'r') as file:
+            return _lazy.loads(file.read(), object_type, object_created_hook)
+    document_parser = _create_parser(object_type, object_created_hook, numeric_lists, intern_names, shared_keys,
+                                     build_index, tracer)
+    if mmap:
+        with open(filename, 'rb') as file:
+            # Empty files cannot be mapped
+            size = file.seek(0, 2)
+            if tracer is not None:
+                # Mapped pages are read while lexing, so only the size is reported
+                tracer.chunk_read(size, 0.0)
+            if size == 0:
+                return _parse_bytes(b'', document_parser)
+            with _mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ) as data:
+                return _parse_bytes(data, document_parser)
     with open(filename, 'r') as file:
-        return loads(file.read(), object_type, object_created_hook)
+        stream = file if tracer is None else tracing.TracedFile(file, tracer)
+        return document_parser.parse(lexer.iter_lex(stream, numeric_lists=numeric_lists is not None))
 
 
 def dump(filename: str, doc: Document, beautify: bool=True, indent: int=4) -> None:
@@ -63,4 +239,53 @@ def dump(filename: str, doc: Document, beautify: bool=True, indent: int=4) -> No
     :param indent: Indentation in spaces
     """
     with open(filename, 'w') as file:
-        file.write(dumps(doc, beautify, indent))
+        dump_stream(doc, file, beautify, indent)
+
+
+async def aloads(s: str or bytes or memoryview, object_type: BaseObject=BoostedObject,
+                 object_created_hook: typing.Callable=None, lazy: bool=False,
+                 executor: concurrent.futures.Executor=None) -> Document:
+    """
+    Asynchronous version of loads(), the string is parsed in an executor so the event loop is not blocked
+    :param s: String or UTF-8 encoded bytes-like object to parse
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :param lazy: Parse the children and object or list properties of the root object on first access
+    :param executor: Executor to use, defaults to the default executor of the event loop
+    :return: Document
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(loads, s, object_type, object_created_hook, lazy)
+    )
+
+
+async def aload(filename: str, object_type: BaseObject=BoostedObject, object_created_hook: typing.Callable=None,
+                lazy: bool=False, mmap: bool=False, executor: concurrent.futures.Executor=None) -> Document:
+    """
+    Asynchronous version of load(), the file is read and parsed in an executor so the event loop is not blocked
+    :param filename: Filename to open
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :param lazy: Parse the children and object or list properties of the root object on first access
+    :param mmap: Memory-map the file instead of reading it in chunks
+    :param executor: Executor to use, defaults to the default executor of the event loop
+    :return: Document
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(load, filename, object_type, object_created_hook, lazy, mmap)
+    )
+
+
+async def adump(filename: str, doc: Document, beautify: bool=True, indent: int=4,
+                executor: concurrent.futures.Executor=None) -> None:
+    """
+    Asynchronous version of dump(), the document is serialized and written in an executor
+    :param filename: Filename to dump to
+    :param doc: Document to serialize
+    :param beautify: Format for human-readability
+    :param indent: Indentation in spaces
+    :param executor: Executor to use, defaults to the default executor of the event loop
+    """
+    await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(dump, filename, doc, beautify, indent)
+    )
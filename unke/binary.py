@@ -0,0 +1,292 @@
+# -*- coding: utf-8
+
+import struct
+import typing
+
+from . import document
+from . import objects
+from . import numeric
+
+
+# Format:
+# Header: magic, version and length of the body
+# Body: root object, or a single null tag for documents without root
+# Object: name, number of children, children, number of properties, (property name, value) for each property
+# Name: 0 for None, 1 followed by length and UTF-8 bytes for a name that is new to the string table,
+#       the index in the string table plus 2 otherwise
+# Value: tag followed by the data of the value
+# Numbers are little endian. Counts, lengths and name indexes are unsigned 32 bit integers.
+
+_magic = b'UNKB'
+_version = 1
+
+(
+    _Null,
+    _False,
+    _True,
+    _Int,
+    _BigInt,
+    _Float,
+    _String,
+    _List,
+    _Object
+) = range(9)
+
+_header_struct = struct.Struct('<4sBQ')
+_uint_struct = struct.Struct('<I')
+_tag_uint_struct = struct.Struct('<BI')
+_tag_int_struct = struct.Struct('<Bq')
+_tag_float_struct = struct.Struct('<Bd')
+_int_min = -2 ** 63
+_int_max = 2 ** 63 - 1
+
+
+class _Encoder:
+    """
+    Encodes a document, only used internally by dumps_binary()
+    """
+    __slots__ = ('names', 'buffer')
+
+    def __init__(self):
+        # String table: name -> index
+        self.names = {}
+        self.buffer = bytearray()
+
+    def name(self, name: str or None):
+        if name is None:
+            self.buffer += _uint_struct.pack(0)
+            return
+        index = self.names.get(name)
+        if index is None:
+            self.names[name] = len(self.names)
+            encoded = name.encode('utf-8')
+            self.buffer += _uint_struct.pack(1)
+            self.buffer += _uint_struct.pack(len(encoded))
+            self.buffer += encoded
+        else:
+            self.buffer += _uint_struct.pack(index + 2)
+
+    def object(self, obj: objects.BaseObject):
+        # Objects and lists of any depth are encoded without recursion. The stack holds the generators of
+        # the values still to encode of the open objects and lists.
+        stack = [self.start_object(obj)]
+        while stack:
+            for value, is_child in stack[-1]:
+                items = self.start_object(value) if is_child else self.value(value)
+                if items is not None:
+                    stack.append(items)
+                    break
+            else:
+                stack.pop()
+
+    def start_object(self, obj: objects.BaseObject) -> typing.Iterator[tuple]:
+        self.name(obj.name)
+        self.buffer += _uint_struct.pack(len(obj.children))
+        return self.object_items(obj)
+
+    def object_items(self, obj: objects.BaseObject) -> typing.Iterator[tuple]:
+        # Children and property values with whether they are children, the number of properties and the
+        # property names are written in between
+        for child in obj.children:
+            yield child, True
+        self.buffer += _uint_struct.pack(len(obj.properties))
+        for property_name, property_value in obj.properties.items():
+            self.name(property_name)
+            yield property_value, False
+
+    def value(self, value) -> typing.Iterator[tuple] or None:
+        # Lists and objects are only started, the values still to encode are returned
+        buffer = self.buffer
+        if value is True:
+            buffer.append(_True)
+        elif value is False:
+            buffer.append(_False)
+        elif isinstance(value, int):
+            if _int_min <= value <= _int_max:
+                buffer += _tag_int_struct.pack(_Int, value)
+            else:
+                encoded = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+                buffer += _tag_uint_struct.pack(_BigInt, len(encoded))
+                buffer += encoded
+        elif isinstance(value, float):
+            buffer += _tag_float_struct.pack(_Float, value)
+        elif isinstance(value, str):
+            encoded = value.encode('utf-8')
+            buffer += _tag_uint_struct.pack(_String, len(encoded))
+            buffer += encoded
+        elif isinstance(value, list):
+            buffer += _tag_uint_struct.pack(_List, len(value))
+            return ((element, False) for element in value)
+        elif isinstance(value, objects.BaseObject):
+            buffer.append(_Object)
+            return self.start_object(value)
+        elif value is None:
+            buffer.append(_Null)
+        elif isinstance(value, numeric.array_types):
+            # Numeric lists are loaded as regular lists
+            return self.value(value.tolist())
+        else:
+            raise TypeError('Value of type {} cannot be encoded'.format(type(value).__name__))
+        return None
+
+
+def dumps_binary(doc: document.Document) -> bytes:
+    """
+    Serialize Unke document to the binary Unke format
+    Documents are loaded from the binary format much faster than from text. Besides the values the text
+    format supports, None and integers of any size are encoded as well.
+    :param doc: Document to serialize
+    :return: Resulting bytes
+    """
+    encoder = _Encoder()
+    if doc.root is None:
+        encoder.buffer.append(_Null)
+    else:
+        encoder.buffer.append(_Object)
+        encoder.object(doc.root)
+    return _header_struct.pack(_magic, _version, len(encoder.buffer)) + encoder.buffer
+
+
+class _Decoder:
+    """
+    Decodes a document, only used internally by loads_binary()
+    """
+    __slots__ = ('data', 'pos', 'names', 'object_type', 'object_created_hook')
+
+    def __init__(self, data: bytes, pos: int, object_type: objects.BaseObject, object_created_hook: typing.Callable):
+        self.data = data
+        self.pos = pos
+        # String table: index -> name
+        self.names = []
+        self.object_type = object_type
+        self.object_created_hook = object_created_hook
+
+    def uint(self) -> int:
+        value = _uint_struct.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def string(self, length: int) -> str:
+        start = self.pos
+        self.pos += length
+        return str(self.data[start:self.pos], 'utf-8')
+
+    def name(self) -> str or None:
+        index = self.uint()
+        if index == 0:
+            return None
+        elif index == 1:
+            name = self.string(self.uint())
+            self.names.append(name)
+            return name
+        return self.names[index - 2]
+
+    def read(self):
+        # Objects and lists of any depth are decoded without recursion. The stack holds the open objects
+        # and lists as [object or list, number of children, properties or items still to read, reading children]
+        stack = []
+        result = self.value(stack)
+        while stack:
+            frame = stack[-1]
+            target, remaining, reading_children = frame
+            if remaining == 0:
+                if reading_children:
+                    frame[1] = self.uint()
+                    frame[2] = False
+                    continue
+                stack.pop()
+                if self.object_created_hook is not None and type(target) != list:
+                    self.object_created_hook(target)
+                continue
+            frame[1] = remaining - 1
+            if reading_children:
+                target.children.append(self.object(target, stack))
+            elif type(target) == list:
+                target.append(self.value(stack))
+            else:
+                property_name = self.name()
+                target.properties[property_name] = self.value(stack)
+        return result
+
+    def object(self, parent: objects.BaseObject or None, stack: list) -> objects.BaseObject:
+        obj = self.object_type()
+        obj.name = self.name()
+        # Only children have a parent, like for parsed documents
+        obj.parent = parent
+        stack.append([obj, self.uint(), True])
+        return obj
+
+    def value(self, stack: list):
+        # Lists and objects are put on the stack to be read
+        data = self.data
+        tag = data[self.pos]
+        if _Int == tag:
+            value = _tag_int_struct.unpack_from(data, self.pos)[1]
+            self.pos += 9
+        elif _String == tag:
+            self.pos += 1
+            value = self.string(self.uint())
+        elif _Float == tag:
+            value = _tag_float_struct.unpack_from(data, self.pos)[1]
+            self.pos += 9
+        elif _True == tag or _False == tag:
+            value = _True == tag
+            self.pos += 1
+        elif _List == tag:
+            self.pos += 1
+            value = []
+            stack.append([value, self.uint(), False])
+        elif _Object == tag:
+            self.pos += 1
+            value = self.object(None, stack)
+        elif _Null == tag:
+            value = None
+            self.pos += 1
+        elif _BigInt == tag:
+            self.pos += 1
+            length = self.uint()
+            value = int.from_bytes(data[self.pos:self.pos + length], 'little', signed=True)
+            self.pos += length
+        else:
+            raise ValueError('Unknown value tag {} at position {}'.format(tag, self.pos))
+        return value
+
+
+def loads_binary(data: bytes or memoryview, object_type: objects.BaseObject = objects.BoostedObject,
+                 object_created_hook: typing.Callable = None) -> document.Document:
+    """
+    Load Unke document from the binary Unke format
+    The object created hook is called once all children and properties of an object are loaded.
+    :param data: Bytes-like object to load
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :return: Unke document
+    """
+    if len(data) < _header_struct.size:
+        raise ValueError('Not a binary Unke document')
+    magic, version, length = _header_struct.unpack_from(data, 0)
+    if magic != _magic:
+        raise ValueError('Not a binary Unke document')
+    if version != _version:
+        raise ValueError('Unsupported binary Unke version {}'.format(version))
+    if len(data) != _header_struct.size + length:
+        raise ValueError('Binary Unke document is truncated or has trailing data')
+
+    decoder = _Decoder(
+        data,
+        _header_struct.size,
+        object_type,
+        object_created_hook if isinstance(object_created_hook, typing.Callable) else None
+    )
+    if length == 0:
+        raise ValueError('Invalid binary Unke document: the root is missing')
+    if data[decoder.pos] not in (_Object, _Null):
+        raise ValueError('Invalid binary Unke document: the root must be an object')
+    doc = document.Document()
+    try:
+        doc.root = decoder.read()
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid binary Unke document: {}'.format(e))
+    if decoder.pos != len(data):
+        raise ValueError('Invalid binary Unke document: unexpected data at position {}'.format(decoder.pos))
+    return doc
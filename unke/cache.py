@@ -0,0 +1,221 @@
+# -*- coding: utf-8
+
+import collections
+import hashlib
+import hmac
+import io
+import os
+import pickle
+import tempfile
+import threading
+import typing
+
+from . import parser
+from . import document
+from . import objects
+
+# Key signing the files on disk of caches without a secret of their own, so they are only read by this process
+_process_secret = os.urandom(32)
+
+
+class Key:
+    """
+    Ways to tell whether a cached document is still up to date
+    """
+    # Modification time and size of the file, the file is only read on a cache miss
+    Stat = 'stat'
+    # Hash of the file content, the file is read every time but not parsed
+    Hash = 'hash'
+
+
+class Cache:
+    """
+    Cache for parsed Unke files
+    Documents are stored pickled, so every load returns a new copy and changes made to a loaded document
+    never reach the cache. The most recently used documents are kept in memory, up to a number of entries
+    and optionally a number of bytes. With a directory, the pickled documents are stored on disk as well,
+    so they survive restarts. Loading a pickled document is much faster than parsing the file again.
+    Unpickling data can run arbitrary code, so the files on disk are signed with an HMAC of a secret key and
+    ignored if the signature does not match. Without a secret, a random key is used for each process and the
+    files are only read by the process that wrote them. A configured secret must be kept from everyone who
+    must not run code in the processes using the cache.
+    The object created hook is only called for documents that are actually parsed.
+    A cache may be used by multiple threads at the same time.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = None, directory: str = None, key: str = Key.Stat,
+                 secret: bytes = None):
+        """
+        :param max_entries: Maximum number of documents kept in memory
+        :param max_bytes: Maximum size of the pickled documents kept in memory
+        :param directory: Directory to store the pickled documents in, not stored on disk if None
+        :param key: How to tell whether a cached document is up to date, see Key
+        :param secret: Key signing the files on disk, so that they are read by other processes, a random key
+                       for each process if None
+        """
+        if key not in (Key.Stat, Key.Hash):
+            raise ValueError('Unknown key "{}"'.format(key))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.key = key
+        self._secret = _process_secret if secret is None else secret
+        # Path: (key, pickled document) in the order of use, the most recently used last
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self, filename: str, object_type: objects.BaseObject = objects.BoostedObject,
+             object_created_hook: typing.Callable = None) -> document.Document:
+        """
+        Load a Unke file from the cache, or parse and cache it
+        :param filename: Filename to open
+        :param object_type: Class to be used to instantiate objects
+        :param object_created_hook: Function to be called after an object was created
+        :return: Document
+        """
+        path = os.path.abspath(filename)
+        data = None
+        if Key.Hash == self.key:
+            with open(path, 'rb') as file:
+                data = file.read()
+            version = hashlib.sha256(data).hexdigest()
+        else:
+            stat = os.stat(path)
+            version = (stat.st_mtime_ns, stat.st_size)
+        key = (version, object_type.__module__, object_type.__qualname__)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return pickle.loads(entry[1])
+
+        blob = self._load_from_disk(path, key)
+        if blob is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._store(path, key, blob)
+            return pickle.loads(blob)
+
+        with self._lock:
+            self.misses += 1
+        if data is None:
+            with open(path, 'rb') as file:
+                data = file.read()
+        # Decoded like a file opened in text mode
+        doc = parser.parse(io.TextIOWrapper(io.BytesIO(data)).read(), object_type, object_created_hook)
+        try:
+            blob = pickle.dumps(doc, pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            # Too deeply nested to be pickled
+            return doc
+        self._store(path, key, blob)
+        self._store_on_disk(path, key, blob)
+        return doc
+
+    def invalidate(self, filename: str = None):
+        """
+        Remove a file or all files from the cache, in memory and on disk
+        :param filename: File to remove, all files if None
+        """
+        with self._lock:
+            if filename is None:
+                paths = list(self._entries)
+            else:
+                paths = [os.path.abspath(filename)]
+            for path in paths:
+                entry = self._entries.pop(path, None)
+                if entry is not None:
+                    self._size -= len(entry[1])
+        if self.directory is not None:
+            if filename is None:
+                disk_filenames = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                                  if name.endswith('.pickle')]
+            else:
+                disk_filenames = [self._disk_filename(paths[0])]
+            for disk_filename in disk_filenames:
+                try:
+                    os.remove(disk_filename)
+                except FileNotFoundError:
+                    pass
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the pickled documents kept in memory in bytes
+        """
+        return self._size
+
+    def _store(self, path: str, key: tuple, blob: bytes):
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._size -= len(entry[1])
+            self._entries[path] = (key, blob)
+            self._size += len(blob)
+            # Evict the least recently used documents, but always keep the new one
+            while len(self._entries) > 1 and (
+                    len(self._entries) > self.max_entries or
+                    (self.max_bytes is not None and self._size > self.max_bytes)
+            ):
+                evicted_path, evicted_entry = self._entries.popitem(last=False)
+                self._size -= len(evicted_entry[1])
+                self.evictions += 1
+
+    def _disk_filename(self, path: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(path.encode('utf-8')).hexdigest() + '.pickle')
+
+    def _load_from_disk(self, path: str, key: tuple) -> bytes or None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._disk_filename(path), 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        # Nothing is unpickled before the signature was checked
+        signature_size = hashlib.sha256().digest_size
+        if not hmac.compare_digest(data[:signature_size], self._sign(path, data[signature_size:])):
+            return None
+        stream = io.BytesIO(data)
+        stream.seek(signature_size)
+        try:
+            # The key is stored in front of the pickled document
+            if pickle.load(stream) != key:
+                return None
+        except (pickle.UnpicklingError, EOFError):
+            return None
+        return stream.read()
+
+    def _store_on_disk(self, path: str, key: tuple, blob: bytes):
+        if self.directory is None:
+            return
+        # Write to a temporary file first, so no other process reads a partially written file
+        file_descriptor, temp_filename = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            data = pickle.dumps(key, pickle.HIGHEST_PROTOCOL) + blob
+            with os.fdopen(file_descriptor, 'wb') as file:
+                file.write(self._sign(path, data))
+                file.write(data)
+            os.replace(temp_filename, self._disk_filename(path))
+        except BaseException:
+            os.remove(temp_filename)
+            raise
+
+    def _sign(self, path: str, data: bytes) -> bytes:
+        # The path is signed as well, so a file cannot be passed off as the one of another path
+        signature = hmac.new(self._secret, path.encode('utf-8') + b'\0', hashlib.sha256)
+        signature.update(data)
+        return signature.digest()
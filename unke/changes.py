@@ -0,0 +1,413 @@
+# -*- coding: utf-8
+
+import difflib
+import typing
+
+from . import document
+from . import objects
+from . import columnar
+
+
+class ChangeType:
+    """
+    Types of the changes returned by diff()
+    """
+    Added = 'added'
+    Removed = 'removed'
+    Changed = 'changed'
+
+
+# Tags hashed together with the values, so e.g. 1, 1.0, true and "1" have different fingerprints
+(
+    _Object,
+    _List,
+    _String,
+    _Int,
+    _Float,
+    _Bool,
+    _Other
+) = range(7)
+
+
+class Change:
+    """
+    Single difference between two documents, see diff()
+    The path leads from the root object to the value that changed: strings are property names, ints are
+    child indexes in objects and item indexes in lists. The empty path stands for the root object.
+    Indexes refer to the new document, only the last index of a removed value refers to the old one.
+    """
+    __slots__ = ('type', 'path', 'old', 'new')
+
+    def __init__(self, change_type: str, path: tuple, old=None, new=None):
+        """
+        :param change_type: ChangeType
+        :param path: Path of the value
+        :param old: Old value, None if it was added
+        :param new: New value, None if it was removed
+        """
+        self.type = change_type
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return 'Change({}, {}, {!r}, {!r})'.format(self.type, self.path, self.old, self.new)
+
+
+class Fingerprints:
+    """
+    Cache of the Merkle fingerprints of objects
+    The fingerprint of an object is a hash of its name, its property values and the fingerprints of its
+    children and of the objects in its properties, so objects with the same fingerprint are taken to be
+    equal including all objects nested in them. Property order is ignored. Each fingerprint is computed
+    once; for a document cached by diff(cache=True), the cache only stays correct if the document is changed
+    through the Document methods, which drop the fingerprints of the changed object and of the objects it is
+    nested in.
+    Like hash(), fingerprints differ between processes, so they are not pickled.
+    """
+    __slots__ = ('hashes', 'owners', 'lists')
+
+    def __init__(self):
+        # Object key -> (object, fingerprint, fingerprints of the children)
+        self.hashes = {}
+        # Object key -> object whose children, properties or lists the object is in
+        self.owners = {}
+        # List id -> (list, fingerprint) while diff() runs, lists can be changed in place so they are not cached
+        # beyond that
+        self.lists = None
+
+    def of(self, value) -> int:
+        """
+        Get the fingerprint of an object, a list or any other property value
+        :param value: Value
+        :return: Fingerprint
+        """
+        if isinstance(value, objects.BaseObject):
+            return self._entry(value)[1]
+        value_type = type(value)
+        if value_type == str:
+            return hash((_String, value))
+        if value_type == bool:
+            return hash((_Bool, value))
+        # Numbers are hashed by their text, hash() maps e.g. -1 and -2 or 0 and 2 ** 61 - 1 to the same value
+        if value_type == int:
+            return hash((_Int, repr(value)))
+        if value_type == float:
+            return hash((_Float, repr(value)))
+        if value_type == list:
+            return self._list_hash(value)
+        # Numeric arrays
+        to_list = getattr(value, 'tolist', None)
+        if to_list is not None:
+            return hash((_Other, value_type.__name__, self.of(to_list())))
+        return hash((_Other, value_type.__name__, repr(value)))
+
+    def _list_hash(self, value: list) -> int:
+        # Lists of any depth are fingerprinted without recursion, each after the lists nested in it
+        lists = self.lists
+        entry = lists.get(id(value)) if lists is not None else None
+        if entry is not None and entry[0] is value:
+            return entry[1]
+        stack = [(value, iter(value), [])]
+        while True:
+            current, items, hashes = stack[-1]
+            for item in items:
+                if type(item) == list:
+                    entry = lists.get(id(item)) if lists is not None else None
+                    if entry is None or entry[0] is not item:
+                        stack.append((item, iter(item), []))
+                        break
+                    hashes.append(entry[1])
+                else:
+                    hashes.append(self.of(item))
+            else:
+                stack.pop()
+                list_hash = hash((_List, tuple(hashes)))
+                if lists is not None:
+                    lists[id(current)] = (current, list_hash)
+                if not stack:
+                    return list_hash
+                stack[-1][2].append(list_hash)
+
+    def of_children(self, obj: objects.BaseObject) -> tuple:
+        """
+        Get the fingerprints of the children of an object
+        :param obj: Object
+        :return: Tuple of fingerprints in the order of the children
+        """
+        return self._entry(obj)[2]
+
+    def _entry(self, obj: objects.BaseObject) -> tuple:
+        key = _key(obj)
+        entry = self.hashes.get(key)
+        if entry is None or entry[0] is not obj:
+            self._compute(obj)
+            entry = self.hashes[key]
+        return entry
+
+    def invalidate(self, obj: objects.BaseObject):
+        """
+        Drop the fingerprints of an object that changed and of all objects it is nested in
+        :param obj: Changed object
+        """
+        hashes = self.hashes
+        while obj is not None:
+            key = _key(obj)
+            entry = hashes.get(key)
+            if entry is None or entry[0] is not obj:
+                # The objects it is nested in can only have been fingerprinted together with it
+                return
+            del hashes[key]
+            obj = self.owners.get(key)
+
+    def forget(self, value):
+        """
+        Drop the fingerprints of all objects in a value that was removed
+        :param value: Removed object, list or other value
+        """
+        for obj in document.iter_objects(value):
+            key = _key(obj)
+            self.hashes.pop(key, None)
+            self.owners.pop(key, None)
+
+    def _compute(self, root: objects.BaseObject):
+        # Objects are fingerprinted after the objects nested in them, without recursion
+        hashes = self.hashes
+        owners = self.owners
+        stack = [(root, False)]
+        while stack:
+            obj, nested_done = stack.pop()
+            key = _key(obj)
+            if nested_done:
+                children = obj._children
+                child_hashes = tuple(hashes[_key(child)][1] for child in children) if children else ()
+                hashes[key] = (obj, self._object_hash(obj, child_hashes), child_hashes)
+                continue
+            entry = hashes.get(key)
+            if entry is not None and entry[0] is obj:
+                continue
+            stack.append((obj, True))
+            for nested in objects._nested_objects(obj, True):
+                owners[_key(nested)] = obj
+                stack.append((nested, False))
+
+    def _object_hash(self, obj: objects.BaseObject, child_hashes: tuple) -> int:
+        properties = obj._properties
+        return hash((
+            _Object,
+            obj.name,
+            child_hashes,
+            frozenset((key, self.of(value)) for key, value in properties.items()) if properties else frozenset()
+        ))
+
+    def __reduce__(self):
+        return Fingerprints, ()
+
+
+def _key(obj: objects.BaseObject):
+    # Columnar views are created on access, they are told apart by document and index instead of by id
+    return obj if type(obj) == columnar.ColumnarObject else id(obj)
+
+
+def _fingerprints(target: document.Document or objects.BaseObject, cache: bool) -> tuple:
+    """
+    Get the fingerprint cache and the root object of a document or object
+    With cache set, documents keep their cache for the next diff, otherwise a new one is used.
+    """
+    if isinstance(target, document.Document):
+        if not cache:
+            return Fingerprints(), target.root
+        if target.fingerprints is None:
+            target.fingerprints = Fingerprints()
+        return target.fingerprints, target.root
+    return Fingerprints(), target
+
+
+def diff(old: document.Document or objects.BaseObject, new: document.Document or objects.BaseObject,
+         cache: bool = False) -> list:
+    """
+    Compare two documents and return their differences
+    Objects and lists with the same fingerprint are skipped without looking at their contents, see Fingerprints.
+    With cache set, the fingerprints of documents are kept, so once both documents were fingerprinted, comparing
+    them only descends into the objects and lists that changed. The cached fingerprints only stay correct if the
+    documents are changed through the Document methods, objects, properties and children changed directly are
+    not noticed. Children and list items are matched by their fingerprints, so inserting or removing one of them
+    is reported as such instead of changing all that follow.
+    Replaced children with another name are reported as removed and added, a root object or property value
+    with another name as changed as a whole.
+    :param old: Old document, or object to use as root object
+    :param new: New document, or object to use as root object
+    :param cache: Keep the fingerprints of documents for the next diff
+    :return: List of changes, see Change. The changes of an object come before the changes nested in it.
+    """
+    old_fingerprints, old_root = _fingerprints(old, cache)
+    new_fingerprints, new_root = _fingerprints(new, cache)
+    if old_root is None or new_root is None:
+        if old_root is new_root:
+            return []
+        if old_root is None:
+            return [Change(ChangeType.Added, (), None, new_root)]
+        return [Change(ChangeType.Removed, (), old_root, None)]
+    old_fingerprints.lists = {}
+    new_fingerprints.lists = {}
+    try:
+        return _diff_roots(old_root, new_root, old_fingerprints, new_fingerprints)
+    finally:
+        old_fingerprints.lists = None
+        new_fingerprints.lists = None
+
+
+def _diff_roots(old_root: objects.BaseObject, new_root: objects.BaseObject, old_fingerprints: Fingerprints,
+                new_fingerprints: Fingerprints) -> list:
+    if old_fingerprints.of(old_root) == new_fingerprints.of(new_root):
+        return []
+
+    changes = []
+    # Pairs of objects or lists with different fingerprints as (path, old, new)
+    stack = [((), old_root, new_root)]
+    while stack:
+        path, old_value, new_value = stack.pop()
+        nested = []
+        if type(old_value) == list:
+            _diff_items(path, old_value, new_value, [old_fingerprints.of(item) for item in old_value],
+                        [new_fingerprints.of(item) for item in new_value], old_fingerprints, new_fingerprints,
+                        changes, nested)
+        elif old_value.name != new_value.name:
+            changes.append(Change(ChangeType.Changed, path, old_value, new_value))
+        else:
+            _diff_properties(path, old_value, new_value, old_fingerprints, new_fingerprints, changes, nested)
+            _diff_items(path, old_value._children or (), new_value._children or (),
+                        old_fingerprints.of_children(old_value), new_fingerprints.of_children(new_value),
+                        old_fingerprints, new_fingerprints, changes, nested)
+        stack.extend(reversed(nested))
+    return changes
+
+
+def _diff_properties(path: tuple, old: objects.BaseObject, new: objects.BaseObject, old_fingerprints: Fingerprints,
+                     new_fingerprints: Fingerprints, changes: list, nested: list):
+    old_properties = old._properties or {}
+    new_properties = new._properties or {}
+    for key, old_value in old_properties.items():
+        if key not in new_properties:
+            changes.append(Change(ChangeType.Removed, path + (key,), old_value, None))
+            continue
+        _diff_values(path + (key,), old_value, new_properties[key], old_fingerprints, new_fingerprints, changes,
+                     nested)
+    for key, new_value in new_properties.items():
+        if key not in old_properties:
+            changes.append(Change(ChangeType.Added, path + (key,), None, new_value))
+
+
+def _diff_values(path: tuple, old_value, new_value, old_fingerprints: Fingerprints, new_fingerprints: Fingerprints,
+                 changes: list, nested: list):
+    if old_fingerprints.of(old_value) == new_fingerprints.of(new_value):
+        return
+    if type(old_value) == list and type(new_value) == list or (
+            isinstance(old_value, objects.BaseObject) and isinstance(new_value, objects.BaseObject)):
+        # Compared later, so the changes nested in them follow the changes of their owner
+        nested.append((path, old_value, new_value))
+    else:
+        changes.append(Change(ChangeType.Changed, path, old_value, new_value))
+
+
+def _diff_items(path: tuple, old_items: typing.Sequence, new_items: typing.Sequence, old_hashes: typing.Sequence,
+                new_hashes: typing.Sequence, old_fingerprints: Fingerprints, new_fingerprints: Fingerprints,
+                changes: list, nested: list):
+    """
+    Compare the children of two objects or the items of two lists given with their fingerprints
+    """
+    # Equal items at the start and the end are skipped before the rest is matched
+    shortest = min(len(old_hashes), len(new_hashes))
+    start = next((i for i, (a, b) in enumerate(zip(old_hashes, new_hashes)) if a != b), shortest)
+    suffix = next((i for i, (a, b) in enumerate(zip(reversed(old_hashes[start:]), reversed(new_hashes[start:])))
+                   if a != b), shortest - start)
+    old_end = len(old_hashes) - suffix
+    new_end = len(new_hashes) - suffix
+    if start == old_end and start == new_end:
+        return
+
+    matcher = difflib.SequenceMatcher(None, old_hashes[start:old_end], new_hashes[start:new_end], autojunk=False)
+    for tag, old_start, old_stop, new_start, new_stop in matcher.get_opcodes():
+        if 'equal' == tag:
+            continue
+        old_start += start
+        old_stop += start
+        new_start += start
+        new_stop += start
+        pairs = _pair(old_items, new_items, old_start, old_stop, new_start, new_stop, old_fingerprints,
+                      new_fingerprints) if 'replace' == tag else []
+        for old_index, new_index in pairs:
+            _diff_values(path + (new_index,), old_items[old_index], new_items[new_index], old_fingerprints,
+                         new_fingerprints, changes, nested)
+        paired_old = set(old_index for old_index, _ in pairs)
+        paired_new = set(new_index for _, new_index in pairs)
+        for index in range(old_start, old_stop):
+            if index not in paired_old:
+                changes.append(Change(ChangeType.Removed, path + (index,), old_items[index], None))
+        for index in range(new_start, new_stop):
+            if index not in paired_new:
+                changes.append(Change(ChangeType.Added, path + (index,), None, new_items[index]))
+
+
+def _pair(old_items: typing.Sequence, new_items: typing.Sequence, old_start: int, old_stop: int, new_start: int,
+          new_stop: int, old_fingerprints: Fingerprints, new_fingerprints: Fingerprints) -> list:
+    """
+    Pair the replaced items that are compared instead of being reported as removed and added
+    Objects sharing the most property values and children are paired first, the remaining items are paired
+    in order if they are of the same kind, see _comparable().
+    :return: List of (old index, new index) sorted by new index
+    """
+    pairs = []
+    unpaired_new = list(range(new_start, new_stop))
+    unpaired_old = []
+    if (old_stop - old_start) * (new_stop - new_start) <= _max_similarity_pairs:
+        new_parts = {index: _parts(new_items[index], new_fingerprints) for index in unpaired_new}
+        for old_index in range(old_start, old_stop):
+            old_item = old_items[old_index]
+            old_parts = _parts(old_item, old_fingerprints)
+            best = None
+            best_score = 0
+            for new_index in unpaired_new:
+                if _comparable(old_item, new_items[new_index]):
+                    score = len(old_parts & new_parts[new_index])
+                    if score > best_score:
+                        best = new_index
+                        best_score = score
+            if best is None:
+                unpaired_old.append(old_index)
+            else:
+                pairs.append((old_index, best))
+                unpaired_new.remove(best)
+    else:
+        unpaired_old = list(range(old_start, old_stop))
+    for old_index, new_index in zip(unpaired_old, unpaired_new):
+        if _comparable(old_items[old_index], new_items[new_index]):
+            pairs.append((old_index, new_index))
+    pairs.sort(key=lambda pair: pair[1])
+    return pairs
+
+
+# Largest number of item pairs whose similarity is computed for a replaced range, larger ranges are paired in order
+_max_similarity_pairs = 10000
+
+
+def _comparable(old_value, new_value) -> bool:
+    # Objects with the same name, lists, or two other values
+    old_is_object = isinstance(old_value, objects.BaseObject)
+    if old_is_object or isinstance(new_value, objects.BaseObject):
+        return old_is_object and isinstance(new_value, objects.BaseObject) and old_value.name == new_value.name
+    return (type(old_value) == list) == (type(new_value) == list)
+
+
+def _parts(value, fingerprints: Fingerprints) -> set:
+    # Fingerprints of the properties and children of an object or of the items of a list
+    if isinstance(value, objects.BaseObject):
+        properties = value._properties
+        children = value._children
+        parts = set((key, fingerprints.of(item)) for key, item in properties.items()) if properties else set()
+        if children:
+            parts.update(fingerprints.of(child) for child in children)
+        return parts
+    if type(value) == list:
+        return set(fingerprints.of(item) for item in value)
+    return set()
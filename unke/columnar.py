@@ -0,0 +1,422 @@
+# -*- coding: utf-8
+
+import array
+import types
+import typing
+
+from . import lexer
+from . import events
+from . import document
+from . import objects
+
+
+class _ObjectIndex(int):
+    """
+    Index of an object stored as property value or list item, only used internally by ColumnarDocument
+    """
+    __slots__ = ()
+
+
+class _ObjectList(list):
+    """
+    List containing objects at any depth, only used internally by ColumnarDocument
+    """
+    __slots__ = ()
+
+
+class ColumnarObject(objects.BaseObject):
+    """
+    Read-only view of an object of a ColumnarDocument
+    Views are created on access and compare equal if they refer to the same object of the same document.
+    The children are returned as tuple and the properties as read-only mapping.
+    """
+
+    __slots__ = ('document', 'index')
+
+    def __init__(self, doc: 'ColumnarDocument', index: int):
+        self.document = doc
+        self.index = index
+
+    @property
+    def name(self):
+        doc = self.document
+        return doc.name_table[doc.names[self.index]]
+
+    @property
+    def parent(self):
+        parent = self.document.parents[self.index]
+        return ColumnarObject(self.document, parent) if parent >= 0 else None
+
+    @property
+    def children(self):
+        doc = self.document
+        start = doc.child_starts[self.index]
+        return tuple(
+            ColumnarObject(doc, index)
+            for index in doc.child_indices[start:start + doc.child_counts[self.index]]
+        )
+
+    @property
+    def properties(self):
+        doc = self.document
+        name_table = doc.name_table
+        start = doc.property_starts[self.index]
+        end = start + doc.property_counts[self.index]
+        return types.MappingProxyType({
+            name_table[key]: _resolve(doc, value)
+            for key, value in zip(doc.property_keys[start:end], doc.property_values[start:end])
+        })
+
+    # Internal readers of BaseObject access the containers through these names to avoid allocating them
+    _children = children
+    _properties = properties
+
+    @property
+    def siblings(self):
+        parent = self.parent
+        if parent is None:
+            return []
+        return [sibling for sibling in parent.children if sibling.index != self.index]
+
+    @property
+    def index_in_parent(self) -> int or None:
+        doc = self.document
+        parent = doc.parents[self.index]
+        if parent < 0:
+            return None
+        start = doc.child_starts[parent]
+        return doc.child_indices.index(self.index, start, start + doc.child_counts[parent]) - start
+
+    @property
+    def next_sibling(self):
+        index = self.index_in_parent
+        if index is None or index + 1 >= self.document.child_counts[self.document.parents[self.index]]:
+            return None
+        doc = self.document
+        return ColumnarObject(doc, doc.child_indices[doc.child_starts[doc.parents[self.index]] + index + 1])
+
+    @property
+    def previous_sibling(self):
+        index = self.index_in_parent
+        if index is None or index == 0:
+            return None
+        doc = self.document
+        return ColumnarObject(doc, doc.child_indices[doc.child_starts[doc.parents[self.index]] + index - 1])
+
+    def find_children(self, name: str or None) -> list:
+        doc = self.document
+        if name not in doc.name_table:
+            return []
+        name_id = doc.name_table.index(name)
+        names = doc.names
+        start = doc.child_starts[self.index]
+        return [
+            ColumnarObject(doc, index)
+            for index in doc.child_indices[start:start + doc.child_counts[self.index]] if names[index] == name_id
+        ]
+
+    def find_child(self, name: str or None):
+        children = self.find_children(name)
+        return children[0] if len(children) > 0 else None
+
+    def __eq__(self, other):
+        if type(other) != ColumnarObject:
+            return NotImplemented
+        return self.document is other.document and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.document), self.index))
+
+
+def _resolve(doc: 'ColumnarDocument', value):
+    """
+    Replace the object indexes of a stored value by views
+    """
+    value_type = type(value)
+    if value_type == _ObjectIndex:
+        return ColumnarObject(doc, value)
+    if value_type == _ObjectList:
+        return [_resolve(doc, item) for item in value]
+    return value
+
+
+class ColumnarDocument(document.Document):
+    """
+    Unke document storing its objects in columns instead of one Python object per node
+    Objects are numbered in document order, the root object has the index 0. For every object, the name
+    (index in name_table), the parent (-1 for the root, object properties and list items), the range
+    of its children in child_indices and the range of its properties in property_keys and property_values
+    are stored in arrays of 32 bit ints. Objects used as property values or list items are stored as their
+    index. The document is read-only, its objects are accessed through ColumnarObject views.
+    """
+
+    __slots__ = (
+        'name_table',
+        'names',
+        'parents',
+        'child_starts',
+        'child_counts',
+        'child_indices',
+        'property_starts',
+        'property_counts',
+        'property_keys',
+        'property_values'
+    )
+
+    def __init__(self):
+        self.source = None
+        self.index = None
+        self.fingerprints = None
+        self.name_table = []
+        self.names = array.array('i')
+        self.parents = array.array('i')
+        self.child_starts = array.array('i')
+        self.child_counts = array.array('i')
+        self.child_indices = array.array('i')
+        self.property_starts = array.array('i')
+        self.property_counts = array.array('i')
+        self.property_keys = array.array('i')
+        self.property_values = []
+
+    @property
+    def root(self):
+        return ColumnarObject(self, 0) if len(self.names) > 0 else None
+
+    @property
+    def object_count(self) -> int:
+        return len(self.names)
+
+    def find_all(self, name: str or None) -> list:
+        """
+        Find all objects with the given name by scanning the name column
+        :param name: Object name
+        :return: List of objects in document order
+        """
+        if self.index is not None:
+            return document.Document.find_all(self, name)
+        if name not in self.name_table:
+            return []
+        name_id = self.name_table.index(name)
+        return [ColumnarObject(self, index) for index, item in enumerate(self.names) if item == name_id]
+
+    def object_at(self, index: int) -> ColumnarObject:
+        """
+        Get the object with the given index
+        :param index: Index of the object in document order
+        :return: View of the object
+        """
+        if not 0 <= index < len(self.names):
+            raise IndexError('Object index out of range')
+        return ColumnarObject(self, index)
+
+
+def from_events(event_stream: typing.Iterable[tuple]) -> ColumnarDocument:
+    """
+    Build a columnar document from a stream of parse events
+    Only the children and properties of the open objects are buffered, they are moved to the columns
+    once their object is closed. Objects in property values replaced by a later value of the same property
+    are removed once the document is complete.
+    :param event_stream: Events of a whole document, e.g. returned by events.iterparse()
+    :return: ColumnarDocument
+    """
+    doc = ColumnarDocument()
+    name_ids = {}
+    name_table = doc.name_table
+    names = doc.names
+    child_indices = doc.child_indices
+    property_keys = doc.property_keys
+    property_values = doc.property_values
+    # Open objects as (index, child indexes, properties by name index, rows of the property values by name
+    # index) and open lists as lists. The rows of a value are its first row while it is open and the range
+    # (first, end) of the objects in it once it is closed.
+    hierarchy = []
+    # Ids of the open lists that contain objects
+    object_lists = set()
+    # Row ranges of the replaced property values
+    replaced = []
+
+    def name_id(name: str) -> int:
+        index = name_ids.get(name)
+        if index is None:
+            index = name_ids[name] = len(name_table)
+            name_table.append(name)
+        return index
+
+    for kind, key, value in event_stream:
+        if events.Event.Property == kind:
+            if key is None:
+                hierarchy[-1].append(value)
+            else:
+                key_id = name_id(key)
+                rows = hierarchy[-1][3].pop(key_id, None)
+                if rows is not None:
+                    replaced.append(rows)
+                hierarchy[-1][2][key_id] = value
+        elif events.Event.StartObject == kind or events.Event.StartList == kind:
+            first = len(names)
+            if events.Event.StartObject == kind:
+                index = len(names)
+                names.append(name_id(value))
+                doc.parents.append(-1)
+                for column in (doc.child_starts, doc.child_counts, doc.property_starts, doc.property_counts):
+                    column.append(0)
+                current = (index, [], {}, {})
+                item = _ObjectIndex(index)
+            else:
+                current = item = []
+            if len(hierarchy) > 0:
+                parent = hierarchy[-1]
+                if type(parent) == list:
+                    if type(item) == _ObjectIndex:
+                        object_lists.add(id(parent))
+                    parent.append(item)
+                elif key is not None:
+                    key_id = name_id(key)
+                    rows = parent[3].get(key_id)
+                    if rows is not None:
+                        replaced.append(rows)
+                    parent[3][key_id] = first
+                    parent[2][key_id] = item
+                else:
+                    doc.parents[index] = parent[0]
+                    parent[1].append(index)
+            hierarchy.append(current)
+        elif events.Event.EndObject == kind:
+            index, children, properties, value_rows = hierarchy.pop()
+            doc.child_starts[index] = len(child_indices)
+            doc.child_counts[index] = len(children)
+            child_indices.extend(children)
+            doc.property_starts[index] = len(property_keys)
+            doc.property_counts[index] = len(properties)
+            property_keys.extend(properties.keys())
+            property_values.extend(properties.values())
+            if key is not None and len(hierarchy) > 0 and type(hierarchy[-1]) != list:
+                _close_value(hierarchy[-1][3], name_id(key), len(names))
+        else:
+            current = hierarchy.pop()
+            if key is not None:
+                _close_value(hierarchy[-1][3], name_id(key), len(names))
+            if id(current) in object_lists:
+                # Lists containing objects are marked, so objects are only looked for where they are
+                object_lists.discard(id(current))
+                current = _ObjectList(current)
+                parent = hierarchy[-1]
+                if type(parent) == list:
+                    object_lists.add(id(parent))
+                    parent[-1] = current
+                else:
+                    parent[2][name_id(key)] = current
+
+    if replaced:
+        _remove_rows(doc, replaced)
+    return doc
+
+
+def _close_value(value_rows: dict, key_id: int, end: int):
+    first = value_rows[key_id]
+    if first == end:
+        # No objects to remove if the value is replaced
+        del value_rows[key_id]
+    else:
+        value_rows[key_id] = (first, end)
+
+
+def _remove_rows(doc: ColumnarDocument, ranges: typing.Iterable[tuple]):
+    """
+    Remove the objects in the given row ranges and the objects nested in them, the other objects are
+    numbered again in document order
+    :param doc: Columnar document
+    :param ranges: (first, end) ranges of rows
+    """
+    count = len(doc.names)
+    kept = bytearray(b'\x01') * count
+    for first, end in ranges:
+        kept[first:end] = bytes(end - first)
+    new_indexes = array.array('i', [0]) * count
+    new_index = 0
+    for index in range(count):
+        if kept[index]:
+            new_indexes[index] = new_index
+            new_index += 1
+
+    names = array.array('i')
+    parents = array.array('i')
+    child_starts = array.array('i')
+    child_counts = array.array('i')
+    child_indices = array.array('i')
+    property_starts = array.array('i')
+    property_counts = array.array('i')
+    property_keys = array.array('i')
+    property_values = []
+    for index in range(count):
+        if not kept[index]:
+            continue
+        names.append(doc.names[index])
+        parent = doc.parents[index]
+        parents.append(new_indexes[parent] if parent >= 0 else -1)
+        # The children of a kept object are kept as well
+        start = doc.child_starts[index]
+        end = start + doc.child_counts[index]
+        child_starts.append(len(child_indices))
+        child_counts.append(end - start)
+        child_indices.extend(new_indexes[child] for child in doc.child_indices[start:end])
+        start = doc.property_starts[index]
+        end = start + doc.property_counts[index]
+        property_starts.append(len(property_keys))
+        property_counts.append(end - start)
+        property_keys.extend(doc.property_keys[start:end])
+        property_values.extend(_renumber(value, new_indexes) for value in doc.property_values[start:end])
+
+    doc.names = names
+    doc.parents = parents
+    doc.child_starts = child_starts
+    doc.child_counts = child_counts
+    doc.child_indices = child_indices
+    doc.property_starts = property_starts
+    doc.property_counts = property_counts
+    doc.property_keys = property_keys
+    doc.property_values = property_values
+
+
+def _renumber(value, new_indexes: array.array):
+    """
+    Replace the object indexes of a stored value by their new indexes, lists of any depth without recursion
+    """
+    value_type = type(value)
+    if value_type == _ObjectIndex:
+        return _ObjectIndex(new_indexes[value])
+    if value_type != _ObjectList:
+        return value
+    result = _ObjectList()
+    stack = [(value, result)]
+    while stack:
+        items, target = stack.pop()
+        for item in items:
+            item_type = type(item)
+            if item_type == _ObjectIndex:
+                item = _ObjectIndex(new_indexes[item])
+            elif item_type == _ObjectList:
+                converted = _ObjectList()
+                stack.append((item, converted))
+                item = converted
+            target.append(item)
+    return result
+
+
+def loads_columnar(s: str or bytes or memoryview) -> ColumnarDocument:
+    """
+    Parse a Unke string into a columnar document
+    :param s: String or UTF-8 encoded bytes-like object to parse
+    :return: ColumnarDocument
+    """
+    return from_events(events.iter_events(lexer.lex(s if isinstance(s, str) else str(s, 'utf-8'))))
+
+
+def load_columnar(filename: str) -> ColumnarDocument:
+    """
+    Load a Unke file into a columnar document
+    The file is read, lexed and parsed in chunks, only the columns are kept in memory.
+    :param filename: Filename to open
+    :return: ColumnarDocument
+    """
+    return from_events(events.iterparse(filename))
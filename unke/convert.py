@@ -1,9 +1,53 @@
 # -*- coding: utf-8
 
+import bisect
+import codecs
+import io
 import json
+import re
+import tempfile
+import typing
 
 from . import document
+from . import events
 from . import objects
+from . import numeric
+
+
+# Number of characters of JSON text transcode_to_json() keeps in memory per buffer before moving them
+# to a temporary file
+_spool_size = 1048576
+
+# Number of characters that must follow the start of a JSON token before it is read, unless the input ends.
+# Longer numbers and strings are read once they are complete.
+_json_lookahead = 16
+
+# Constants accepted by the json module
+_json_constants = (('true', True), ('false', False), ('null', None), ('NaN', float('nan')),
+                   ('Infinity', float('inf')), ('-Infinity', float('-inf')))
+
+# States of the JSON reader
+(
+    # A value is expected
+    _JsonValue,
+    # A value or the end of the list is expected
+    _JsonValueOrEnd,
+    # A key is expected
+    _JsonKey,
+    # A key or the end of the dict is expected
+    _JsonKeyOrEnd,
+    _JsonColon,
+    # A comma or the end of the dict or list is expected
+    _JsonDelimiter
+) = range(6)
+
+# Reads a JSON value at a position of a string, the same way as json.loads()
+_json_scanner = json.scanner.make_scanner(json.decoder.JSONDecoder())
+# Strings and brackets, to find the dicts and lists that do not end within a buffer
+_json_brackets_regex = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+
+# Marker for the name of an object whose name was not read yet
+_missing = object()
 
 
 def document_to_dict(doc: document.Document) -> dict:
@@ -18,35 +62,47 @@ def document_to_dict(doc: document.Document) -> dict:
 def object_to_dict(obj: objects.BaseObject) -> dict:
     """
     Convert Unke object to Python dict
+    Objects and lists of any depth are converted without recursion.
     :param obj: Object to convert
     :return: Resulting Python dict
     """
-    properties = {}
-    for property_name in obj.properties:
-        property_value = obj.properties[property_name]
-        if isinstance(property_value, objects.BaseObject):
-            properties[property_name] = object_to_dict(property_value)
-        elif type(property_value) == list:
-            def handle_list(l):
-                property_list = []
-                for item in l:
-                    if isinstance(item, objects.BaseObject):
-                        property_list.append(object_to_dict(item))
-                    elif type(item) == list:
-                        property_list.append(handle_list(item))
-                    else:
-                        property_list.append(item)
-                return property_list
-
-            properties[property_name] = handle_list(property_value)
+    result = {'name': obj.name, 'properties': {}, 'children': []}
+    # Objects and lists with the empty dict or list to fill, the dicts and lists are inserted right away
+    # and filled once they are taken from the stack
+    stack = [(obj, result)]
+    push = stack.append
+    while stack:
+        value, target = stack.pop()
+        if type(target) == list:
+            append = target.append
+            for item in value:
+                if type(item) == list:
+                    converted = []
+                    push((item, converted))
+                    item = converted
+                elif isinstance(item, objects.BaseObject):
+                    converted = {'name': item.name, 'properties': {}, 'children': []}
+                    push((item, converted))
+                    item = converted
+                append(item)
         else:
-            properties[property_name] = property_value
-
-    return {
-        'name': obj.name,
-        'properties': properties,
-        'children': [object_to_dict(child) for child in obj.children]
-    }
+            properties = target['properties']
+            for property_name, property_value in value.properties.items():
+                if type(property_value) == list:
+                    converted = []
+                    push((property_value, converted))
+                    property_value = converted
+                elif isinstance(property_value, objects.BaseObject):
+                    converted = {'name': property_value.name, 'properties': {}, 'children': []}
+                    push((property_value, converted))
+                    property_value = converted
+                properties[property_name] = property_value
+            append = target['children'].append
+            for child in value.children:
+                converted = {'name': child.name, 'properties': {}, 'children': []}
+                push((child, converted))
+                append(converted)
+    return result
 
 
 def document_to_json(doc: document.Document, indent: int = 0, minify: bool = False) -> str:
@@ -57,11 +113,7 @@ def document_to_json(doc: document.Document, indent: int = 0, minify: bool = Fal
     :param minify: Compact encoding without spacing
     :return: Resulting JSON string
     """
-    return json.dumps(
-        document_to_dict(doc),
-        indent=indent if indent > 0 else None,
-        separators=(',', ':') if minify else None
-    )
+    return _dumps(document_to_dict(doc), indent, minify)
 
 
 def object_to_json(obj: objects.BaseObject, indent: int = 0, minify: bool = False) -> str:
@@ -72,11 +124,127 @@ def object_to_json(obj: objects.BaseObject, indent: int = 0, minify: bool = Fals
     :param minify: Compact encoding without spacing
     :return: Resulting JSON string
     """
-    return json.dumps(
-        object_to_dict(obj),
-        indent=indent if indent > 0 else None,
-        separators=(',', ':') if minify else None
-    )
+    return _dumps(object_to_dict(obj), indent, minify)
+
+
+def _dumps(dict_value: dict, indent: int, minify: bool) -> str:
+    indent = indent if indent > 0 else None
+    separators = (',', ':') if minify else None
+    try:
+        return json.dumps(dict_value, indent=indent, separators=separators, default=_json_default)
+    except RecursionError:
+        # Too deeply nested for the json module
+        if separators is None:
+            separators = (', ', ': ') if indent is None else (',', ': ')
+        return ''.join(_iter_json(dict_value, indent, separators))
+
+
+def _iter_json(value, indent: int or None, separators: tuple) -> typing.Iterator[str]:
+    # Same output as json.dumps(), but the dicts and lists are encoded by one generator each that yields
+    # the generators of nested values, which are kept on a stack. So values of any depth are encoded.
+    stack = [_json_parts(value, 0, indent, separators)]
+    while stack:
+        for part in stack[-1]:
+            if type(part) == str:
+                yield part
+            else:
+                stack.append(part)
+                break
+        else:
+            stack.pop()
+
+
+def _json_default(value) -> list:
+    # Numeric lists are written as JSON arrays
+    if isinstance(value, numeric.array_types):
+        return value.tolist()
+    raise TypeError('Object of type {} is not JSON serializable'.format(value.__class__.__name__))
+
+
+def _json_parts(value, level: int, indent: int or None, separators: tuple) -> typing.Iterator:
+    if isinstance(value, dict):
+        return _json_dict_parts(value, level, indent, separators)
+    elif isinstance(value, (list, tuple)):
+        return _json_list_parts(value, level, indent, separators)
+    elif isinstance(value, numeric.array_types):
+        return _json_list_parts(value.tolist(), level, indent, separators)
+    return iter((_json_primitive(value),))
+
+
+def _json_dict_parts(value: dict, level: int, indent: int or None, separators: tuple) -> typing.Iterator:
+    if len(value) == 0:
+        yield '{}'
+        return
+    line_break, closing_line_break = _json_line_breaks(level, indent)
+    prefix = '{' + line_break
+    for key, item in value.items():
+        yield prefix + _json_key(key) + separators[1]
+        yield _json_parts(item, level + 1, indent, separators)
+        prefix = separators[0] + line_break
+    yield closing_line_break + '}'
+
+
+def _json_list_parts(value: list or tuple, level: int, indent: int or None, separators: tuple) -> typing.Iterator:
+    if len(value) == 0:
+        yield '[]'
+        return
+    line_break, closing_line_break = _json_line_breaks(level, indent)
+    prefix = '[' + line_break
+    for item in value:
+        yield prefix
+        yield _json_parts(item, level + 1, indent, separators)
+        prefix = separators[0] + line_break
+    yield closing_line_break + ']'
+
+
+def _json_line_breaks(level: int, indent: int or None) -> tuple:
+    if indent is None:
+        return '', ''
+    return '\n' + ' ' * (indent * (level + 1)), '\n' + ' ' * (indent * level)
+
+
+def _json_primitive(value) -> str:
+    if isinstance(value, str):
+        return json.encoder.encode_basestring_ascii(value)
+    elif value is None:
+        return 'null'
+    elif value is True:
+        return 'true'
+    elif value is False:
+        return 'false'
+    elif isinstance(value, int):
+        return int.__repr__(value)
+    elif isinstance(value, float):
+        return _json_float(value)
+    raise TypeError('Object of type {} is not JSON serializable'.format(value.__class__.__name__))
+
+
+def _json_float(value: float) -> str:
+    if value != value:
+        return 'NaN'
+    elif value == float('inf'):
+        return 'Infinity'
+    elif value == -float('inf'):
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+def _json_key(key) -> str:
+    if isinstance(key, str):
+        pass
+    elif isinstance(key, float):
+        key = _json_float(key)
+    elif key is True:
+        key = 'true'
+    elif key is False:
+        key = 'false'
+    elif key is None:
+        key = 'null'
+    elif isinstance(key, int):
+        key = int.__repr__(key)
+    else:
+        raise TypeError('keys must be str, int, float, bool or None, not {}'.format(key.__class__.__name__))
+    return json.encoder.encode_basestring_ascii(key)
 
 
 def dict_to_document(dict_value: dict) -> document.Document:
@@ -93,49 +261,1020 @@ def dict_to_document(dict_value: dict) -> document.Document:
 def dict_to_object(dict_value: dict, parent: objects.BaseObject = None) -> objects.BaseObject:
     """
     Convert Python dict to Unke object
+    Dicts and lists of any depth are converted without recursion.
     :param dict_value: Python dict to convert
     :param parent: Parent of resulting object
     :return: Resulting object
     """
+    result = _new_object(dict_value, parent)
+    # Dicts and lists with the empty object or list to fill, the objects and lists are inserted right away
+    # and filled once they are taken from the stack
+    stack = [(dict_value, result)]
+    push = stack.append
+    while stack:
+        value, target = stack.pop()
+        if type(target) == list:
+            append = target.append
+            for item in value:
+                if type(item) == dict:
+                    converted = _new_object(item, None)
+                    push((item, converted))
+                    item = converted
+                elif type(item) == list:
+                    converted = []
+                    push((item, converted))
+                    item = converted
+                append(item)
+        else:
+            properties = target.properties
+            for property_name, property_value in value['properties'].items():
+                if type(property_value) == dict:
+                    converted = _new_object(property_value, None)
+                    push((property_value, converted))
+                    property_value = converted
+                elif type(property_value) == list:
+                    converted = []
+                    push((property_value, converted))
+                    property_value = converted
+                properties[property_name] = property_value
+            children = []
+            for child_dict in value['children']:
+                converted = _new_object(child_dict, target)
+                push((child_dict, converted))
+                children.append(converted)
+            target.children = children
+    return result
+
+
+def _new_object(dict_value: dict, parent: objects.BaseObject or None) -> objects.BoostedObject:
     obj = objects.BoostedObject()
     obj.name = dict_value['name']
     obj.parent = parent
-    for property_name in dict_value['properties']:
-        property_value = dict_value['properties'][property_name]
-        if type(property_value) == dict:
-            obj.properties[property_name] = dict_to_object(property_value)
-        elif type(property_value) == list:
-            def handle_list(l):
-                property_list = []
-                for item in l:
-                    if type(item) == dict:
-                        property_list.append(dict_to_object(item))
-                    elif type(item) == list:
-                        property_list.append(handle_list(item))
-                    else:
-                        property_list.append(item)
-                return property_list
-
-            obj.properties[property_name] = handle_list(property_value)
-        else:
-            obj.properties[property_name] = property_value
-    obj.children = [dict_to_object(child_dict, obj) for child_dict in dict_value['children']]
     return obj
 
 
 def json_to_object(text: str) -> objects.BaseObject:
     """
     Convert JSON string to Unke object
+    JSON of any depth is read without recursion.
     :param text: JSON string to convert
     :return: Resulting object
     """
-    return dict_to_object(json.loads(text))
+    return dict_to_object(_json_loads(text))
 
 
 def json_to_document(text: str) -> document.Document:
     """
     Convert JSON string to document
+    JSON of any depth is read without recursion.
     :param text: JSON string to convert
     :return: Resulting object
     """
-    return dict_to_document(json.loads(text))
+    return dict_to_document(_json_loads(text))
+
+
+def _json_loads(text: str or bytes):
+    # Same as json.loads(), but values of any depth are read without recursion. The text is read as one
+    # chunk, so the json module reads it at once unless it is nested too deeply.
+    stream = io.StringIO(text) if isinstance(text, str) else io.BytesIO(text)
+    result = None
+    # Open dicts and lists
+    stack = []
+    for kind, key, value in _iter_json_events(stream, max(len(text), 1)):
+        if events.Event.Property == kind or events.Event.StartObject == kind or events.Event.StartList == kind:
+            if events.Event.StartObject == kind:
+                value = {}
+            elif events.Event.StartList == kind:
+                value = []
+            if len(stack) == 0:
+                result = value
+            elif key is None:
+                stack[-1].append(value)
+            else:
+                stack[-1][key] = value
+            if events.Event.Property != kind:
+                stack.append(value)
+        else:
+            stack.pop()
+    return result
+
+
+def transcode_to_json(source: str or typing.IO, destination: str or typing.IO, indent: int = 0,
+                      minify: bool = False, chunk_size: int = 65536):
+    """
+    Convert Unke text to JSON text without building a document
+    The JSON is written straight from the parse events, the result is the same as document_to_json()
+    of the parsed document. Only the open objects are buffered, as JSON requires their properties before
+    their children, and buffers growing large are moved to temporary files. So memory use is bounded by
+    the nesting depth of the document.
+    :param source: Filename or file object to read the Unke text from
+    :param destination: Filename or text file object to write the JSON text to
+    :param indent: Indentation in spaces
+    :param minify: Compact encoding without spacing
+    :param chunk_size: Number of characters or bytes to read at once from files
+    """
+    indent = indent if indent > 0 else None
+    item_separator = ',' if minify or indent is not None else ', '
+    key_separator = ':' if minify else ': '
+    line_breaks = _Indentation(indent, '\n')
+    encode = json.encoder.encode_basestring_ascii
+
+    property_event = events.Event.Property
+    start_object_event = events.Event.StartObject
+    end_object_event = events.Event.EndObject
+    start_list_event = events.Event.StartList
+
+    hierarchy = []
+    root = None
+    try:
+        for kind, key, value in events.iterparse(source, chunk_size):
+            if property_event == kind:
+                parent = hierarchy[-1]
+                if key is None:
+                    parent.target.write((item_separator if parent.has_items else '')
+                                        + line_breaks[parent.level + 1] + _json_primitive(value))
+                    parent.has_items = True
+                else:
+                    properties = parent.properties
+                    prefix = ((item_separator if properties.length else '')
+                              + line_breaks[parent.level + 2] + encode(key) + key_separator)
+                    start = properties.length + len(prefix)
+                    properties.write(prefix + _json_primitive(value))
+                    parent.set_value(key, start)
+            elif start_object_event == kind:
+                if len(hierarchy) == 0:
+                    level = 0
+                elif hierarchy[-1].is_list:
+                    level = hierarchy[-1].level + 1
+                else:
+                    level = hierarchy[-1].level + 2
+                hierarchy.append(_JsonObject(value, level))
+            elif end_object_event == kind:
+                current = hierarchy.pop()
+                if len(hierarchy) == 0:
+                    # Written once the rest of the document was validated
+                    root = current
+                    continue
+                parent = hierarchy[-1]
+                if parent.is_list:
+                    current.write_to(parent.target,
+                                     (item_separator if parent.has_items else '') + line_breaks[parent.level + 1],
+                                     item_separator, key_separator, line_breaks)
+                    parent.has_items = True
+                elif key is not None:
+                    properties = parent.properties
+                    prefix = ((item_separator if properties.length else '')
+                              + line_breaks[parent.level + 2] + encode(key) + key_separator)
+                    start = properties.length + len(prefix)
+                    current.write_to(properties, prefix, item_separator, key_separator, line_breaks)
+                    parent.set_value(key, start)
+                else:
+                    children = parent.children
+                    current.write_to(children,
+                                     (item_separator if children.length else '') + line_breaks[parent.level + 2],
+                                     item_separator, key_separator, line_breaks)
+            elif start_list_event == kind:
+                parent = hierarchy[-1]
+                if parent.is_list:
+                    target = parent.target
+                    target.write((item_separator if parent.has_items else '') + line_breaks[parent.level + 1])
+                    parent.has_items = True
+                    current = _JsonList(parent.level + 1, target, None)
+                else:
+                    target = parent.properties
+                    target.write((item_separator if target.length else '')
+                                 + line_breaks[parent.level + 2] + encode(key) + key_separator)
+                    current = _JsonList(parent.level + 2, target, parent)
+                target.write('[')
+                hierarchy.append(current)
+            else:
+                current = hierarchy.pop()
+                if current.has_items:
+                    current.target.write(line_breaks[current.level] + ']')
+                else:
+                    current.target.write(']')
+                if current.owner is not None:
+                    current.owner.set_value(key, current.start)
+        if isinstance(destination, str):
+            with open(destination, 'w') as file:
+                _write_json_root(root, file, item_separator, key_separator, line_breaks)
+        else:
+            _write_json_root(root, destination, item_separator, key_separator, line_breaks)
+    finally:
+        for frame in hierarchy:
+            frame.close()
+        if root is not None:
+            root.close()
+
+
+def _write_json_root(root, output: typing.IO, item_separator: str, key_separator: str, line_breaks: dict):
+    if root is None:
+        output.write('null')
+    else:
+        root.write_to(output, '', item_separator, key_separator, line_breaks)
+
+
+class _Indentation(dict):
+    """
+    Line break and indentation by nesting level, computed on first use
+    """
+    __slots__ = ('indent', 'line_break')
+
+    def __init__(self, indent: int or None, line_break: str):
+        super().__init__()
+        self.indent = indent
+        self.line_break = line_break
+
+    def __missing__(self, level: int) -> str:
+        whitespace = '' if self.indent is None else self.line_break + ' ' * (self.indent * level)
+        self[level] = whitespace
+        return whitespace
+
+
+class _Spool:
+    """
+    Text written by the transcoders, kept in memory up to _spool_size characters and in a temporary file
+    beyond. The text is a sequence of blocks, strings or spans of UTF-8 in the file, followed by the parts
+    written since the last block. The spool of a nested object is appended by its blocks, taking over its
+    file if there is none yet, so the text is not copied again for each enclosing object.
+    """
+    __slots__ = ('parts', 'start', 'size', 'length', 'file', 'blocks', 'block_starts')
+
+    def __init__(self):
+        self.parts = []
+        # Position of the first character in parts
+        self.start = 0
+        # Number of characters in memory, in parts and string blocks
+        self.size = 0
+        # Number of characters written in total
+        self.length = 0
+        self.file = None
+        # Strings or tuples of file offset and size, with the position of the first character of each block
+        self.blocks = []
+        self.block_starts = []
+
+    def write(self, text: str):
+        self.parts.append(text)
+        self.size += len(text)
+        self.length += len(text)
+        if self.size > _spool_size:
+            self._flush()
+
+    def extend(self, other: '_Spool'):
+        # Appends the text of the other spool, which is left empty
+        self._end_block()
+        other._end_block()
+        blocks = other.blocks
+        if other.file is not None:
+            if self.file is None:
+                self.file = other.file
+            else:
+                blocks = [block if type(block) == str else self._write_block(other._read_block(block))
+                          for block in blocks]
+                other.file.close()
+            other.file = None
+        self.block_starts += [self.length + start for start in other.block_starts]
+        self.blocks += blocks
+        self.size += other.size
+        self.length += other.length
+        self.start = self.length
+        other.__init__()
+        if self.size > _spool_size:
+            self._flush()
+
+    def _end_block(self):
+        if len(self.parts) > 0:
+            self.block_starts.append(self.start)
+            self.blocks.append(''.join(self.parts))
+            self.parts = []
+            self.start = self.length
+
+    def _flush(self):
+        # Moves the text in memory to the file
+        self._end_block()
+        if self.file is None:
+            self.file = tempfile.TemporaryFile()
+        for i, block in enumerate(self.blocks):
+            if type(block) == str:
+                self.blocks[i] = self._write_block(block.encode('utf-8'))
+        self.size = 0
+
+    def _write_block(self, data: bytes) -> tuple:
+        offset = self.file.seek(0, 2)
+        self.file.write(data)
+        return offset, len(data)
+
+    def _read_block(self, block: tuple) -> bytes:
+        self.file.seek(block[0])
+        return self.file.read(block[1])
+
+    def write_to(self, output, parts: list) -> list:
+        # The text is added to the parts if it is in memory, otherwise the parts and the text are written to
+        # the output, a text file or another spool. Returns the parts to continue with.
+        if len(self.blocks) == 0:
+            parts += self.parts
+            return parts
+        output.write(''.join(parts))
+        if type(output) == _Spool:
+            output.extend(self)
+        else:
+            for block in self.blocks:
+                output.write(self._text(block))
+            output.write(''.join(self.parts))
+        return []
+
+    def _text(self, block: str or tuple) -> str:
+        return block if type(block) == str else self._read_block(block).decode('utf-8')
+
+    def read(self, spans: typing.Iterable[tuple]) -> typing.Iterator[str]:
+        self._end_block()
+        for start, end in spans:
+            first = bisect.bisect_right(self.block_starts, start) - 1
+            last = bisect.bisect_right(self.block_starts, max(start, end - 1)) - 1
+            offset = self.block_starts[first]
+            text = ''.join(self._text(block) for block in self.blocks[first:last + 1])
+            yield text[start - offset:end - offset]
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class _JsonObject:
+    """
+    Open object of transcode_to_json()
+    Properties and children are written to separate buffers and joined when the object ends.
+    """
+    __slots__ = ('name', 'level', 'properties', 'values', 'duplicates', 'children')
+    is_list = False
+
+    def __init__(self, name: str or None, level: int):
+        self.name = name
+        # JSON nesting level of the object
+        self.level = level
+        self.properties = _Spool()
+        # Span of each property value in properties by property name
+        self.values = {}
+        # Set to true if a property was assigned more than once, the last value is kept at the first position
+        self.duplicates = False
+        self.children = _Spool()
+
+    def set_value(self, key: str, start: int):
+        if key in self.values:
+            self.duplicates = True
+        self.values[key] = (start, self.properties.length)
+
+    def write_to(self, output: typing.IO or _Spool, prefix: str, item_separator: str, key_separator: str,
+                 line_breaks: dict):
+        # Small objects are written at once, together with the prefix
+        level = self.level
+        line_break = line_breaks[level + 1]
+        parts = [prefix, '{', line_break, '"name"', key_separator, _json_primitive(self.name), item_separator,
+                 line_break, '"properties"', key_separator]
+        if self.properties.length == 0:
+            parts.append('{}')
+        elif self.duplicates:
+            output.write(''.join(parts) + '{')
+            parts = []
+            property_prefix = line_breaks[level + 2]
+            for key, value in zip(self.values, self.properties.read(self.values.values())):
+                output.write(property_prefix + json.encoder.encode_basestring_ascii(key) + key_separator + value)
+                property_prefix = item_separator + line_breaks[level + 2]
+            parts.append(line_break + '}')
+        else:
+            parts.append('{')
+            parts = self.properties.write_to(output, parts)
+            parts.append(line_break + '}')
+        parts += (item_separator, line_break, '"children"', key_separator)
+        if self.children.length == 0:
+            parts.append('[]')
+        else:
+            parts.append('[')
+            parts = self.children.write_to(output, parts)
+            parts.append(line_break + ']')
+        parts += (line_breaks[level], '}')
+        output.write(''.join(parts))
+        self.close()
+
+    def close(self):
+        self.properties.close()
+        self.children.close()
+
+
+class _JsonList:
+    """
+    Open list of transcode_to_json(), written to the buffer of the enclosing object
+    """
+    __slots__ = ('level', 'target', 'owner', 'start', 'has_items')
+    is_list = True
+
+    def __init__(self, level: int, target: _Spool, owner: _JsonObject or None):
+        # JSON nesting level of the list
+        self.level = level
+        self.target = target
+        # Object the list is a property value of, None for nested lists
+        self.owner = owner
+        self.start = target.length
+        self.has_items = False
+
+    def close(self):
+        pass
+
+
+def transcode_from_json(source: str or typing.IO, destination: str or typing.IO, beautify: bool = True,
+                        indent: int = 4, chunk_size: int = 65536):
+    """
+    Convert JSON text as written by document_to_json() to Unke text without building a document
+    The JSON is read in chunks and the Unke text is written straight from the JSON values, the result
+    is the same as unke.dumps() of json_to_document(). Dicts and lists that end within the current chunk
+    are read at once by the json module, larger ones value by value. Only the open objects are buffered,
+    as Unke text requires their children before their properties, and buffers growing large are moved to
+    temporary files. So memory use is bounded by the nesting depth of the document.
+    :param source: Filename, text or binary file object to read the JSON text from
+    :param destination: Filename or text file object to write the Unke text to
+    :param beautify: Format for human-readability
+    :param indent: Indentation in spaces
+    :param chunk_size: Number of characters or bytes to read at once from files
+    """
+    whitespace = _Indentation(indent if beautify else 0, '')
+    separator = '\n' if beautify else ';'
+    name_separator = ': ' if beautify else ':'
+    line_break = '\n' if beautify else ''
+    formatting = (whitespace, separator, ' {' if beautify else '{', line_break, name_separator)
+    property_event = events.Event.Property
+    start_object_event = events.Event.StartObject
+    end_object_event = events.Event.EndObject
+    start_list_event = events.Event.StartList
+    end_list_event = events.Event.EndList
+
+    hierarchy = []
+    root = None
+    # Nesting depth inside a value that is not part of the document, e.g. the value of an unknown key
+    skipped = 0
+    file = open(source, 'r') if isinstance(source, str) else None
+    try:
+        for kind, key, value in _iter_json_events(source if file is None else file, chunk_size):
+            if skipped > 0:
+                if start_object_event == kind or start_list_event == kind:
+                    skipped += 1
+                elif property_event != kind:
+                    skipped -= 1
+                continue
+            if end_object_event == kind or end_list_event == kind:
+                current = hierarchy.pop()
+            parent = hierarchy[-1] if len(hierarchy) > 0 else None
+            role = parent.role if parent is not None else _UnkeRole.Document
+
+            if property_event == kind:
+                # Primitive values, or dicts and lists that were read at once
+                if _UnkeRole.Properties == role:
+                    parent.owner.write_property(key, value, formatting)
+                elif _UnkeRole.List == role:
+                    try:
+                        text = _unke_text(value, parent.level + 1, True, formatting)
+                    except ValueError as error:
+                        parent.error = str(error)
+                    else:
+                        parent.target.write((',' + line_break if parent.has_items else '') + text)
+                    parent.has_items = True
+                elif _UnkeRole.Object == role:
+                    parent.set_member(key, value, formatting)
+                elif _UnkeRole.Children == role:
+                    parent.owner.write_child(value, formatting)
+                elif type(value) == dict:
+                    # Written once the rest of the document was validated
+                    root = _unke_text(value, 0, True, formatting)
+                else:
+                    raise ValueError('Expected an object')
+            elif start_object_event == kind:
+                if _UnkeRole.Object == role:
+                    if key == 'properties':
+                        parent.reset_properties()
+                        hierarchy.append(_UnkeProperties(parent))
+                    else:
+                        if key in _UnkeObject.members:
+                            parent.set_invalid(key)
+                        skipped = 1
+                elif _UnkeRole.List == role:
+                    hierarchy.append(_UnkeObject(parent.level + 1))
+                elif _UnkeRole.Document == role:
+                    hierarchy.append(_UnkeObject(0))
+                else:
+                    hierarchy.append(_UnkeObject(parent.owner.level + 1))
+            elif end_object_event == kind:
+                if _UnkeRole.Properties == current.role:
+                    continue
+                message = current.error()
+                if message is not None:
+                    # Only reported if the invalid value is not replaced, as with json.loads()
+                    current.close()
+                    if _UnkeRole.Document == role:
+                        raise ValueError(message)
+                    elif _UnkeRole.Properties == role:
+                        parent.owner.set_value(key, parent.owner.properties.length)
+                        parent.owner.errors[key] = message
+                    elif _UnkeRole.Children == role:
+                        parent.owner.invalid['children'] = message
+                    else:
+                        parent.error = message
+                elif _UnkeRole.Document == role:
+                    # Written once the rest of the document was validated
+                    root = current
+                elif _UnkeRole.Properties == role:
+                    owner = parent.owner
+                    properties = owner.properties
+                    start = properties.length
+                    current.write_to(properties, whitespace[owner.level + 1] + key + name_separator,
+                                     separator, False, formatting)
+                    owner.set_value(key, start)
+                elif _UnkeRole.Children == role:
+                    current.write_to(parent.owner.children, '', separator, True, formatting)
+                else:
+                    current.write_to(parent.target, ',' + line_break if parent.has_items else '', '',
+                                     True, formatting)
+                    parent.has_items = True
+            elif start_list_event == kind:
+                if _UnkeRole.Object == role:
+                    if key == 'children':
+                        parent.reset_children()
+                        hierarchy.append(_UnkeChildren(parent))
+                    else:
+                        if key in _UnkeObject.members:
+                            parent.set_invalid(key)
+                        skipped = 1
+                elif _UnkeRole.Properties == role:
+                    owner = parent.owner
+                    properties = owner.properties
+                    hierarchy.append(_UnkeList(owner.level + 1, properties, owner))
+                    properties.write(whitespace[owner.level + 1] + key + name_separator + '[' + line_break)
+                elif _UnkeRole.List == role:
+                    parent.target.write((',' + line_break if parent.has_items else '')
+                                        + whitespace[parent.level + 1] + '[' + line_break)
+                    parent.has_items = True
+                    hierarchy.append(_UnkeList(parent.level + 1, parent.target, None))
+                elif _UnkeRole.Children == role:
+                    parent.owner.set_invalid('children')
+                    skipped = 1
+                else:
+                    raise ValueError('Expected an object')
+            elif _UnkeRole.List == current.role:
+                current.target.write((line_break if current.has_items else '') + whitespace[current.level] + ']')
+                if current.owner is not None:
+                    current.target.write(separator)
+                    current.owner.set_value(key, current.start)
+                    if current.error is not None:
+                        current.owner.errors[key] = current.error
+                elif current.error is not None:
+                    hierarchy[-1].error = current.error
+
+        if root is None:
+            raise ValueError('Expected an object')
+        if isinstance(destination, str):
+            with open(destination, 'w') as output:
+                _write_unke_root(root, output, formatting)
+        else:
+            _write_unke_root(root, destination, formatting)
+    finally:
+        if file is not None:
+            file.close()
+        for frame in hierarchy:
+            frame.close()
+        if isinstance(root, _UnkeObject):
+            root.close()
+
+
+def _write_unke_root(root, output: typing.IO, formatting: tuple):
+    if type(root) == str:
+        output.write(root)
+    else:
+        root.write_to(output, '', '', True, formatting)
+
+
+def _json_unclosed(buffer: str, pos: int) -> set:
+    # Positions of the dicts and lists from pos on that do not end within the buffer
+    starts = []
+    for match in _json_brackets_regex.finditer(buffer, pos):
+        char = match.group()
+        if char == '{' or char == '[':
+            starts.append(match.start())
+        elif char == '}' or char == ']':
+            if len(starts) == 0:
+                break
+            starts.pop()
+    return set(starts)
+
+
+def _iter_json_events(stream: typing.IO, chunk_size: int) -> typing.Iterator[tuple]:
+    # Read a JSON document in chunks and yield the same (event, key, value) tuples as events.iterparse().
+    # Dicts start and end objects, keys are given for the values of dicts only. Values are the same as
+    # the ones returned by json.loads(), dicts and lists that are complete in the buffer are returned
+    # as property values at once.
+    match_whitespace = json.decoder.WHITESPACE.match
+    match_number = json.scanner.NUMBER_RE.match
+    scan_string = json.decoder.scanstring
+    scan_value = _json_scanner
+    decoder = None
+    buffer = ''
+    # Position of buffer[0] in the document
+    offset = 0
+    pos = 0
+    eof = False
+    # Number of characters needed after pos before the next token is read
+    needed = _json_lookahead
+    # Open dicts and lists with their keys: (is_dict, key)
+    hierarchy = []
+    key = None
+    state = _JsonValue
+    # Dicts and lists known not to end within the buffer, None if not searched for yet
+    unclosed = None
+    # Number of open dicts and lists when one could not be read at once, as it was nested too deeply or is
+    # invalid, the ones nested into it are not tried either
+    deep_level = None
+    while True:
+        pos = match_whitespace(buffer, pos).end()
+        if len(buffer) - pos < needed and not eof:
+            # Read the next chunk and drop the part of the buffer that was already consumed
+            chunk = stream.read(max(chunk_size, needed - len(buffer) + pos))
+            eof = not chunk
+            if isinstance(chunk, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                chunk = decoder.decode(chunk, final=eof)
+            offset += pos
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            unclosed = None
+            continue
+        needed = _json_lookahead
+        if pos == len(buffer):
+            break
+        char = buffer[pos]
+
+        if state == _JsonDelimiter:
+            if len(hierarchy) == 0:
+                raise ValueError('Extra data at position {}'.format(offset + pos))
+            is_dict = hierarchy[-1][0]
+            if char == ',':
+                state = _JsonKey if is_dict else _JsonValue
+                pos += 1
+                continue
+            elif char != ('}' if is_dict else ']'):
+                raise ValueError('Expecting "," delimiter at position {}'.format(offset + pos))
+        elif state == _JsonColon:
+            if char != ':':
+                raise ValueError('Expecting ":" delimiter at position {}'.format(offset + pos))
+            state = _JsonValue
+            pos += 1
+            continue
+        elif char == '"':
+            try:
+                value, end = scan_string(buffer, pos + 1)
+            except json.JSONDecodeError as error:
+                # The string or an escape sequence might continue in the next chunk
+                if not eof and (error.msg.startswith('Unterminated') or error.pos >= len(buffer) - 6):
+                    needed = 2 * (len(buffer) - pos)
+                    continue
+                raise ValueError('{} at position {}'.format(error.msg, offset + error.pos))
+            pos = end
+            if state >= _JsonKey:
+                key = value
+                state = _JsonColon
+            else:
+                yield (events.Event.Property, key, value)
+                state = _JsonDelimiter
+            continue
+        elif state >= _JsonKey:
+            if char != '}' or state != _JsonKeyOrEnd:
+                raise ValueError('Expecting property name enclosed in double quotes at position {}'.format(
+                    offset + pos))
+        elif char == '{' or char == '[':
+            # Dicts and lists that end within the buffer are read at once by the json module. Each failed attempt
+            # reads the rest of the buffer, so the ones known not to end within it are not tried.
+            if deep_level is None and (unclosed is None or pos not in unclosed):
+                try:
+                    value, end = scan_value(buffer, pos)
+                except RecursionError:
+                    deep_level = len(hierarchy)
+                except (StopIteration, ValueError):
+                    # The dict or list continues in the next chunk or is invalid
+                    unclosed = _json_unclosed(buffer, pos)
+                    if pos not in unclosed:
+                        deep_level = len(hierarchy)
+                else:
+                    yield (events.Event.Property, key, value)
+                    state = _JsonDelimiter
+                    pos = end
+                    continue
+            # Read token by token
+            if char == '{':
+                hierarchy.append((True, key))
+                yield (events.Event.StartObject, key, None)
+                state = _JsonKeyOrEnd
+            else:
+                hierarchy.append((False, key))
+                yield (events.Event.StartList, key, None)
+                key = None
+                state = _JsonValueOrEnd
+            pos += 1
+            continue
+        elif char != ']' or state != _JsonValueOrEnd:
+            match = match_number(buffer, pos)
+            if match is not None:
+                # The number might continue in the next chunk, e.g. "1" followed by "e+5"
+                if match.end() + 3 > len(buffer) and not eof:
+                    needed = 2 * (len(buffer) - pos)
+                    continue
+                integer, fraction, exponent = match.groups()
+                if fraction or exponent:
+                    value = float(integer + (fraction or '') + (exponent or ''))
+                else:
+                    value = int(integer)
+                pos = match.end()
+            else:
+                for text, value in _json_constants:
+                    if buffer.startswith(text, pos):
+                        pos += len(text)
+                        break
+                else:
+                    raise ValueError('Expecting value at position {}'.format(offset + pos))
+            yield (events.Event.Property, key, value)
+            state = _JsonDelimiter
+            continue
+
+        # End of a dict or list
+        is_dict, key = hierarchy.pop()
+        if deep_level is not None and len(hierarchy) <= deep_level:
+            deep_level = None
+        yield (events.Event.EndObject if is_dict else events.Event.EndList, key, None)
+        key = None
+        state = _JsonDelimiter
+        pos += 1
+
+    if len(hierarchy) > 0 or state != _JsonDelimiter:
+        raise ValueError('Expecting value at position {}'.format(offset + pos))
+
+
+def _unke_text(value, level: int, leading_whitespace: bool, formatting: tuple) -> str:
+    # Unke text of a value returned by json.loads(), the same as the serialization of the value converted
+    # by dict_to_object(). Dicts and lists of any depth are serialized without recursion.
+    if type(value) != dict and type(value) != list:
+        return (formatting[0][level] if leading_whitespace else '') + _unke_primitive(value)
+    parts = []
+    stack = [_unke_parts(value, level, leading_whitespace, formatting)]
+    while stack:
+        for part in stack[-1]:
+            if type(part) == str:
+                parts.append(part)
+            else:
+                stack.append(part)
+                break
+        else:
+            stack.pop()
+    return ''.join(parts)
+
+
+def _unke_parts(value: dict or list, level: int, leading_whitespace: bool, formatting: tuple) -> typing.Iterator:
+    whitespace, separator, block_start, line_break, name_separator = formatting
+    if type(value) == list:
+        yield (whitespace[level] if leading_whitespace else '') + '[' + line_break
+        last = len(value) - 1
+        for i, item in enumerate(value):
+            if type(item) == dict or type(item) == list:
+                yield _unke_parts(item, level + 1, True, formatting)
+            else:
+                yield whitespace[level + 1] + _unke_primitive(item)
+            yield ',' + line_break if i < last else line_break
+        yield whitespace[level] + ']'
+        return
+
+    for key in _UnkeObject.members:
+        if key not in value:
+            raise ValueError('Expected key "{}" in object'.format(key))
+    name = value['name']
+    properties = value['properties']
+    children = value['children']
+    if type(name) == dict or type(name) == list:
+        raise ValueError('Expected {} for "name"'.format(_UnkeObject.members['name']))
+    if type(properties) != dict:
+        raise ValueError('Expected {} for "properties"'.format(_UnkeObject.members['properties']))
+    if type(children) != list:
+        raise ValueError('Expected {} for "children"'.format(_UnkeObject.members['children']))
+    empty = len(children) + len(properties) == 0
+    yield (whitespace[level] if leading_whitespace else '') + str(name) + block_start + (
+        line_break if not empty else '')
+    for child in children:
+        if type(child) != dict:
+            raise ValueError('Expected {} for "children"'.format(_UnkeObject.members['children']))
+        yield _unke_parts(child, level + 1, True, formatting)
+        yield separator
+    property_whitespace = whitespace[level + 1]
+    for property_name, property_value in properties.items():
+        if type(property_value) == dict or type(property_value) == list:
+            yield property_whitespace + property_name + name_separator
+            yield _unke_parts(property_value, level + 1, False, formatting)
+            yield separator
+        else:
+            yield property_whitespace + property_name + name_separator + _unke_primitive(property_value) + separator
+    yield (whitespace[level] if not empty else '') + '}'
+
+
+def _unke_primitive(value) -> str:
+    # Same as the serialization of primitive values in unke.dump
+    if type(value) == bool:
+        return 'true' if value else 'false'
+    return repr(value)
+
+
+class _UnkeRole:
+    """
+    Roles of the JSON dicts and lists in transcode_from_json()
+    """
+    Document = 0
+    # Dict of an object
+    Object = 1
+    # Dict of the properties of an object
+    Properties = 2
+    # List of the children of an object
+    Children = 3
+    # List value of a property
+    List = 4
+
+
+class _UnkeObject:
+    """
+    Open object of transcode_from_json()
+    Children and properties are written to separate buffers and joined when the object ends.
+    """
+    __slots__ = ('level', 'name', 'properties', 'values', 'duplicates', 'children', 'invalid', 'errors')
+    role = _UnkeRole.Object
+    # Keys of the dict of an object with the expected type of their values
+    members = {'name': 'a primitive value', 'properties': 'a dict', 'children': 'a list of objects'}
+
+    def __init__(self, level: int):
+        # Indentation level of the object
+        self.level = level
+        self.name = _missing
+        # Buffers are created once the keys are found
+        self.properties = None
+        # Span of each property in properties by property name
+        self.values = {}
+        # Set to true if a property was assigned more than once, the last value is kept at the first position
+        self.duplicates = False
+        self.children = None
+        # Error messages by member with a value of the wrong type and by property with an invalid value.
+        # As with json.loads(), the last value of a key counts, so they are only reported if no valid
+        # value follows.
+        self.invalid = {}
+        self.errors = {}
+
+    def reset_properties(self):
+        if self.properties is not None:
+            self.properties.close()
+        self.properties = _Spool()
+        self.values = {}
+        self.duplicates = False
+        self.invalid.pop('properties', None)
+        self.errors = {}
+
+    def reset_children(self):
+        if self.children is not None:
+            self.children.close()
+        self.children = _Spool()
+        self.invalid.pop('children', None)
+
+    def set_value(self, key: str, start: int):
+        if key in self.values:
+            self.duplicates = True
+        self.values[key] = (start, self.properties.length)
+        self.errors.pop(key, None)
+
+    def set_invalid(self, key: str):
+        self.invalid[key] = 'Expected {} for "{}"'.format(self.members[key], key)
+
+    def set_member(self, key: str, value, formatting: tuple):
+        # Member of the dict of the object with a primitive value, or a dict or list that was read at once
+        if key == 'name':
+            if type(value) == dict or type(value) == list:
+                self.set_invalid(key)
+            else:
+                self.name = value
+                self.invalid.pop(key, None)
+        elif key == 'properties':
+            if type(value) == dict:
+                self.reset_properties()
+                for property_name, property_value in value.items():
+                    self.write_property(property_name, property_value, formatting)
+            else:
+                self.set_invalid(key)
+        elif key == 'children':
+            if type(value) == list:
+                self.reset_children()
+                for child in value:
+                    self.write_child(child, formatting)
+            else:
+                self.set_invalid(key)
+
+    def write_property(self, key: str, value, formatting: tuple):
+        whitespace, separator, block_start, line_break, name_separator = formatting
+        start = self.properties.length
+        try:
+            text = _unke_text(value, self.level + 1, False, formatting)
+        except ValueError as error:
+            self.set_value(key, start)
+            self.errors[key] = str(error)
+            return
+        self.properties.write(whitespace[self.level + 1] + key + name_separator + text + separator)
+        self.set_value(key, start)
+
+    def write_child(self, value, formatting: tuple):
+        if type(value) != dict:
+            self.set_invalid('children')
+            return
+        try:
+            text = _unke_text(value, self.level + 1, True, formatting)
+        except ValueError as error:
+            self.invalid['children'] = str(error)
+            return
+        self.children.write(text + formatting[1])
+
+    def error(self) -> str or None:
+        # Message of the first reason the object cannot be converted, None if it can be converted
+        for message in self.invalid.values():
+            return message
+        for key, value in (('name', self.name is not _missing), ('properties', self.properties is not None),
+                           ('children', self.children is not None)):
+            if not value:
+                return 'Expected key "{}" in object'.format(key)
+        for message in self.errors.values():
+            return message
+        return None
+
+    def write_to(self, output: typing.IO or _Spool, prefix: str, suffix: str, leading_whitespace: bool,
+                 formatting: tuple):
+        # Small objects are written at once, together with the prefix and suffix
+        whitespace, separator, block_start, line_break, name_separator = formatting
+        empty = self.children.length == 0 and self.properties.length == 0
+        parts = [prefix, whitespace[self.level] if leading_whitespace else '', str(self.name), block_start,
+                 line_break if not empty else '']
+        parts = self.children.write_to(output, parts)
+        if self.duplicates:
+            output.write(''.join(parts))
+            parts = []
+            for text in self.properties.read(self.values.values()):
+                output.write(text)
+        else:
+            parts = self.properties.write_to(output, parts)
+        parts += (whitespace[self.level] if not empty else '', '}', suffix)
+        output.write(''.join(parts))
+        self.close()
+
+    def close(self):
+        if self.properties is not None:
+            self.properties.close()
+        if self.children is not None:
+            self.children.close()
+
+
+class _UnkeProperties:
+    """
+    Open properties dict of transcode_from_json(), written to the buffer of its object
+    """
+    __slots__ = ('owner',)
+    role = _UnkeRole.Properties
+
+    def __init__(self, owner: _UnkeObject):
+        self.owner = owner
+
+    def close(self):
+        pass
+
+
+class _UnkeChildren(_UnkeProperties):
+    """
+    Open children list of transcode_from_json(), written to the buffer of its object
+    """
+    __slots__ = ()
+    role = _UnkeRole.Children
+
+
+class _UnkeList:
+    """
+    Open list of transcode_from_json(), written to the buffer of the enclosing object
+    """
+    __slots__ = ('level', 'target', 'owner', 'start', 'has_items', 'error')
+    role = _UnkeRole.List
+
+    def __init__(self, level: int, target: _Spool, owner: _UnkeObject or None):
+        # Indentation level of the list
+        self.level = level
+        self.target = target
+        # Object the list is a property value of, None for nested lists
+        self.owner = owner
+        self.start = target.length
+        self.has_items = False
+        # Error message of an invalid item
+        self.error = None
+
+    def close(self):
+        pass
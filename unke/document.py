@@ -1,8 +1,275 @@
 # -*- coding: utf-8
 
+import typing
+
+from . import objects
+from . import numeric
+
+
+class Index:
+    """
+    Lookup tables of the objects of a document by name, by property name and by property value
+    Objects are stored by their id, so adding and removing objects takes constant time. Property values
+    that are not hashable, e.g. lists, are only indexed by property name.
+    """
+    __slots__ = ('by_name', 'by_property', 'by_value')
+
+    def __init__(self):
+        # name -> {id: object}
+        self.by_name = {}
+        # property name -> {id: object}
+        self.by_property = {}
+        # (property name, value type, value) -> {id: object}
+        self.by_value = {}
+
+    def add(self, obj: objects.BaseObject):
+        """
+        Index a single object with its current name and properties, but not the objects nested in it
+        :param obj: Object to add
+        """
+        obj_id = id(obj)
+        _table(self.by_name, obj.name)[obj_id] = obj
+        properties = obj._properties
+        if properties:
+            for key, value in properties.items():
+                self.add_property(obj, key, value)
+
+    def remove(self, obj: objects.BaseObject):
+        """
+        Remove a single object with its current name and properties from the index
+        :param obj: Object to remove
+        """
+        _discard(self.by_name, obj.name, id(obj))
+        properties = obj._properties
+        if properties:
+            for key, value in properties.items():
+                self.remove_property(obj, key, value)
+
+    def add_property(self, obj: objects.BaseObject, key: str, value):
+        _table(self.by_property, key)[id(obj)] = obj
+        value_key = _value_key(key, value)
+        if value_key is not None:
+            _table(self.by_value, value_key)[id(obj)] = obj
+
+    def remove_property(self, obj: objects.BaseObject, key: str, value):
+        _discard(self.by_property, key, id(obj))
+        value_key = _value_key(key, value)
+        if value_key is not None:
+            _discard(self.by_value, value_key, id(obj))
+
+
+def _table(tables: dict, key) -> dict:
+    table = tables.get(key)
+    if table is None:
+        table = tables[key] = {}
+    return table
+
+
+def _discard(tables: dict, key, obj_id: int):
+    table = tables.get(key)
+    if table is not None:
+        table.pop(obj_id, None)
+        if len(table) == 0:
+            del tables[key]
+
+
+def _value_key(key: str, value) -> tuple or None:
+    # The type is part of the key, so e.g. 1 and True are told apart
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (key, type(value), value)
+
+
+def _matches(obj: objects.BaseObject, properties: dict) -> bool:
+    obj_properties = obj._properties
+    if not obj_properties:
+        return False
+    for key, value in properties.items():
+        if key not in obj_properties:
+            return False
+        obj_value = obj_properties[key]
+        # Numeric lists match the regular lists with the same items
+        if isinstance(obj_value, numeric.array_types):
+            obj_value = obj_value.tolist()
+        if isinstance(value, numeric.array_types):
+            value = value.tolist()
+        if type(obj_value) != type(value) or obj_value != value:
+            return False
+    return True
+
+
+def iter_objects(value) -> typing.Iterator[objects.BaseObject]:
+    """
+    Iterate an object and all objects nested in it as children, properties or list items
+    Objects of any depth are visited without recursion. Containers that were never accessed are not allocated.
+    :param value: Object, list or other value
+    :return: Generator of objects, in no particular order
+    """
+    stack = [value]
+    push = stack.append
+    while stack:
+        value = stack.pop()
+        if isinstance(value, objects.BaseObject):
+            yield value
+            children = value._children
+            if children:
+                stack.extend(children)
+            properties = value._properties
+            if properties:
+                for item in properties.values():
+                    if type(item) == list or isinstance(item, objects.BaseObject):
+                        push(item)
+        elif type(value) == list:
+            for item in value:
+                if type(item) == list or isinstance(item, objects.BaseObject):
+                    push(item)
+
 
 class Document:
-    __slots__ = ('root',)
+    """
+    Unke document
+    With an index, find_all() and find_by() look up objects instead of walking the document. The index
+    is built while parsing (see Parser) or by build_index() and only stays correct if the document is changed
+    through add_child(), remove_child(), set_name(), set_property() and remove_property().
+    The same holds for the subtree fingerprints cached by unke.diff(cache=True).
+    """
+    __slots__ = ('root', 'source', 'index', 'fingerprints')
 
     def __init__(self):
         self.root = None
+        # Source spans of a document loaded with position tracking, see unke.source
+        self.source = None
+        # Lookup tables, see Index
+        self.index = None
+        # Cached fingerprints of the objects, see changes.Fingerprints
+        self.fingerprints = None
+
+    def build_index(self):
+        """
+        Index all objects of the document, replacing an existing index
+        """
+        index = Index()
+        for obj in iter_objects(self.root):
+            index.add(obj)
+        self.index = index
+
+    def find_all(self, name: str or None) -> list:
+        """
+        Find all objects with the given name, including objects used as property values or list items
+        :param name: Object name
+        :return: List of objects, in no particular order
+        """
+        if self.index is not None:
+            return list(self.index.by_name.get(name, {}).values())
+        return [obj for obj in iter_objects(self.root) if obj.name == name]
+
+    def find_by(self, **properties) -> list:
+        """
+        Find all objects having all given properties, e.g. find_by(id=42)
+        Values match if they are equal and of the same type, so find_by(enabled=1) does not match true.
+        :param properties: Property names and values
+        :return: List of objects, in no particular order
+        """
+        if len(properties) == 0:
+            raise ValueError('find_by() requires at least one property')
+        if self.index is None:
+            return [obj for obj in iter_objects(self.root) if _matches(obj, properties)]
+        # Look up the smallest table and check the other properties on its objects
+        tables = []
+        for key, value in properties.items():
+            value_key = _value_key(key, value)
+            table = self.index.by_value.get(value_key) if value_key is not None else self.index.by_property.get(key)
+            if not table:
+                return []
+            tables.append(table)
+        return [obj for obj in min(tables, key=len).values() if _matches(obj, properties)]
+
+    def add_child(self, parent: objects.BaseObject, child: objects.BaseObject):
+        """
+        Append a child object, keeping the index up to date
+        :param parent: Object to add the child to
+        :param child: Child object, the objects nested in it are indexed as well
+        """
+        parent.children.append(child)
+        parent.invalidate_child_names()
+        child.parent = parent
+        if self.fingerprints is not None:
+            self.fingerprints.invalidate(parent)
+        if self.index is not None:
+            for obj in iter_objects(child):
+                self.index.add(obj)
+
+    def remove_child(self, parent: objects.BaseObject, child: objects.BaseObject):
+        """
+        Remove a child object, keeping the index up to date
+        :param parent: Object to remove the child from
+        :param child: Child object, the objects nested in it are removed from the index as well
+        """
+        children = parent.children
+        for i, item in enumerate(children):
+            if item is child:
+                del children[i]
+                break
+        else:
+            raise ValueError('Object is not a child of the parent')
+        parent.invalidate_child_names()
+        child.parent = None
+        if self.fingerprints is not None:
+            self.fingerprints.invalidate(parent)
+            self.fingerprints.forget(child)
+        if self.index is not None:
+            for obj in iter_objects(child):
+                self.index.remove(obj)
+
+    def set_name(self, obj: objects.BaseObject, name: str or None):
+        """
+        Rename an object, keeping the index up to date
+        :param obj: Object to rename
+        :param name: New name
+        """
+        if self.index is not None:
+            _discard(self.index.by_name, obj.name, id(obj))
+            _table(self.index.by_name, name)[id(obj)] = obj
+        if self.fingerprints is not None:
+            self.fingerprints.invalidate(obj)
+        obj.name = name
+
+    def set_property(self, obj: objects.BaseObject, key: str, value):
+        """
+        Set a property, keeping the index up to date
+        :param obj: Object to set the property on
+        :param key: Property name
+        :param value: Value, objects nested in it are indexed as well
+        """
+        properties = obj.properties
+        if self.fingerprints is not None:
+            self.fingerprints.invalidate(obj)
+            if key in properties:
+                self.fingerprints.forget(properties[key])
+        if self.index is not None:
+            if key in properties:
+                self._remove_from_index(obj, key, properties[key])
+            self.index.add_property(obj, key, value)
+            for nested in iter_objects(value):
+                self.index.add(nested)
+        properties[key] = value
+
+    def remove_property(self, obj: objects.BaseObject, key: str):
+        """
+        Remove a property, keeping the index up to date
+        :param obj: Object to remove the property from
+        :param key: Property name
+        """
+        value = obj.properties.pop(key)
+        if self.fingerprints is not None:
+            self.fingerprints.invalidate(obj)
+            self.fingerprints.forget(value)
+        if self.index is not None:
+            self._remove_from_index(obj, key, value)
+
+    def _remove_from_index(self, obj: objects.BaseObject, key: str, value):
+        self.index.remove_property(obj, key, value)
+        for nested in iter_objects(value):
+            self.index.remove(nested)
@@ -1,8 +1,17 @@
 # -*- coding: utf-8
 
+import typing
+
 from . import document
+from . import numeric
 from . import objects
 
+# Number of characters document_to_stream() collects before writing them
+_stream_buffer_size = 65536
+
+# Values serialized by a generator of their own
+_container_types = (list,) + numeric.array_types
+
 
 def document_to_string(doc: document.Document, indent_level: int = 0, indent: int = 4,
                        wrap_lines=True, spacing=True) -> str:
@@ -16,15 +25,47 @@ def document_to_string(doc: document.Document, indent_level: int = 0, indent: in
     :param default_leading_comment: Insert default leading comment
     :return: Resulting Unke string
     """
-    text = ''
-    text += object_to_string(
-        doc.root,
-        indent_level,
-        indent,
-        wrap_lines,
-        spacing
-    )
-    return text
+    return ''.join(iter_document(doc, indent_level, indent, wrap_lines, spacing))
+
+
+def iter_document(doc: document.Document, indent_level: int = 0, indent: int = 4,
+                  wrap_lines=True, spacing=True) -> typing.Iterator[str]:
+    """
+    Serialize Unke document to Unke string chunk by chunk
+    The chunks joined together are equal to the string returned by object_to_string() for the root object.
+    :param doc: Document to serialize
+    :param indent_level: Level of indentation
+    :param indent: Indentation in spaces
+    :param wrap_lines: Wrap lines
+    :param spacing: Insert space between property and value or object name and opening brace
+    :return: Generator of string chunks
+    """
+    return _iter_value(doc.root, indent_level, indent, wrap_lines, spacing, False)
+
+
+def document_to_stream(doc: document.Document, stream: typing.TextIO, indent_level: int = 0, indent: int = 4,
+                       wrap_lines=True, spacing=True):
+    """
+    Serialize Unke document to a text file object
+    The chunks are collected and written in blocks, so the whole string is never held in memory.
+    :param doc: Document to serialize
+    :param stream: File object to write to
+    :param indent_level: Level of indentation
+    :param indent: Indentation in spaces
+    :param wrap_lines: Wrap lines
+    :param spacing: Insert space between property and value or object name and opening brace
+    """
+    buffer = []
+    size = 0
+    for chunk in iter_document(doc, indent_level, indent, wrap_lines, spacing):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= _stream_buffer_size:
+            stream.write(''.join(buffer))
+            buffer.clear()
+            size = 0
+    if len(buffer) > 0:
+        stream.write(''.join(buffer))
 
 
 def object_to_string(obj: objects.BaseObject, indent_level: int = 0, indent: int = 4,
@@ -39,39 +80,7 @@ def object_to_string(obj: objects.BaseObject, indent_level: int = 0, indent: int
     :param no_leading_indent: No leading indentation
     :return: Resulting Unke string fragment
     """
-    # Check if the object is empty
-    empty = (len(obj.children) + len(obj.properties) == 0)
-
-    # Object name, opening bracket
-    text = '{}{}{}{}'.format(
-        _whitespace(indent_level, indent) if not no_leading_indent else '',
-        obj.name,
-        ' {' if spacing else '{',
-        '\n' if wrap_lines and not empty else ''
-    )
-
-    # Children
-    for child in obj.children:
-        text += object_to_string(child, indent_level + 1, indent, wrap_lines, spacing)
-        text += '\n' if wrap_lines else ';'
-
-    for property_name in obj.properties:
-        property_value = obj.properties[property_name]
-        text += property_to_string(
-            property_name,
-            property_value,
-            indent_level + 1,
-            indent,
-            wrap_lines,
-            spacing
-        )
-
-    # Closing bracket
-    text += '{}{}'.format(
-        _whitespace(indent_level, indent) if not empty else '',
-        '}'
-    )
-    return text
+    return ''.join(_iter_value(obj, indent_level, indent, wrap_lines, spacing, no_leading_indent))
 
 
 def property_to_string(name: str, value, indent_level: int = 0, indent: int = 4, wrap_lines=True, spacing=True):
@@ -106,34 +115,142 @@ def value_to_string(value, indent_level: int = 0, indent: int = 4, wrap_lines=Tr
     :param no_leading_indent: No leading indentation
     :return: Resulting Unke string fragment
     """
+    return ''.join(_iter_value(value, indent_level, indent, wrap_lines, spacing, no_leading_indent))
+
+
+def _iter_value(value, indent_level: int, indent: int, wrap_lines: bool, spacing: bool,
+                no_leading_indent: bool) -> typing.Iterator[str]:
+    # The parts of the objects and lists are generated by one generator per object or list. Instead of
+    # delegating to each other, they yield the generators of nested values, which are kept on a stack.
+    # So values of any depth are serialized without recursion.
+    stack = [_value_parts(value, indent_level, indent, wrap_lines, spacing, no_leading_indent)]
+    while stack:
+        for part in stack[-1]:
+            if type(part) == str:
+                yield part
+            else:
+                stack.append(part)
+                break
+        else:
+            stack.pop()
+
+
+def _value_parts(value, indent_level: int, indent: int, wrap_lines: bool, spacing: bool,
+                 no_leading_indent: bool) -> typing.Iterator:
     if isinstance(value, objects.BaseObject):
-        return '{}{}'.format(
-            _whitespace(indent_level, indent) if not no_leading_indent else '',
-            object_to_string(value, indent_level, indent, wrap_lines, spacing, no_leading_indent=True)
-        )
+        return _object_parts(value, indent_level, indent, wrap_lines, spacing, no_leading_indent)
     elif type(value) == list:
-        text = '{}[{}'.format(
-            _whitespace(indent_level, indent) if not no_leading_indent else '',
-            '\n' if wrap_lines else ''
-        )
-        for i, el in enumerate(value):
-            text += value_to_string(el, indent_level + 1, indent, wrap_lines, spacing)
-            if i < len(value) - 1:
-                text += ','
-            text += '\n' if wrap_lines else ''
-        text += '{}]'.format(
-            _whitespace(indent_level, indent)
-        )
-        return text
-    elif type(value) == bool:
-        return ('{}true' if value else '{}false').format(
-            _whitespace(indent_level, indent) if not no_leading_indent else ''
-        )
+        return _list_parts(value, indent_level, indent, wrap_lines, spacing, no_leading_indent)
+    elif type(value) in numeric.array_types:
+        return _array_parts(value, indent_level, indent, wrap_lines, spacing, no_leading_indent)
+    return iter(('{}{}'.format(
+        _whitespace(indent_level, indent) if not no_leading_indent else '',
+        _primitive_to_string(value)
+    ),))
+
+
+def _object_parts(obj: objects.BaseObject, indent_level: int, indent: int, wrap_lines: bool, spacing: bool,
+                  no_leading_indent: bool) -> typing.Iterator:
+    children = obj.children
+    properties = obj.properties
+    whitespace = _whitespace(indent_level, indent)
+    opening = ' {' if spacing else '{'
+    separator = '\n' if wrap_lines else ';'
+    name_separator = ': ' if spacing else ':'
+    child_whitespace = _whitespace(indent_level + 1, indent)
+    if len(children) + len(properties) == 0:
+        yield '{}{}{}}}'.format(whitespace if not no_leading_indent else '', obj.name, opening)
+        return
+    yield '{}{}{}{}'.format(whitespace if not no_leading_indent else '', obj.name, opening, '\n' if wrap_lines else '')
+
+    # Children without children and object or list properties are serialized in one part,
+    # so only the objects nesting other values need a generator of their own
+    child_property_whitespace = _whitespace(indent_level + 2, indent)
+    for child in children:
+        text = None
+        if not child.children:
+            text = _primitive_properties(child.properties, child_property_whitespace, name_separator, separator)
+        if text is None:
+            yield _object_parts(child, indent_level + 1, indent, wrap_lines, spacing, False)
+            yield separator
+        elif text:
+            yield '{}{}{}{}{}{}}}{}'.format(child_whitespace, child.name, opening, '\n' if wrap_lines else '', text,
+                                           child_whitespace, separator)
+        else:
+            yield '{}{}{}}}{}'.format(child_whitespace, child.name, opening, separator)
+
+    text = _primitive_properties(properties, child_whitespace, name_separator, separator)
+    if text is not None:
+        yield text
     else:
-        return '{}{}'.format(
-            _whitespace(indent_level, indent) if not no_leading_indent else '',
-            repr(value)
-        )
+        # Runs of primitive values are joined, the lists and objects in between are generated part by part
+        batch = []
+        for property_name, property_value in properties.items():
+            if type(property_value) in _container_types or isinstance(property_value, objects.BaseObject):
+                batch.append('{}{}{}'.format(child_whitespace, property_name, name_separator))
+                yield ''.join(batch)
+                batch.clear()
+                yield _value_parts(property_value, indent_level + 1, indent, wrap_lines, spacing, True)
+                batch.append(separator)
+            else:
+                batch.append('{}{}{}{}{}'.format(
+                    child_whitespace, property_name, name_separator, _primitive_to_string(property_value), separator
+                ))
+        yield ''.join(batch)
+
+    yield whitespace + '}'
+
+
+def _primitive_properties(properties: dict, whitespace: str, name_separator: str, separator: str) -> str or None:
+    # Properties as one string, None if a value is a list or an object
+    parts = []
+    for property_name, property_value in properties.items():
+        if type(property_value) in _container_types or isinstance(property_value, objects.BaseObject):
+            return None
+        parts.append('{}{}{}{}{}'.format(
+            whitespace, property_name, name_separator, _primitive_to_string(property_value), separator
+        ))
+    return ''.join(parts)
+
+
+def _list_parts(value: list, indent_level: int, indent: int, wrap_lines: bool, spacing: bool,
+                no_leading_indent: bool) -> typing.Iterator:
+    whitespace = _whitespace(indent_level, indent)
+    yield '{}[{}'.format(whitespace if not no_leading_indent else '', '\n' if wrap_lines else '')
+    last = len(value) - 1
+    line_break = '\n' if wrap_lines else ''
+    item_whitespace = _whitespace(indent_level + 1, indent)
+    for i, element in enumerate(value):
+        if type(element) in _container_types or isinstance(element, objects.BaseObject):
+            yield _value_parts(element, indent_level + 1, indent, wrap_lines, spacing, False)
+        else:
+            yield item_whitespace + _primitive_to_string(element)
+        yield ',' + line_break if i < last else line_break
+    yield whitespace + ']'
+
+
+def _array_parts(value, indent_level: int, indent: int, wrap_lines: bool, spacing: bool,
+                 no_leading_indent: bool) -> typing.Iterator:
+    if not numeric.is_number_array(value):
+        # e.g. multi-dimensional NumPy arrays
+        return _list_parts(value.tolist(), indent_level, indent, wrap_lines, spacing, no_leading_indent)
+    # The numbers are formatted and joined in one pass instead of one part per element
+    whitespace = _whitespace(indent_level, indent)
+    line_break = '\n' if wrap_lines else ''
+    item_whitespace = _whitespace(indent_level + 1, indent)
+    items = (',' + line_break + item_whitespace).join(map(repr, value.tolist()))
+    return iter(('{}[{}{}{}]'.format(
+        whitespace if not no_leading_indent else '',
+        line_break,
+        item_whitespace + items + line_break if len(value) > 0 else '',
+        whitespace
+    ),))
+
+
+def _primitive_to_string(value) -> str:
+    if type(value) == bool:
+        return 'true' if value else 'false'
+    return repr(value)
 
 
 def _whitespace(indent_level, indent):
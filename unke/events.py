@@ -0,0 +1,248 @@
+# -*- coding: utf-8
+
+import asyncio
+import concurrent.futures
+import itertools
+import typing
+
+from . import lexer
+from . import grammar
+from . import parser
+from . import document
+from . import objects
+from . import exceptions
+
+
+# Number of events aiterparse() takes from the parser per executor call
+_async_batch_size = 1024
+
+
+class Event():
+    """
+    Events yielded by iter_events() and iterparse()
+    Every event is a tuple (event, key, value):
+    StartObject, EndObject: key is the property the object is assigned to (None for children and list items),
+                            value is the object name
+    StartList, EndList:     key is the property the list is assigned to (None for nested lists), value is None
+    Property:               key is the property name (None for list items), value is the primitive value
+    """
+    StartObject = 'start_object'
+    EndObject = 'end_object'
+    StartList = 'start_list'
+    EndList = 'end_list'
+    Property = 'property'
+
+
+class _Discard:
+    """
+    Container of the event parser that only counts the values added to it
+    """
+    __slots__ = ('size',)
+
+    def __init__(self):
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, value):
+        self.size += 1
+
+    def __setitem__(self, key: str, value):
+        pass
+
+
+class _EventObject(objects.BaseObject):
+    """
+    Open object of the event parser, remembers the property it is assigned to but none of its values
+    """
+    __slots__ = ('key',)
+
+    def __init__(self):
+        objects.BaseObject.__init__(self)
+        self.key = None
+        self._children = _discarded
+        self._properties = _discarded
+
+
+_discarded = _Discard()
+
+
+class _EventParser(parser.Parser):
+    """
+    Parser reporting the objects, lists and values as events instead of building a document
+    The token handlers of the parser validate the syntax, so the events are checked by exactly the same rules.
+    Objects and lists do not keep their values, so only the open ones are kept in memory.
+    """
+    __slots__ = ('_events',)
+
+    def __init__(self):
+        parser.Parser.__init__(self, _EventObject, intern_names=None)
+        self._events = []
+
+    def iter_events(self, tokens: typing.Iterable[tuple]) -> typing.Iterator[tuple]:
+        self._reset(document.Document())
+        events = self._events
+        handlers = self._handlers
+        br = grammar.Tag.Br
+        try:
+            # Same loop as Parser._feed(), the events of each token are yielded before the next one is read
+            for token in tokens:
+                self.current_pos = token[3] - self.current_line_pos
+                if self.eod and br != token[0]:
+                    raise exceptions.ParseException('End of document expected', self.current_line, self.current_pos)
+                handlers[token[0]](token)
+                if events:
+                    yield from events
+                    events.clear()
+            # Detect missing closing curly brace(s)
+            if len(self.hierarchy) > 0:
+                raise exceptions.ParseException('Expected token "}"', self.current_line, self.current_pos)
+        finally:
+            self.doc = None
+            self.hierarchy = None
+            events.clear()
+
+    def _block_start(self, token: tuple):
+        key = self.current_property_tag
+        parser.Parser._block_start(self, token)
+        obj = self.hierarchy[-1]
+        # The property tag is left if the object is the root or a list item
+        if key and self.current_property_tag is None:
+            obj.key = key
+        self._events.append((Event.StartObject, obj.key, obj.name))
+
+    def _block_end(self, token: tuple):
+        obj = self.hierarchy[-1] if len(self.hierarchy) > 0 else None
+        parser.Parser._block_end(self, token)
+        self._events.append((Event.EndObject, obj.key, obj.name))
+
+    def _list_start(self, token: tuple):
+        parser.Parser._list_start(self, token)
+        current_list = self.hierarchy[-1]
+        current_list.value = _Discard()
+        self._events.append((Event.StartList, current_list.property, None))
+
+    def _list_end(self, token: tuple):
+        current_list = self.hierarchy[-1] if len(self.hierarchy) > 0 else None
+        parser.Parser._list_end(self, token)
+        self._events.append((Event.EndList, current_list.property, None))
+
+    def _numeric_list(self, token: tuple):
+        # The items are reported one by one
+        self._numeric_list_tokens(token)
+
+    def _value(self, value):
+        key = self.current_property_tag
+        parser.Parser._value(self, value)
+        self._events.append((Event.Property, key, value))
+
+
+def iter_events(tokens: typing.Iterable[tuple]) -> typing.Iterator[tuple]:
+    """
+    Turn a stream of tokens into a stream of parse events without building any objects
+    The syntax is validated by the token handlers of parser.Parser, so the same documents are rejected
+    with the same errors. Only the open objects and lists are kept in memory, so memory use is bounded by
+    the nesting depth of the document.
+    :param tokens: Iterable of tokens, e.g. the result of lexer.lex() or lexer.iter_lex()
+    :return: Generator of (event, key, value) tuples
+    """
+    return _EventParser().iter_events(tokens)
+
+
+def iterparse(source: str or typing.IO or typing.Iterable[tuple],
+              chunk_size: int = 65536) -> typing.Iterator[tuple]:
+    """
+    Parse a Unke document incrementally and yield parse events instead of building a document
+    :param source: Filename, text or binary file object, or iterable of tokens
+    :param chunk_size: Number of characters or bytes to read at once from files
+    :return: Generator of (event, key, value) tuples, see Event
+    """
+    if isinstance(source, str):
+        with open(source, 'r') as file:
+            yield from iter_events(lexer.iter_lex(file, chunk_size))
+    elif hasattr(source, 'read'):
+        yield from iter_events(lexer.iter_lex(source, chunk_size))
+    else:
+        yield from iter_events(source)
+
+
+def _next_events(events: typing.Iterator[tuple], count: int) -> list:
+    return list(itertools.islice(events, count))
+
+
+async def aiterparse(source: str or typing.IO or typing.Iterable[tuple], chunk_size: int = 65536,
+                     executor: concurrent.futures.Executor = None) -> typing.AsyncIterator[tuple]:
+    """
+    Asynchronous version of iterparse()
+    The file is read and parsed in the executor in batches of events, so the event loop is not blocked.
+    :param source: Filename, text or binary file object, or iterable of tokens
+    :param chunk_size: Number of characters or bytes to read at once from files
+    :param executor: Thread pool executor to use, defaults to the default executor of the event loop
+    :return: Asynchronous generator of (event, key, value) tuples, see Event
+    """
+    loop = asyncio.get_running_loop()
+    events = iterparse(source, chunk_size)
+    while True:
+        batch = await loop.run_in_executor(executor, _next_events, events, _async_batch_size)
+        if len(batch) == 0:
+            break
+        for event in batch:
+            yield event
+
+
+def materialize(event: tuple, events: typing.Iterator[tuple],
+                object_type: objects.BaseObject = objects.BoostedObject,
+                object_created_hook: typing.Callable = None) -> objects.BaseObject or list:
+    """
+    Build the object or list started by an event from the following events of the same stream
+    The events are consumed up to and including the matching end event, so iterating the stream
+    afterwards continues behind the materialized subtree.
+    :param event: StartObject or StartList event
+    :param events: Iterator of the events following the start event
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :return: Resulting object or list
+    """
+    if Event.StartObject == event[0]:
+        result = object_type()
+        result.name = event[2]
+    elif Event.StartList == event[0]:
+        result = []
+    else:
+        raise ValueError('Expected a start_object or start_list event, got "{}"'.format(event[0]))
+
+    hierarchy = [result]
+    for kind, key, value in events:
+        parent = hierarchy[-1]
+        if Event.Property == kind:
+            if key is None:
+                parent.append(value)
+            else:
+                parent.properties[key] = value
+        elif Event.StartObject == kind:
+            current_node = object_type()
+            current_node.name = value
+            if type(parent) == list:
+                parent.append(current_node)
+            elif key is not None:
+                parent.properties[key] = current_node
+            else:
+                current_node.parent = parent
+                parent.children.append(current_node)
+            hierarchy.append(current_node)
+        elif Event.StartList == kind:
+            current_list = []
+            if key is None:
+                parent.append(current_list)
+            else:
+                parent.properties[key] = current_list
+            hierarchy.append(current_list)
+        else:
+            if Event.EndObject == kind and object_created_hook is not None:
+                object_created_hook(parent)
+            hierarchy.pop()
+            if len(hierarchy) == 0:
+                return result
+
+    raise ValueError('Event stream ended before the subtree was closed')
@@ -7,3 +7,10 @@ class ParseException(Exception):
     """
     def __init__(self, message, line, col):
         super(ParseException, self).__init__("{}, line {}:{}".format(message, line, col))
+        self.message = message
+        self.line = line
+        self.col = col
+
+    def __reduce__(self):
+        # Exceptions are pickled with their formatted message only, e.g. when raised in a worker process
+        return self.__class__, (self.message, self.line, self.col)
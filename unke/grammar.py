@@ -27,7 +27,9 @@ class Tag():
      CommentMultiLineStart,
      CommentMultiLineEnd,
      Br,
-     Whitespace) = range(17)
+     Whitespace,
+     # List of number characters lexed as a whole, only emitted by the lexer on request
+     NumericList) = range(18)
 
 
 patterns = (
@@ -50,6 +52,6 @@ patterns = (
     (Tag.CommentMultiLineStart,     (re.compile(r'/\*'),),                  tuple()),           # Comment start
     (Tag.CommentMultiLineEnd,       (re.compile(r'\*/'),),                  tuple()),           # Comment end
     (Tag.ObjectTag,                 (re.compile(r'[A-Za-z]+'),),            tuple()),           # Object tag
-    (Tag.Br,                        (re.compile(r'\n'),),                   tuple()),           # Line break (\n)
+    (Tag.Br,                        (re.compile(r'\r?\n'),),                tuple()),           # Line break (\n, \r\n)
     (Tag.Whitespace,                (re.compile('\s+'),),                   (Flag.Ignore,))     # Whitespace
 )
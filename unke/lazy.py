@@ -0,0 +1,466 @@
+# -*- coding: utf-8
+
+import collections.abc
+import re
+import typing
+
+from . import lexer
+from . import grammar
+from . import parser
+from . import document
+from . import objects
+from . import exceptions
+
+
+# Tag of the tokens standing in for the skipped blocks and lists in the outline of a document
+_Deferred = -1
+
+# Marker for parser state at the start of a span that is only known after scanning the previous span
+_pending = object()
+
+# Marker for parser state that is not changed by a span
+_unchanged = object()
+
+# Everything but braces, brackets and multi line comments. Strings and single line comments are
+# matched like the lexer does, so braces and brackets inside strings are not counted.
+_skip_regex = re.compile(r"""(?:[^'"/{}\[\]]+|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|//+|/(?!\*))*""")
+
+# Coarse tokens of a span, used to find the parser state a skipped block or list leaves behind
+_state_regex = re.compile(r"""
+    ('(?:[^'\\]|\\.)*?'|"(?:[^"\\]|\\.)*?")    # 1: Strings
+    |(/\*)                                      # 2: Comment start
+    |([{\[])                                    # 3: Block or list start
+    |([}\]])                                    # 4: Block or list end
+    |([A-Za-z_]+:?)                             # 5: Names and property tags
+    |([^\s'"/{}\[\]A-Za-z_]+)                   # 6: Numbers and punctuation
+    |\s+|/+                                     # Whitespace, single line comments
+""", re.VERBOSE)
+_digit_regex = re.compile(r'[0-9]')
+
+
+class _OutlineError(Exception):
+    """
+    Raised if the outline of a document cannot be determined, the eager parser then reports the error
+    """
+
+
+class _Span:
+    """
+    Source span of a block or list nested in the root object, and the parser state at its start
+    """
+    __slots__ = (
+        'start', 'end', 'previous', 'name', 'key', 'separator_allowed',
+        'scanned', 'trailing_node_tag', 'trailing_separator_allowed'
+    )
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+        # Previous span, it determines the pending parser state at the start of this span
+        self.previous = None
+        # Current object tag at the start of the span, i.e. the name of a block
+        self.name = None
+        # Property the block or list is assigned to
+        self.key = None
+        # Separator state at the start of the span
+        self.separator_allowed = True
+        # Parser state left behind by the span, see _scan_state()
+        self.scanned = False
+        self.trailing_node_tag = _unchanged
+        self.trailing_separator_allowed = _unchanged
+
+
+def _find_end(text: str, pos: int) -> int:
+    """
+    Find the end of the block or list starting at pos without lexing its content
+    :param text: Unke string
+    :param pos: Position of the opening brace or bracket
+    :return: Position behind the matching closing brace or bracket
+    """
+    skip = _skip_regex.match
+    search_comment_end = lexer._comment_end_regex.search
+    end = len(text)
+    depth = 0
+    while pos < end:
+        character = text[pos]
+        if character in '{[':
+            depth += 1
+            pos += 1
+        elif character in '}]':
+            depth -= 1
+            pos += 1
+            if depth == 0:
+                return pos
+        elif '/' == character:
+            match = search_comment_end(text, pos + 2)
+            if match is None:
+                raise _OutlineError()
+            pos = match.end()
+        else:
+            # Unterminated string
+            raise _OutlineError()
+        pos = skip(text, pos).end()
+    raise _OutlineError()
+
+
+def _scan_state(text: str, span: _Span):
+    """
+    Determine the object tag and separator state a span leaves behind
+    The parser keeps the last object tag after the last opening brace, e.g. a word of a single line
+    comment, and the separator state set by the last property.
+    :param text: Unke string
+    :param span: Span to scan
+    """
+    if span.scanned:
+        return
+    match_token = _state_regex.match
+    search_comment_end = lexer._comment_end_regex.search
+    pos = span.start
+    # Open braces and brackets
+    stack = []
+    while pos < span.end:
+        match = match_token(text, pos, span.end)
+        if match is None:
+            pos += 1
+            continue
+        group = match.lastindex
+        if 3 == group:
+            stack.append(match.group())
+            if '{' == match.group():
+                span.trailing_node_tag = None
+        elif 4 == group:
+            stack.pop()
+            if len(stack) > 0 and ']' == match.group() and '{' == stack[-1]:
+                span.trailing_separator_allowed = True
+        elif 5 == group:
+            name = match.group()
+            if ':' == name[-1]:
+                span.trailing_separator_allowed = False
+            else:
+                for value in ('true', 'false'):
+                    if name.startswith(value):
+                        name = name[len(value):]
+                        if '{' == stack[-1]:
+                            span.trailing_separator_allowed = True
+                        break
+                if name:
+                    span.trailing_node_tag = name
+        elif 6 == group or 1 == group:
+            if '{' == stack[-1] and (1 == group or _digit_regex.search(match.group())):
+                span.trailing_separator_allowed = True
+        elif 2 == group:
+            comment_end = search_comment_end(text, match.end(), span.end)
+            pos = comment_end.end() if comment_end else span.end
+            continue
+        pos = match.end()
+    if '[' == text[span.start]:
+        # The end of a list assigned to a property always allows a separator
+        span.trailing_separator_allowed = True
+    span.scanned = True
+
+
+def _node_tag_after(text: str, span: _Span) -> str or None:
+    """
+    :return: Current object tag of the parser after a span
+    """
+    while True:
+        _scan_state(text, span)
+        if span.trailing_node_tag is not _unchanged:
+            return span.trailing_node_tag
+        if span.name is not _pending:
+            return span.name
+        span = span.previous
+
+
+def _separator_allowed_after(text: str, span: _Span) -> bool:
+    """
+    :return: Separator state of the parser after a span
+    """
+    while True:
+        _scan_state(text, span)
+        if span.trailing_separator_allowed is not _unchanged:
+            return span.trailing_separator_allowed
+        if span.separator_allowed is not _pending:
+            return span.separator_allowed
+        span = span.previous
+
+
+def _lex_outline(text: str) -> typing.Iterator[tuple]:
+    """
+    Lex the root object of a Unke string, replacing every block or list nested in it by one deferred token
+    Line breaks inside the skipped spans are not counted, so the line numbers of the tokens are only
+    correct up to the first span. Errors are reported by the eager parser instead.
+    :param text: Unke string
+    :return: Generator of tokens
+    """
+    match_token = lexer._master_regex.match
+    search_comment_end = lexer._comment_end_regex.search
+    actions = lexer._master_actions
+    end = len(text)
+    pos = 0
+    root_open = False
+    while pos < end:
+        match = match_token(text, pos)
+        if match is None:
+            raise _OutlineError()
+        action, tag, flags = actions[match.lastindex]
+        if root_open and (grammar.Tag.BlockStart == tag or grammar.Tag.ListStart == tag):
+            span = _Span(pos, _find_end(text, pos))
+            yield (_Deferred, span, flags, pos)
+            pos = span.end
+            continue
+        if lexer._Br == action:
+            yield (tag, '\n', flags, match.end() - 1)
+        elif lexer._Emit == action:
+            if grammar.Tag.BlockStart == tag:
+                root_open = True
+            elif grammar.Tag.BlockEnd == tag:
+                root_open = False
+            yield (tag, match.group(), flags, pos)
+        elif lexer._CommentStart == action and match.end() < end:
+            match = search_comment_end(text, match.end())
+            if match is None:
+                raise _OutlineError()
+        pos = match.end()
+
+
+class LazyList(collections.abc.MutableSequence):
+    """
+    List of child objects that are parsed from their source span on first access
+    """
+    __slots__ = ('_items', '_loader')
+
+    def __init__(self, loader: '_Loader'):
+        self._items = []
+        self._loader = loader
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if type(item) == _Span:
+            item = self._items[index] = self._loader.load(item)
+        return item
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def insert(self, index, value):
+        self._items.insert(index, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, collections.abc.Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class LazyDict(collections.abc.MutableMapping):
+    """
+    Properties whose object and list values are parsed from their source span on first access
+    """
+    __slots__ = ('_data', '_loader')
+
+    def __init__(self, loader: '_Loader'):
+        self._data = {}
+        self._loader = loader
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if type(value) == _Span:
+            value = self._data[key] = self._loader.load(value)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class _FragmentParser(parser.Parser):
+    """
+    Parser for the source span of a single block or list nested in the root object
+    The object tag and separator state at the start of the span are only determined when needed.
+    """
+    __slots__ = ('root', 'text', 'span')
+
+    def __init__(self, object_type: objects.BaseObject, object_created_hook: typing.Callable):
+        parser.Parser.__init__(self, object_type, object_created_hook)
+        self.root = None
+        self.text = None
+        self.span = None
+
+    def _block_start(self, token: tuple):
+        if self.current_node_tag is _pending:
+            self.current_node_tag = _node_tag_after(self.text, self.span.previous)
+        parser.Parser._block_start(self, token)
+        # Children of the root get their real parent before any hook sees them
+        if len(self.hierarchy) == 2 and self.hierarchy[-1].parent is self.doc.root:
+            self.hierarchy[-1].parent = self.root
+
+    def _property_separator(self, token: tuple):
+        if self.separator_allowed is _pending:
+            self.separator_allowed = _separator_allowed_after(self.text, self.span.previous)
+        parser.Parser._property_separator(self, token)
+
+    def parse_fragment(self, text: str, span: _Span, current_line: int, current_line_pos: int):
+        # The fragment is parsed into a temporary owner, so its real owner is not touched
+        owner = objects.BaseObject()
+        doc = document.Document()
+        doc.root = owner
+        self._reset(doc)
+        self.text = text
+        self.span = span
+        self.hierarchy.append(owner)
+        self.current_line = current_line
+        self.current_line_pos = current_line_pos
+        self.current_node_tag = span.name
+        self.current_property_tag = span.key
+        self.separator_allowed = span.separator_allowed
+        try:
+            self._feed(lexer.lex(text, span.start, span.end, current_line, current_line_pos))
+            if len(self.hierarchy) > 1:
+                raise exceptions.ParseException('Expected token "}"', self.current_line, self.current_pos)
+        finally:
+            self.doc = None
+            self.hierarchy = None
+            self.text = None
+            self.span = None
+        return owner.properties[span.key] if span.key is not None else owner.children[0]
+
+
+class _Loader:
+    """
+    Parses the deferred blocks and lists of a lazily loaded root object
+    """
+    __slots__ = ('text', '_parser')
+
+    def __init__(self, text: str, object_type: objects.BaseObject, object_created_hook: typing.Callable):
+        self.text = text
+        self._parser = _FragmentParser(object_type, object_created_hook)
+
+    def load(self, span: _Span):
+        try:
+            # The line numbers only matter for errors, they are determined once an error occurs
+            return self._parser.parse_fragment(self.text, span, 1, 0)
+        except exceptions.ParseException:
+            line_breaks = [token[3] for token in lexer.lex(self.text, 0, span.start) if grammar.Tag.Br == token[0]]
+            current_line = len(line_breaks) + 1
+            current_line_pos = line_breaks[-1] if line_breaks else 0
+            return self._parser.parse_fragment(self.text, span, current_line, current_line_pos)
+
+
+class _OutlineParser(parser.Parser):
+    """
+    Parser for the outline of a document, which adds the deferred blocks and lists to the root object
+    The object tag and separator state left behind by a skipped span are pending until they are needed.
+    """
+    __slots__ = ('_loader', '_previous')
+
+    def __init__(self, loader: _Loader, object_type: objects.BaseObject, object_created_hook: typing.Callable):
+        parser.Parser.__init__(self, object_type, object_created_hook)
+        self._handlers[_Deferred] = self._deferred
+        self._loader = loader
+
+    def _reset(self, doc: document.Document):
+        parser.Parser._reset(self, doc)
+        # Last skipped span
+        self._previous = None
+
+    def _property_separator(self, token: tuple):
+        if self.separator_allowed is _pending:
+            self.separator_allowed = _separator_allowed_after(self._loader.text, self._previous)
+        parser.Parser._property_separator(self, token)
+
+    def _block_start(self, token: tuple):
+        parser.Parser._block_start(self, token)
+        root = self.doc.root
+        root.children = LazyList(self._loader)
+        root.properties = LazyDict(self._loader)
+        self._loader._parser.root = root
+
+    def _deferred(self, token: tuple):
+        span = token[1]
+        span.previous = self._previous
+        span.name = self.current_node_tag
+        span.separator_allowed = self.separator_allowed
+        root = self.hierarchy[-1]
+        if '{' == self._loader.text[span.start]:
+            # Same checks and state changes as a block start followed by its block end
+            if not self.current_property_tag:
+                if span.name is _pending:
+                    span.name = _node_tag_after(self._loader.text, span.previous)
+                if not span.name:
+                    raise exceptions.ParseException('Unexpected token "{"', self.current_line, self.current_pos)
+            if self.current_property_tag:
+                span.key = self.current_property_tag
+                self._shadow(span.key)
+                root.properties[span.key] = span
+                self.current_property_tag = None
+            else:
+                root.children.append(span)
+            self.separator_allowed = _pending
+        else:
+            # Same checks and state changes as a list start followed by its list end
+            if not self.current_property_tag:
+                raise exceptions.ParseException('Unexpected token "["', self.current_line, self.current_pos)
+            span.key = self.current_property_tag
+            self._shadow(span.key)
+            root.properties[span.key] = span
+            self.current_property_tag = None
+            self.separator_allowed = True
+        self.current_node_tag = _pending
+        self._previous = span
+        self.separator_expected = True
+
+    def _value(self, value):
+        if self.current_property_tag and len(self.hierarchy) > 0:
+            self._shadow(self.current_property_tag)
+        parser.Parser._value(self, value)
+
+    def _shadow(self, key: str):
+        # A span whose property is assigned again is never accessed, parse it now like the eager parser does
+        span = self.doc.root.properties._data.get(key)
+        if type(span) == _Span:
+            self._loader.load(span)
+
+
+def loads(text: str, object_type: objects.BaseObject = objects.BoostedObject,
+          object_created_hook: typing.Callable = None) -> document.Document:
+    """
+    Parse the outline of a Unke string and return a document whose root object is parsed lazily
+    Only the root object is parsed right away. The children and the object and list properties
+    of the root are parsed from their source span when they are accessed for the first time,
+    so syntax errors inside them are raised on first access as well. Spans of properties that are
+    assigned again are parsed right away, since they would never be accessed.
+    The object created hook is called for the root object first, and for the other objects when
+    they are parsed.
+    :param text: Text to parse
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :return: Unke document
+    """
+    loader = _Loader(text, object_type, object_created_hook)
+    try:
+        return _OutlineParser(loader, object_type, object_created_hook).parse(_lex_outline(text))
+    except (exceptions.ParseException, _OutlineError):
+        # The outline does not count lines inside the skipped spans, the eager parser reports the exact error
+        return parser.parse(text, object_type, object_created_hook)
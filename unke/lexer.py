@@ -1,13 +1,363 @@
 # -*- coding: utf-8
 
+import codecs
 import re
+import typing
+
 from . import grammar
 from . import exceptions
 
 
-def lex(text: str) -> list:
+# Actions of the master pattern groups
+(
+    _Emit,
+    _Ignore,
+    _Br,
+    _CommentStart
+) = range(4)
+
+
+def _compile_master_pattern(patterns) -> tuple:
+    """
+    Combine the grammar patterns into one regular expression with one named group per pattern
+    Python tries the alternatives from left to right and picks the first one that matches,
+    which is exactly the order in which the legacy lexer tries the grammar patterns.
+    :param patterns: Grammar patterns
+    :return: Tuple of master regex and the actions indexed by group number
+    """
+    alternatives = []
+    actions = [None]
+    for pattern_tag, pattern_regex_tuple, pattern_flags in patterns:
+        if grammar.Tag.CommentMultiLineStart == pattern_tag:
+            action = _CommentStart
+        elif grammar.Flag.Ignore in pattern_flags:
+            action = _Ignore
+        elif grammar.Tag.Br == pattern_tag:
+            action = _Br
+        else:
+            action = _Emit
+        for i, pattern_regex in enumerate(pattern_regex_tuple):
+            alternatives.append('(?P<t{}_{}>{})'.format(pattern_tag, i, pattern_regex.pattern))
+            actions.append((action, pattern_tag, pattern_flags))
+    return re.compile('|'.join(alternatives)), tuple(actions)
+
+
+_master_regex, _master_actions = _compile_master_pattern(grammar.patterns)
+_comment_end_regex = re.compile(r'\*/')
+
+# Same patterns for UTF-8 encoded input. All tokens but strings are ASCII, so the byte patterns
+# match the same tokens, except for non-ASCII whitespace that is only matched by the text patterns.
+_master_bytes_regex = re.compile(_master_regex.pattern.encode('utf-8'))
+_comment_end_bytes_regex = re.compile(rb'\*/')
+# Whitespace characters that only the text patterns match, UTF-8 encoded
+_text_whitespace_bytes_regex = re.compile(b'|'.join(re.escape(character.encode('utf-8')) for character in (
+    '\x1c\x1d\x1e\x1f\x85\xa0\u1680' + ''.join(map(chr, range(0x2000, 0x200b))) + '\u2028\u2029\u202f\u205f\u3000'
+)))
+
+# Number of characters that must follow a token before it is accepted at the end of a chunk.
+# A match that ends closer to the end of the buffer might still grow or lose against an earlier
+# pattern once more text is available, e.g. "1." is lexed as an integer until the next digit arrives.
+# For the same reason, tokens must not end inside a run of name characters at the end of a chunk,
+# because "true" or "Child" turn into a property tag as soon as a ":" follows the run.
+_chunk_lookahead = 2
+_name_characters = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_')
+
+# Lists consisting of number characters only are lexed as one token when numeric lists are requested,
+# the parser converts them as a whole. Only the ASCII whitespace that int() and float() ignore is allowed.
+_numeric_list_characters_regex = re.compile(r'[ \t\n\r\f\v0-9+\-.,]*')
+_numeric_list_characters_bytes_regex = re.compile(_numeric_list_characters_regex.pattern.encode('utf-8'))
+# Signs and dots that are not part of a number are illegal characters, such lists are lexed as usual.
+# Most lists have no sign or dot without a digit after it, which is faster to search for.
+_numeric_list_suspect_regex = re.compile(r'[-+.][^0-9]')
+_numeric_list_illegal_regex = re.compile(r'[-+](?![0-9]|\.[0-9])|\.(?![0-9])')
+_numeric_list_suspect_bytes_regex = re.compile(_numeric_list_suspect_regex.pattern.encode('utf-8'))
+_numeric_list_illegal_bytes_regex = re.compile(_numeric_list_illegal_regex.pattern.encode('utf-8'))
+_numeric_list_flags = (grammar.Flag.Value,)
+# Line breaks the lexer emits a Br token for, one per line break. Line breaks following other
+# whitespace are part of the whitespace token instead.
+_list_line_break_regex = re.compile(r'(?<!\s)(?:\r?\n)+')
+
+
+def _is_numeric_list(text: str or bytes, pos: int, end: int) -> bool:
+    '''
+    Check whether a list of number characters ending at end consists of legal tokens only
+    :param text: Input string or bytes-like object
+    :param pos: Position of the opening bracket
+    :param end: Position after the closing bracket
+    :return: True if the list can be lexed as a whole
+    '''
+    if isinstance(text, str):
+        return (_numeric_list_suspect_regex.search(text, pos, end) is None or
+                _numeric_list_illegal_regex.search(text, pos, end) is None)
+    return (_numeric_list_suspect_bytes_regex.search(text, pos, end) is None or
+            _numeric_list_illegal_bytes_regex.search(text, pos, end) is None)
+
+
+def list_line_breaks(token: tuple) -> list:
+    '''
+    Find the line breaks within a numeric list token, i.e. the positions of the Br tokens
+    the list would have been lexed with otherwise
+    :param token: Token of a numeric list
+    :return: List of positions
+    '''
+    line_breaks = []
+    if '\n' in token[1]:
+        for match in _list_line_break_regex.finditer(token[1]):
+            line_breaks.extend(token[3] + i for i in range(match.start(), match.end()) if '\n' == token[1][i])
+    return line_breaks
+
+
+def lex(text: str, pos: int = 0, end: int = None, current_line: int = 1, current_line_pos: int = 0,
+        numeric_lists: bool = False) -> list:
+    '''
+    Converts a Unke string into a list of tokens that can be read by the Unke parser
+    A part of the string can be lexed by passing its boundaries and the line state at its start.
+    The token positions are relative to the start of the whole string.
+    With numeric lists, lists consisting of number characters only, e.g. "[1, 2, 3]", are returned as
+    a single NumericList token, its value is the whole list text.
+    :param text: Input string
+    :param pos: Position to start lexing at
+    :param end: Position to stop lexing at
+    :param current_line: Line number at pos
+    :param current_line_pos: Position of the last line break before pos
+    :param numeric_lists: Lex lists of numbers as a whole
+    :return: Resulting list of tokens
+    '''
+    tokens = []
+    append = tokens.append
+    match_token = _master_regex.match
+    match_list_characters = _numeric_list_characters_regex.match
+    search_comment_end = _comment_end_regex.search
+    actions = _master_actions
+    if end is None:
+        end = len(text)
+    while pos < end:
+        match = match_token(text, pos, end)
+        if match is None:
+            raise exceptions.ParseException(
+                'Illegal character "{}"'.format(text[pos]),
+                current_line,
+                pos - current_line_pos
+            )
+        action, tag, flags = actions[match.lastindex]
+        if numeric_lists and grammar.Tag.ListStart == tag:
+            list_end = match_list_characters(text, pos + 1, end).end()
+            if list_end < end and ']' == text[list_end] and _is_numeric_list(text, pos, list_end + 1):
+                token = (grammar.Tag.NumericList, text[pos:list_end + 1], _numeric_list_flags, pos)
+                append(token)
+                line_breaks = list_line_breaks(token)
+                if line_breaks:
+                    current_line += len(line_breaks)
+                    current_line_pos = line_breaks[-1]
+                pos = list_end + 1
+                continue
+        if _Emit == action:
+            append((tag, match.group(), flags, pos))
+        elif _Br == action:
+            # The token of a "\r\n" line break is positioned at its "\n", like the one of a "\n"
+            append((tag, '\n', flags, match.end() - 1))
+            current_line += 1
+            current_line_pos = match.end() - 1
+        elif _CommentStart == action and match.end() < end:
+            match = search_comment_end(text, match.end(), end)
+            if match is None:
+                raise exceptions.ParseException('End of comment expected', current_line, 0)
+        pos = match.end()
+    return tokens
+
+
+def _may_grow(buffer: str, pos: int) -> bool:
+    '''
+    Check whether a token starting at pos might still match once more text is read
+    Strings and names starting with "_" only match once their end was read, all other tokens
+    are decided by the characters within the lookahead.
+    :param buffer: Text read so far
+    :param pos: Position no token matched at
+    :return: False if no token can match at pos
+    '''
+    first = buffer[pos]
+    if '"' == first or "'" == first:
+        # The closing quote was not read yet, otherwise the string would have matched
+        return True
+    if '_' == first:
+        end = pos
+        while end < len(buffer) and buffer[end] in _name_characters:
+            end += 1
+        if end == len(buffer):
+            return True
+    return len(buffer) - pos <= _chunk_lookahead
+
+
+def iter_lex(stream: typing.IO, chunk_size: int = 65536, numeric_lists: bool = False) -> typing.Iterator[tuple]:
+    '''
+    Reads a Unke document from a text or binary file object in chunks and yields its tokens one by one
+    Binary streams are decoded as UTF-8. The tokens and positions are the same as the ones returned by lex().
+    A numeric list spanning several chunks is kept in the buffer until its end was read.
+    :param stream: File object to read from
+    :param chunk_size: Number of characters or bytes to read at once
+    :param numeric_lists: Lex homogeneous int and float lists as a whole, see lex()
+    :return: Generator of tokens
+    '''
+    match_token = _master_regex.match
+    match_list_characters = _numeric_list_characters_regex.match
+    search_comment_end = _comment_end_regex.search
+    actions = _master_actions
+    decoder = None
+    buffer = ''
+    # Position of buffer[0] in the document
+    offset = 0
+    pos = 0
+    # Tokens ending after this position in the buffer are only accepted at the end of the stream
+    safe_end = 0
+    eof = False
+    comment = False
+    # End of the characters of a possible numeric list at pos that were read so far
+    list_scan = 0
+    current_line = 1
+    current_line_pos = 0
+    while True:
+        match = None
+        if pos < len(buffer):
+            if comment:
+                match = search_comment_end(buffer, pos)
+                if match:
+                    comment = False
+                    pos = match.end()
+                    continue
+                elif eof:
+                    raise exceptions.ParseException('End of comment expected', current_line, 0)
+                # Keep the last character, it might be the "*" of the comment end
+                pos = len(buffer) - 1
+            else:
+                if numeric_lists and '[' == buffer[pos]:
+                    # A numeric list is only lexed once its end is in the buffer
+                    list_scan = match_list_characters(buffer, max(pos + 1, list_scan)).end()
+                    if list_scan < len(buffer) or eof:
+                        list_end = list_scan
+                        list_scan = 0
+                        if (list_end < len(buffer) and ']' == buffer[list_end] and
+                                _is_numeric_list(buffer, pos, list_end + 1)):
+                            token = (
+                                grammar.Tag.NumericList, buffer[pos:list_end + 1], _numeric_list_flags, offset + pos
+                            )
+                            yield token
+                            line_breaks = list_line_breaks(token)
+                            if line_breaks:
+                                current_line += len(line_breaks)
+                                current_line_pos = line_breaks[-1]
+                            pos = list_end + 1
+                            continue
+                # While waiting for the end of a numeric list, the next chunk is read right away
+                match = None if list_scan else match_token(buffer, pos)
+                # Without a match, only a token that is still incomplete is worth reading more text for
+                if eof or (match and match.end() <= safe_end) or (
+                        match is None and not list_scan and not _may_grow(buffer, pos)):
+                    if match is None:
+                        raise exceptions.ParseException(
+                            'Illegal character "{}"'.format(buffer[pos]),
+                            current_line,
+                            offset + pos - current_line_pos
+                        )
+                    action, tag, flags = actions[match.lastindex]
+                    if _Emit == action:
+                        yield (tag, match.group(), flags, offset + pos)
+                    elif _Br == action:
+                        yield (tag, '\n', flags, offset + match.end() - 1)
+                        current_line += 1
+                        current_line_pos = offset + match.end() - 1
+                    elif _CommentStart == action:
+                        comment = True
+                    pos = match.end()
+                    continue
+        elif eof:
+            break
+
+        # Read the next chunk and drop the part of the buffer that was already consumed.
+        # While waiting for the end of a long token, e.g. a numeric list or a string, the buffer is doubled
+        # to keep reading linear.
+        chunk = stream.read(max(chunk_size, len(buffer) - pos))
+        eof = not chunk
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = decoder.decode(chunk, final=eof)
+        offset += pos
+        buffer = buffer[pos:] + chunk
+        if list_scan:
+            list_scan -= pos
+        pos = 0
+        safe_end = len(buffer)
+        while safe_end > 0 and buffer[safe_end - 1] in _name_characters:
+            safe_end -= 1
+        safe_end = min(safe_end, len(buffer) - _chunk_lookahead)
+
+
+def iter_lex_bytes(data: bytes or memoryview, pos: int = 0, end: int = None,
+                   numeric_lists: bool = False) -> typing.Iterator[tuple]:
+    '''
+    Lexes a UTF-8 encoded Unke document, e.g. a memory-mapped file, and yields its tokens one by one
+    The input is not decoded as a whole, only the values of the emitted tokens are decoded.
+    The token positions are byte offsets, so they differ from the ones returned by lex() for non-ASCII text.
+    :param data: Bytes-like object, e.g. bytes, memoryview or mmap
+    :param pos: Position to start lexing at
+    :param end: Position to stop lexing at
+    :param numeric_lists: Lex homogeneous int and float lists as a whole, see lex()
+    :return: Generator of tokens
+    '''
+    match_token = _master_bytes_regex.match
+    match_list_characters = _numeric_list_characters_bytes_regex.match
+    search_comment_end = _comment_end_bytes_regex.search
+    actions = _master_actions
+    if end is None:
+        end = len(data)
+    current_line = 1
+    current_line_pos = 0
+    while pos < end:
+        match = match_token(data, pos, end)
+        if match is None:
+            raise exceptions.ParseException(
+                'Illegal character "{}"'.format(chr(data[pos])),
+                current_line,
+                pos - current_line_pos
+            )
+        action, tag, flags = actions[match.lastindex]
+        if numeric_lists and grammar.Tag.ListStart == tag:
+            list_end = match_list_characters(data, pos + 1, end).end()
+            if (list_end < end and b']' == data[list_end:list_end + 1] and
+                    _is_numeric_list(data, pos, list_end + 1)):
+                token = (grammar.Tag.NumericList, str(data[pos:list_end + 1], 'ascii'), _numeric_list_flags, pos)
+                yield token
+                line_breaks = list_line_breaks(token)
+                if line_breaks:
+                    current_line += len(line_breaks)
+                    current_line_pos = line_breaks[-1]
+                pos = list_end + 1
+                continue
+        if _Emit == action:
+            yield (tag, match.group().decode('utf-8'), flags, pos)
+        elif _Br == action:
+            yield (tag, '\n', flags, match.end() - 1)
+            current_line += 1
+            current_line_pos = match.end() - 1
+        elif _CommentStart == action and match.end() < end:
+            match = search_comment_end(data, match.end(), end)
+            if match is None:
+                raise exceptions.ParseException('End of comment expected', current_line, 0)
+        pos = match.end()
+
+
+# Grammar patterns as they were when lex_legacy() was written, only line feeds are line breaks
+_legacy_patterns = tuple(
+    (grammar.Tag.Br, (re.compile(r'\n'),), pattern[2]) if grammar.Tag.Br == pattern[0] else pattern
+    for pattern in grammar.patterns
+)
+
+
+def lex_legacy(text: str) -> list:
     '''
     Converts a Unke string into a list of tokens that can be read by the Unke parser
+    This is the original lexer trying every grammar pattern in order at each position, kept unchanged
+    for comparison. For text with line feeds only, it produces the same tokens as lex().
     :param text: Input string
     :return: Resulting list of tokens
     '''
@@ -26,7 +376,7 @@ def lex(text: str) -> list:
             else:
                 raise exceptions.ParseException('End of comment expected', current_line, 0)
         else:
-            for pattern in grammar.patterns:
+            for pattern in _legacy_patterns:
                 pattern_tag = pattern[0]
                 pattern_regex_tuple = pattern[1]
                 pattern_flags = pattern[2]
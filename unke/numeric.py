@@ -0,0 +1,73 @@
+# -*- coding: utf-8
+
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Types of numeric lists the parser can return instead of regular lists
+list_types = ('array', 'numpy')
+
+# Types of numeric lists the serializer writes in one pass
+array_types = (array.array,) if numpy is None else (array.array, numpy.ndarray)
+
+# Type codes of the array.array types holding numbers
+_number_typecodes = frozenset('bBhHiIlLqQfd')
+
+
+def check_list_type(list_type: str or None) -> str or None:
+    """
+    Validate the type of numeric lists requested from the parser
+    :param list_type: None, 'array' or 'numpy'
+    :return: The list type
+    """
+    if list_type is not None and list_type not in list_types:
+        raise ValueError('Unknown numeric list type "{}"'.format(list_type))
+    if list_type == 'numpy' and numpy is None:
+        raise ImportError('Numeric lists of type "numpy" require NumPy')
+    return list_type
+
+
+def list_from_string(text: str, list_type: str or None):
+    """
+    Convert the text of a list of numbers as lexed by the lexer, e.g. "[1, 2, 3]", in one pass
+    Ints that do not fit into 64 bits are returned in a regular list.
+    :param text: List including the brackets
+    :param list_type: None for a regular list, 'array' for an array.array, 'numpy' for a NumPy array
+    :return: list, array.array or numpy.ndarray, None if the list does not consist of ints only or floats only
+    """
+    # int() and float() ignore the whitespace around the numbers
+    items = text[1:-1].split(',')
+    if '.' in text:
+        # float() also accepts ints, every float of the grammar has exactly one dot
+        if text.count('.') != len(items):
+            return None
+        convert, typecode = float, 'd'
+    else:
+        convert, typecode = int, 'q'
+    try:
+        if list_type is None:
+            return list(map(convert, items))
+        try:
+            value = array.array(typecode, map(convert, items))
+        except OverflowError:
+            return list(map(convert, items))
+    except ValueError:
+        return None
+    if 'numpy' == list_type:
+        return numpy.frombuffer(value, numpy.int64 if 'q' == typecode else numpy.float64)
+    return value
+
+
+def is_number_array(value) -> bool:
+    """
+    Check whether an array.array or NumPy array is a flat array of numbers
+    :param value: array.array or numpy.ndarray
+    :return: True for one-dimensional int or float arrays
+    """
+    if type(value) == array.array:
+        return value.typecode in _number_typecodes
+    return value.ndim == 1 and value.dtype.kind in 'iuf'
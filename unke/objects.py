@@ -1,17 +1,71 @@
 # -*- coding: utf-8
 
+import collections
+import itertools
+import typing
+
+
+class Order:
+    """
+    Traversal orders of BaseObject.walk() and BaseObject.iter_descendants()
+    """
+    DepthFirst = 'depth_first'
+    BreadthFirst = 'breadth_first'
+
 
 class BaseObject:
     """
     Base Unke object type
     Represents a node in a document.
+    The children list and properties dict are only allocated once they are accessed,
+    so objects without children or properties do not carry empty containers.
     """
 
+    __slots__ = ('parent', '_name', '_children', '_properties', '_position', '_child_names')
+
     def __init__(self, parent=None):
         self.parent = parent
-        self.children = []
-        self.name = ''
-        self.properties = {}
+        self._name = ''
+        self._children = None
+        self._properties = None
+        # Index in the children of the parent when last looked up, checked before it is used
+        self._position = 0
+        # Children by name as (children, number of children, dict), built on the first lookup by name
+        self._child_names = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        # The children of the parent are grouped by name again on the next lookup
+        parent = self.parent
+        if parent is not None:
+            parent._child_names = None
+
+    @property
+    def children(self):
+        children = self._children
+        if children is None:
+            children = self._children = []
+        return children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+    @property
+    def properties(self):
+        properties = self._properties
+        if properties is None:
+            properties = self._properties = {}
+        return properties
+
+    @properties.setter
+    def properties(self, properties):
+        self._properties = properties
 
     @property
     def props(self):
@@ -23,10 +77,134 @@ class BaseObject:
 
     @property
     def siblings(self):
-        if self.parent:
+        try:
+            index = self.index_in_parent
+        except ValueError:
             return list(filter(lambda sibling: sibling is not self, self.parent.children))
-        else:
+        if index is None:
             return []
+        children = self.parent.children
+        return children[:index] + children[index + 1:]
+
+    @property
+    def index_in_parent(self) -> int or None:
+        """
+        Index of the object in the children of its parent, None for objects without parent
+        The index is remembered, so it is only searched for again after the children were changed.
+        """
+        parent = self.parent
+        if parent is None:
+            return None
+        children = parent.children
+        position = self._position
+        if position < len(children) and children[position] is self:
+            return position
+        # Remember the indexes of all siblings at once, so each of them is found in constant time afterwards
+        for position, child in enumerate(children):
+            child._position = position
+        position = self._position
+        if position >= len(children) or children[position] is not self:
+            raise ValueError('Object is not a child of its parent')
+        return position
+
+    @property
+    def next_sibling(self):
+        index = self.index_in_parent
+        if index is None or index + 1 >= len(self.parent.children):
+            return None
+        return self.parent.children[index + 1]
+
+    @property
+    def previous_sibling(self):
+        index = self.index_in_parent
+        if index is None or index == 0:
+            return None
+        return self.parent.children[index - 1]
+
+    def find_children(self, name: str or None) -> list:
+        """
+        Find the children with the given name
+        The children are grouped by name on the first lookup. The groups are built again once a child was renamed,
+        added or removed through the document or the number of children changed. Other changes to the children
+        list, e.g. replacing a child in place, require invalidate_child_names().
+        :param name: Object name
+        :return: List of children in order
+        """
+        return list(self._child_groups().get(name, ()))
+
+    def find_child(self, name: str or None):
+        """
+        Find the first child with the given name, see find_children()
+        :param name: Object name
+        :return: Child, None if there is no child with the name
+        """
+        group = self._child_groups().get(name)
+        return group[0] if group else None
+
+    def _child_groups(self) -> dict:
+        children = self._children
+        if not children:
+            return {}
+        cache = self._child_names
+        if cache is None or cache[0] is not children or cache[1] != len(children):
+            child_names = {}
+            for child in children:
+                group = child_names.get(child.name)
+                if group is None:
+                    child_names[child.name] = [child]
+                else:
+                    group.append(child)
+            cache = self._child_names = (children, len(children), child_names)
+        return cache[2]
+
+    def invalidate_child_names(self):
+        """
+        Group the children by name again on the next lookup
+        """
+        self._child_names = None
+
+    def walk(self, order: str = Order.DepthFirst, include_values: bool = False,
+             prune: typing.Callable = None) -> typing.Iterator['BaseObject']:
+        """
+        Iterate the object and all objects nested in it without recursion, see iter_descendants()
+        :param order: Order.DepthFirst or Order.BreadthFirst
+        :param include_values: Also visit objects that are property values or list items
+        :param prune: Function called for every object, the objects nested in an object are skipped if it returns true
+        :return: Generator of objects
+        """
+        yield self
+        if prune is None or not prune(self):
+            yield from self.iter_descendants(order, include_values, prune)
+
+    def iter_descendants(self, order: str = Order.DepthFirst, include_values: bool = False,
+                         prune: typing.Callable = None) -> typing.Iterator['BaseObject']:
+        """
+        Iterate all objects nested in the object without recursion
+        The children of an object are visited before the objects in its properties.
+        :param order: Order.DepthFirst or Order.BreadthFirst
+        :param include_values: Also visit objects that are property values or list items
+        :param prune: Function called for every object, the objects nested in an object are skipped if it returns true
+        :return: Generator of objects
+        """
+        if Order.DepthFirst == order:
+            stack = [_nested_objects(self, include_values)]
+            while stack:
+                for obj in stack[-1]:
+                    yield obj
+                    if prune is None or not prune(obj):
+                        stack.append(_nested_objects(obj, include_values))
+                    break
+                else:
+                    stack.pop()
+        elif Order.BreadthFirst == order:
+            queue = collections.deque((self,))
+            while queue:
+                for obj in _nested_objects(queue.popleft(), include_values):
+                    yield obj
+                    if prune is None or not prune(obj):
+                        queue.append(obj)
+        else:
+            raise ValueError('Unknown traversal order "{}"'.format(order))
 
     def __repr__(self):
         return 'Object({}, {})'.format(self.name, id(self))
@@ -38,8 +216,32 @@ class BoostedObject(BaseObject):
     Represents a node in a document
     """
 
-    # Making use of __slots__ to improve object creation performance
-    __slots__ = ('parent', 'children', 'name', 'properties')
+    # No instance dict, all attributes are stored in the slots of BaseObject
+    __slots__ = ()
 
     def __init__(self):
         BaseObject.__init__(self)
+
+
+def _nested_objects(obj: BaseObject, include_values: bool) -> typing.Iterator[BaseObject]:
+    # Children and, optionally, objects in the properties, containers that were never accessed are skipped
+    children = obj._children or ()
+    properties = obj._properties if include_values else None
+    if not properties:
+        return iter(children)
+    return itertools.chain(children, _objects_in(properties.values()))
+
+
+def _objects_in(values: typing.Iterable) -> typing.Iterator[BaseObject]:
+    # Objects among the values and in lists of any depth
+    stack = [iter(values)]
+    while stack:
+        for value in stack[-1]:
+            if isinstance(value, BaseObject):
+                yield value
+                break
+            if type(value) == list:
+                stack.append(iter(value))
+                break
+        else:
+            stack.pop()
@@ -0,0 +1,226 @@
+# -*- coding: utf-8
+
+import concurrent.futures
+import os
+import threading
+import typing
+
+from . import lazy
+from . import parser
+from . import document
+from . import objects
+from . import exceptions
+
+
+# Number of segments per worker. Smaller segments balance the load better, but cost more round trips.
+_segments_per_worker = 4
+
+# Number of chunks per worker load_many() splits the files into
+_chunks_per_worker = 4
+
+# Parser of the current thread or worker process, used by load_many()
+_local = threading.local()
+
+# Spans and loader of a worker process, set up once per worker by _init_worker()
+_worker_spans = None
+_worker_loader = None
+_worker_created_objects = None
+
+
+def _span_states(spans: list) -> list:
+    """
+    Convert the spans into tuples that can be sent to the worker processes
+    :param spans: Spans in document order
+    :return: List of tuples: start, end, key, name, separator state and index of the previous span
+    """
+    indexes = {span: i for i, span in enumerate(spans)}
+    states = []
+    for span in spans:
+        states.append((
+            span.start,
+            span.end,
+            span.key,
+            None if span.name is lazy._pending else span.name,
+            span.name is lazy._pending,
+            None if span.separator_allowed is lazy._pending else span.separator_allowed,
+            span.separator_allowed is lazy._pending,
+            indexes[span.previous] if span.previous is not None else -1
+        ))
+    return states
+
+
+def _init_worker(text: str, span_states: list, object_type: objects.BaseObject):
+    global _worker_spans, _worker_loader, _worker_created_objects
+    spans = []
+    for start, end, key, name, name_pending, separator_allowed, separator_pending, previous in span_states:
+        span = lazy._Span(start, end)
+        span.key = key
+        span.name = lazy._pending if name_pending else name
+        span.separator_allowed = lazy._pending if separator_pending else separator_allowed
+        span.previous = spans[previous] if previous >= 0 else None
+        spans.append(span)
+    _worker_spans = spans
+    # The hook is called in the main process, the worker only records the order the objects were created in
+    _worker_created_objects = []
+    _worker_loader = lazy._Loader(text, object_type, _worker_created_objects.append)
+
+
+def _parse_segment(first: int, last: int) -> list:
+    """
+    Parse the spans of a segment in a worker process
+    :return: List of tuples: parsed object or list and the objects created for it in order
+    """
+    results = []
+    for span in _worker_spans[first:last]:
+        value = _worker_loader.load(span)
+        results.append((value, list(_worker_created_objects)))
+        _worker_created_objects.clear()
+    return results
+
+
+def _segments(spans: list, count: int) -> list:
+    """
+    Split the spans into about count segments of similar size
+    :return: List of (first, last) index pairs
+    """
+    segment_size = sum(span.end - span.start for span in spans) / count
+    segments = []
+    first = 0
+    size = 0
+    for i, span in enumerate(spans):
+        size += span.end - span.start
+        if size >= segment_size:
+            segments.append((first, i + 1))
+            first = i + 1
+            size = 0
+    if first < len(spans):
+        segments.append((first, len(spans)))
+    return segments
+
+
+def loads(text: str, workers: int, object_type: objects.BaseObject = objects.BoostedObject,
+          object_created_hook: typing.Callable = None) -> document.Document:
+    """
+    Parse a Unke string and return resulting document object, using worker processes
+    The outline of the root object is parsed first, like for lazy loading. Its children and object
+    or list properties are then parsed in a process pool and put back in their original order.
+    The object type must be picklable. The object created hook is called in this process, in the
+    same order as by the regular parser.
+    :param text: Text to parse
+    :param workers: Number of worker processes
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :return: Unke document
+    """
+    outline_parser = lazy._OutlineParser(lazy._Loader(text, object_type, None), object_type, None)
+    try:
+        doc = outline_parser.parse(lazy._lex_outline(text))
+    except (exceptions.ParseException, lazy._OutlineError):
+        # Report the exact error
+        return parser.parse(text, object_type, object_created_hook)
+
+    root = doc.root
+    children = root.children._items
+    properties = root.properties._data
+    values = {}
+    # Objects created for the spans in order, the hook is only called for them once all segments were parsed
+    created = []
+    # All spans are parsed, even the ones whose property was assigned again, like the regular parser does
+    span = outline_parser._previous
+    if span is not None:
+        spans = []
+        while span is not None:
+            spans.append(span)
+            span = span.previous
+        spans.reverse()
+
+        segments = _segments(spans, workers * _segments_per_worker)
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(text, _span_states(spans), object_type)
+        ) as executor:
+            futures = [executor.submit(_parse_segment, first, last) for first, last in segments]
+            try:
+                for (first, last), future in zip(segments, futures):
+                    for span, (value, created_objects) in zip(spans[first:last], future.result()):
+                        values[span] = value
+                        if span.key is None:
+                            value.parent = root
+                        created.extend(created_objects)
+            except exceptions.ParseException:
+                executor.shutdown(cancel_futures=True)
+                # The regular parser lexes the whole text first, so it might report an error further down.
+                # If it succeeds after all, it calls the hook for every object, none was called so far.
+                return parser.parse(text, object_type, object_created_hook)
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+    root.children = [values[span] for span in children]
+    root.properties = {key: values[value] if type(value) == lazy._Span else value
+                       for key, value in properties.items()}
+    if object_created_hook is not None:
+        for created_object in created:
+            object_created_hook(created_object)
+        object_created_hook(root)
+    return doc
+
+
+def _load_files(filenames: list, object_type: objects.BaseObject, object_created_hook: typing.Callable) -> list:
+    """
+    Load the files of a chunk, the parser of the thread or process is reused as long as the settings are the same
+    :return: List of tuples: filename, document or None and ParseException, OSError or UnicodeDecodeError or None
+    """
+    file_parser = getattr(_local, 'parser', None)
+    if file_parser is None or file_parser.object_type is not object_type \
+            or file_parser.object_created_hook is not object_created_hook:
+        file_parser = _local.parser = parser.Parser(object_type, object_created_hook)
+    results = []
+    for filename in filenames:
+        # A file that cannot be read is reported like a parse error, so the other files are still loaded
+        try:
+            with open(filename, 'r') as file:
+                text = file.read()
+            results.append((filename, file_parser.parse(text), None))
+        except (exceptions.ParseException, OSError, UnicodeDecodeError) as e:
+            results.append((filename, None, e))
+    return results
+
+
+def load_many(filenames: typing.Iterable[str], workers: int = None, executor: str = 'process',
+              ordered: bool = True, object_type: objects.BaseObject = objects.BoostedObject,
+              object_created_hook: typing.Callable = None) -> typing.Iterator[tuple]:
+    """
+    Load many Unke files using a pool of worker processes or threads
+    The files are loaded in chunks, each worker reuses its parser for all files of a chunk.
+    Parse errors, and files that cannot be read or decoded, do not stop the other files from being loaded,
+    their errors are returned instead.
+    With worker processes, the object type and the object created hook must be picklable and
+    the hook is called in the worker processes.
+    :param filenames: Filenames to load
+    :param workers: Number of workers, defaults to the number of CPUs
+    :param executor: "process" or "thread"
+    :param ordered: Return the results in the order of the filenames instead of the order they are ready in
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :return: Generator of tuples: filename, document or None and the exception or None
+    """
+    if 'process' == executor:
+        executor_type = concurrent.futures.ProcessPoolExecutor
+    elif 'thread' == executor:
+        executor_type = concurrent.futures.ThreadPoolExecutor
+    else:
+        raise ValueError('Unknown executor "{}"'.format(executor))
+    object_created_hook = object_created_hook if isinstance(object_created_hook, typing.Callable) else None
+    filenames = list(filenames)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, -(-len(filenames) // (workers * _chunks_per_worker)))
+    chunks = [filenames[i:i + chunk_size] for i in range(0, len(filenames), chunk_size)]
+
+    with executor_type(workers) as pool:
+        futures = [pool.submit(_load_files, chunk, object_type, object_created_hook) for chunk in chunks]
+        try:
+            for future in futures if ordered else concurrent.futures.as_completed(futures):
+                yield from future.result()
+        finally:
+            # The caller might stop early
+            pool.shutdown(cancel_futures=True)
@@ -1,234 +1,523 @@
 # -*- coding: utf-8
 
+import collections
+import sys
+import time
 import typing
 
 from . import lexer
 from . import grammar
 from . import document
 from . import objects
+from . import numeric
 from . import exceptions
+from . import tracing
 
 
-def parse(text: str, object_type: objects.BaseObject=objects.BoostedObject,
-          object_created_hook: typing.Callable = None, doc: document.Document=None):
+class _List:
     """
-    Parse a Unke string and return resulting document object
-    :param text: Text to parse
-    :param object_type: Class to be used to instantiate objects
-    :param doc: Document to use
-    :param object_created_hook: Function to be called after an object was created
-    :return: Unke document
+    Helper class for lists, only used internally to control lists in Parser.hierarchy
+    """
+    __slots__ = ('parent', 'property', 'value', 'separator_expected')
+
+    def __init__(self, parent, property: str or None, value: list):
+        # The parent of the list can either be a Object or List
+        self.parent = parent
+        # The property this list is attached to.
+        # A list must either be attached to a property or a child of List
+        self.property = property
+        # The actual list
+        self.value = value
+        # Set to true if a separator (comma) is expected
+        self.separator_expected = False
+
+
+class _SymbolTable(dict):
+    """
+    Table of the object and property names of a document, looking up a name returns its first occurrence
     """
+    __slots__ = ()
 
-    # Lex: retrieve tokens
-    tokens = lexer.lex(text)
+    def __missing__(self, name: str) -> str:
+        self[name] = name
+        return name
 
-    # Create a document if none is specified
-    doc = doc or document.Document()
 
-    # Helper class to store the current context used when parsing the token stream
-    class Context:
+class _Shape:
+    """
+    Base class of the classes whose instance dicts are used as properties of objects with the same name
+    CPython stores the keys of the instance dicts of a class once for all instances. The dicts are regular
+    dicts otherwise, they just stop sharing their keys when their keys diverge too much.
+    """
+    pass
+
+
+class Parser:
+    """
+    Reusable Unke parser
+    The token handlers are looked up in a table built once per parser, so a parser
+    can be created once and used to parse any number of documents.
+    A parser instance must not be used by multiple threads at the same time.
+    """
+
+    __slots__ = (
+        'object_type',
+        'object_created_hook',
+        'numeric_lists',
+        'intern_names',
+        'shared_keys',
+        'build_index',
+        '_handlers',
+        # Function returning the interned version of a name
+        '_intern',
+        # Classes creating the properties of objects by object name in the current document, see _Shape
+        '_shapes',
+        # Document being built
+        'doc',
         # The object hierarchy e.g.: [Object('Root'), Object('Child Lvl1'), List('Child Lvl1, property')]
-        hierarchy = []
+        'hierarchy',
         # Current node tag. An open curly brace must follow
-        current_node_tag = None
+        'current_node_tag',
         # Current property tag. A primitive value, list or object must follow
-        current_property_tag = None
+        'current_property_tag',
         # Current line
-        current_line = 1
+        'current_line',
         # Pos of current line
-        current_line_pos = 0
+        'current_line_pos',
         # Current pos in line
-        current_pos = 0
+        'current_pos',
         # End of document
-        eod = False
+        'eod',
         # Separator expected
-        separator_expected = False
+        'separator_expected',
         # Separator allowed
-        separator_allowed = True
-
-    # Helper class for lists, only used internally to control lists in Context.hierarchy
-    class List:
-        def __init__(self, parent, property: str or None, value: list):
-            # The parent of the list can either be a Object or List
-            self.parent = parent
-            # The property this list is attached to.
-            # A list must either be attached to a property or a child of List
-            self.property = property
-            # The actual list
-            self.value = value
-            # Set to true if a separator (comma) is expected
-            self.separator_expected = False
-
-    # Reference to the current context
-    ctx = Context()
-
-    # Handle token one by one
-    for token in tokens:
-        # Every token is a tuple consisting of three entries:
-        # token[0]: Tag
-        # token[1]: Value
-        # token[2]: Flags
-        # token[3]: Position
-
-        # Calculate line pos
-        ctx.current_pos = token[3] - ctx.current_line_pos
-
-        # Root node closed: document should end
-        if ctx.eod and grammar.Tag.Br != token[0]:
-            raise exceptions.ParseException('End of document expected', ctx.current_line, ctx.current_pos)
-
-        # Node tag
-        if grammar.Tag.ObjectTag == token[0]:
-            if doc.root:
-                parent = ctx.hierarchy[-1]
-                if type(parent) == List:
-                    # Check if there was a separator before this item
-                    if parent.separator_expected:
-                        raise exceptions.ParseException('Expected token ","', ctx.current_line, ctx.current_pos)
-                else:
-                    if ctx.separator_expected:
-                        raise exceptions.ParseException('Expected token ";" or line break', ctx.current_line,
-                                                        ctx.current_pos)
-            ctx.current_node_tag = token[1]
-        # Open curly brace
-        elif grammar.Tag.BlockStart == token[0]:
-            is_list = type(ctx.hierarchy[-1]) == List if doc.root else False
-
-            # Raise exception if no opening brace is expected
-            if doc.root and not (ctx.current_property_tag or ctx.current_node_tag or is_list):
-                raise exceptions.ParseException('Unexpected token "{"', ctx.current_line, ctx.current_pos)
-
-            current_node = object_type()
-            current_node.name = ctx.current_node_tag
-            ctx.current_node_tag = None
-            ctx.separator_expected = False
-            if not doc.root:
-                doc.root = current_node
-            else:
-                parent = ctx.hierarchy[-1]
-                if type(parent) == List:
-                    if parent.separator_expected:
-                        raise exceptions.ParseException('Expected token ","', ctx.current_line, ctx.current_pos)
-
-                    parent.value.append(current_node)
-                else:
-                    if ctx.current_property_tag:
-                        parent.properties[ctx.current_property_tag] = current_node
-                        ctx.current_property_tag = None
-                    else:
-                        current_node.parent = parent
-                        parent.children.append(current_node)
-            ctx.hierarchy += [current_node]
-        # Close curly brace
-        elif grammar.Tag.BlockEnd == token[0]:
-            if len(ctx.hierarchy) == 0 or isinstance(type(ctx.hierarchy[-1]), objects.BaseObject):
-                raise exceptions.ParseException('Unexpected token "}"', ctx.current_line, ctx.current_pos)
-
-            if ctx.current_property_tag:
-                raise exceptions.ParseException('Expected value', ctx.current_line, ctx.current_pos)
-
-            is_root = ctx.hierarchy[-1] == doc.root
-            if isinstance(object_created_hook, typing.Callable):
-                object_created_hook(ctx.hierarchy[-1])
-            ctx.hierarchy.pop()
-
-            if is_root:
-                ctx.eod = True
-            else:
-                parent = ctx.hierarchy[-1]
-                if type(parent) == List:
-                    parent.separator_expected = True
-                elif isinstance(parent, objects.BaseObject):
-                    ctx.separator_expected = True
-        # Open square bracket
-        elif grammar.Tag.ListStart == token[0]:
-            if type(ctx.hierarchy[-1]) == List:
-                parent_list = ctx.hierarchy[-1]
-                if parent_list.separator_expected:
-                    raise exceptions.ParseException('Expected token ","', ctx.current_line, ctx.current_pos)
-                current_list = List(parent_list, None, [])
-                ctx.hierarchy += [current_list]
-            else:
-                if not ctx.current_property_tag:
-                    raise exceptions.ParseException('Unexpected token "["', ctx.current_line, ctx.current_pos)
-                current_node = ctx.hierarchy[-1]
-                l = List(current_node, ctx.current_property_tag, [])
-                ctx.hierarchy += [l]
-                ctx.current_property_tag = None
-        # Close square bracket
-        elif grammar.Tag.ListEnd == token[0]:
-            l = ctx.hierarchy[-1]
-            if not type(l) == List:
-                raise exceptions.ParseException('Unexpected token "]"', ctx.current_line, ctx.current_pos)
-
-            # Check if there was a ',' before ']'
-            if len(l.value) > 0 and not l.separator_expected:
-                raise exceptions.ParseException('Unexpected token "," before "]"', ctx.current_line, ctx.current_pos)
-
-            if type(l.parent) == List:
-                l.parent.value.append(l.value)
-                l.parent.separator_expected = True
+        'separator_allowed'
+    )
+
+    def __init__(self, object_type: objects.BaseObject = objects.BoostedObject,
+                 object_created_hook: typing.Callable = None, numeric_lists: str = None,
+                 intern_names: str = 'document', shared_keys: bool = False, build_index: bool = False):
+        """
+        :param object_type: Class to be used to instantiate objects
+        :param object_created_hook: Function to be called after an object was created
+        :param numeric_lists: Return lists of ints only or floats only as 'array' (array.array) or 'numpy' arrays
+        :param intern_names: Store each object and property name once per 'document' or process ('global')
+        :param shared_keys: Share the keys of the property dicts of objects with the same name
+        :param build_index: Index the objects of the document by name and properties, see Document.find_all()
+        """
+        if intern_names not in (None, 'document', 'global'):
+            raise ValueError('Unknown name interning "{}"'.format(intern_names))
+        self.object_type = object_type
+        self.object_created_hook = object_created_hook if isinstance(object_created_hook, typing.Callable) else None
+        self.numeric_lists = numeric.check_list_type(numeric_lists)
+        self.intern_names = intern_names
+        self.shared_keys = shared_keys
+        self.build_index = build_index
+        self._intern = sys.intern if 'global' == intern_names else str
+        self._shapes = {}
+
+        # Tokens without a handler of their own (e.g. a stray comment end) are ignored
+        handlers = {pattern[0]: self._ignore for pattern in grammar.patterns}
+        handlers.update({
+            grammar.Tag.ObjectTag: self._object_tag,
+            grammar.Tag.BlockStart: self._block_start,
+            grammar.Tag.BlockEnd: self._block_end,
+            grammar.Tag.ListStart: self._list_start,
+            grammar.Tag.ListEnd: self._list_end,
+            grammar.Tag.ListSeparator: self._list_separator,
+            grammar.Tag.PropertyTag: self._property_tag,
+            grammar.Tag.PropertyValueInt: self._value_int,
+            grammar.Tag.PropertyValueFloat: self._value_float,
+            grammar.Tag.PropertyValueBool: self._value_bool,
+            grammar.Tag.PropertyValueString: self._value_string,
+            grammar.Tag.NumericList: self._numeric_list,
+            grammar.Tag.Br: self._br,
+            grammar.Tag.PropertySeparator: self._property_separator
+        })
+        self._handlers = handlers
+        self.doc = None
+        self.hierarchy = None
+
+    def parse(self, text: str or typing.Iterable[tuple], doc: document.Document = None) -> document.Document:
+        """
+        Parse a Unke string and return resulting document object
+        :param text: Text to parse or an iterable of tokens, e.g. a generator returned by lexer.iter_lex()
+        :param doc: Document to use
+        :return: Unke document
+        """
+        # Lex: retrieve tokens unless the caller already passes a token stream
+        if isinstance(text, str):
+            tokens = lexer.lex(text, numeric_lists=self.numeric_lists is not None)
+        else:
+            tokens = text
+
+        # Create a document if none is specified
+        self._reset(doc or document.Document())
+        try:
+            self._feed(tokens)
+
+            # Detect missing closing curly brace(s)
+            if len(self.hierarchy) > 0:
+                raise exceptions.ParseException('Expected token "}"', self.current_line, self.current_pos)
+            return self.doc
+        finally:
+            # Do not keep the document alive through the parser
+            self.doc = None
+            self.hierarchy = None
+
+    def _reset(self, doc: document.Document):
+        self.doc = doc
+        # A new index, also if a document is parsed again after an error
+        doc.index = document.Index() if self.build_index else None
+        if 'document' == self.intern_names:
+            self._intern = _SymbolTable().__getitem__
+        # Like the names, the shapes are scoped to the document, so a reused parser does not collect them
+        self._shapes = {}
+        self.hierarchy = []
+        self.current_node_tag = None
+        self.current_property_tag = None
+        self.current_line = 1
+        self.current_line_pos = 0
+        self.current_pos = 0
+        self.eod = False
+        self.separator_expected = False
+        self.separator_allowed = True
+
+    def _feed(self, tokens: typing.Iterable[tuple]):
+        handlers = self._handlers
+        br = grammar.Tag.Br
+
+        # Handle token one by one
+        for token in tokens:
+            # Every token is a tuple consisting of four entries:
+            # token[0]: Tag
+            # token[1]: Value
+            # token[2]: Flags
+            # token[3]: Position
+
+            # Calculate line pos
+            self.current_pos = token[3] - self.current_line_pos
+
+            # Root node closed: document should end
+            if self.eod and br != token[0]:
+                raise exceptions.ParseException('End of document expected', self.current_line, self.current_pos)
+
+            handlers[token[0]](token)
+
+    def _ignore(self, token: tuple):
+        pass
+
+    # Node tag
+    def _object_tag(self, token: tuple):
+        if self.doc.root:
+            parent = self.hierarchy[-1]
+            if type(parent) == _List:
+                # Check if there was a separator before this item
+                if parent.separator_expected:
+                    raise exceptions.ParseException('Expected token ","', self.current_line, self.current_pos)
+            elif self.separator_expected:
+                raise exceptions.ParseException('Expected token ";" or line break', self.current_line,
+                                                self.current_pos)
+        self.current_node_tag = self._intern(token[1])
+
+    # Open curly brace
+    def _block_start(self, token: tuple):
+        doc = self.doc
+        is_list = type(self.hierarchy[-1]) == _List if doc.root else False
+
+        # Raise exception if no opening brace is expected
+        if doc.root and not (self.current_property_tag or self.current_node_tag or is_list):
+            raise exceptions.ParseException('Unexpected token "{"', self.current_line, self.current_pos)
+
+        current_node = self.object_type()
+        current_node.name = self.current_node_tag
+        if self.shared_keys:
+            shape = self._shapes.get(current_node.name)
+            if shape is None:
+                shape = self._shapes[current_node.name] = type('_Shape', (_Shape,), {})
+            current_node.properties = shape().__dict__
+        self.current_node_tag = None
+        self.separator_expected = False
+        if not doc.root:
+            doc.root = current_node
+        else:
+            parent = self.hierarchy[-1]
+            if is_list:
+                if parent.separator_expected:
+                    raise exceptions.ParseException('Expected token ","', self.current_line, self.current_pos)
+                parent.value.append(current_node)
+            elif self.current_property_tag:
+                if doc.index is not None:
+                    self._unindex_replaced(parent, self.current_property_tag)
+                parent.properties[self.current_property_tag] = current_node
+                self.current_property_tag = None
             else:
-                l.parent.properties[l.property] = l.value
-                ctx.separator_expected = True
-                ctx.separator_allowed = True
-            ctx.hierarchy.pop()
-        # List separator
-        elif grammar.Tag.ListSeparator == token[0]:
-            parent = ctx.hierarchy[-1]
-            if type(parent) != List or not parent.separator_expected:
-                raise exceptions.ParseException('Unexpected token ","', ctx.current_line, ctx.current_pos)
-            parent.separator_expected = False
-        # Property tag
-        elif grammar.Tag.PropertyTag == token[0]:
-            if ctx.separator_expected:
-                raise exceptions.ParseException('Expected token ";" or line break', ctx.current_line, ctx.current_pos)
-            if doc.root and isinstance(ctx.hierarchy[-1], List):
-                raise exceptions.ParseException('Unexpected property', ctx.current_line, ctx.current_pos)
-            ctx.current_property_tag = token[1].replace(' ', '')[:-1]
-            ctx.separator_expected = False
-            ctx.separator_allowed = False
-        # Property values
-        elif grammar.Flag.Value in token[2]:
-            current_node = ctx.hierarchy[-1]
-            value = None
-            if grammar.Tag.PropertyValueInt == token[0]:
-                value = int(token[1])
-            elif grammar.Tag.PropertyValueFloat == token[0]:
-                value = float(token[1])
-            elif grammar.Tag.PropertyValueBool == token[0]:
-                value = (token[1] == 'true')
-            elif grammar.Tag.PropertyValueString == token[0]:
-                value = token[1][1:len(token[1])-1]
-
-            if type(current_node) == List:
-                if current_node.separator_expected:
-                    raise exceptions.ParseException('Expected token ","', ctx.current_line, ctx.current_pos)
-                current_node.value.append(value)
-                current_node.separator_expected = True
+                current_node.parent = parent
+                parent.children.append(current_node)
+        self.hierarchy.append(current_node)
+
+    # Close curly brace
+    def _block_end(self, token: tuple):
+        hierarchy = self.hierarchy
+        if len(hierarchy) == 0 or type(hierarchy[-1]) == _List:
+            raise exceptions.ParseException('Unexpected token "}"', self.current_line, self.current_pos)
+
+        if self.current_property_tag:
+            raise exceptions.ParseException('Expected value', self.current_line, self.current_pos)
+
+        # Objects are indexed once all their properties are set
+        if self.doc.index is not None:
+            self.doc.index.add(hierarchy[-1])
+        if self.object_created_hook is not None:
+            self.object_created_hook(hierarchy[-1])
+        hierarchy.pop()
+
+        if len(hierarchy) == 0:
+            self.eod = True
+        elif type(hierarchy[-1]) == _List:
+            hierarchy[-1].separator_expected = True
+        else:
+            self.separator_expected = True
+
+    # Open square bracket
+    def _list_start(self, token: tuple):
+        hierarchy = self.hierarchy
+        if len(hierarchy) == 0:
+            raise exceptions.ParseException('Unexpected token "["', self.current_line, self.current_pos)
+        parent = hierarchy[-1]
+        if type(parent) == _List:
+            if parent.separator_expected:
+                raise exceptions.ParseException('Expected token ","', self.current_line, self.current_pos)
+            hierarchy.append(_List(parent, None, []))
+        else:
+            if not self.current_property_tag:
+                raise exceptions.ParseException('Unexpected token "["', self.current_line, self.current_pos)
+            hierarchy.append(_List(parent, self.current_property_tag, []))
+            self.current_property_tag = None
+
+    # Close square bracket
+    def _list_end(self, token: tuple):
+        hierarchy = self.hierarchy
+        l = hierarchy[-1] if len(hierarchy) > 0 else None
+        if type(l) != _List:
+            raise exceptions.ParseException('Unexpected token "]"', self.current_line, self.current_pos)
+
+        # Check if there was a ',' before ']'
+        if len(l.value) > 0 and not l.separator_expected:
+            raise exceptions.ParseException('Unexpected token "," before "]"', self.current_line, self.current_pos)
+
+        if type(l.parent) == _List:
+            l.parent.value.append(l.value)
+            l.parent.separator_expected = True
+        else:
+            if self.doc.index is not None:
+                self._unindex_replaced(l.parent, l.property)
+            l.parent.properties[l.property] = l.value
+            self.separator_expected = True
+            self.separator_allowed = True
+        hierarchy.pop()
+
+    # List separator
+    def _list_separator(self, token: tuple):
+        parent = self.hierarchy[-1] if len(self.hierarchy) > 0 else None
+        if type(parent) != _List or not parent.separator_expected:
+            raise exceptions.ParseException('Unexpected token ","', self.current_line, self.current_pos)
+        parent.separator_expected = False
+
+    # Property tag
+    def _property_tag(self, token: tuple):
+        if self.separator_expected:
+            raise exceptions.ParseException('Expected token ";" or line break', self.current_line, self.current_pos)
+        if self.doc.root and type(self.hierarchy[-1]) == _List:
+            raise exceptions.ParseException('Unexpected property', self.current_line, self.current_pos)
+        self.current_property_tag = self._intern(token[1][:-1])
+        self.separator_expected = False
+        self.separator_allowed = False
+
+    # Property values
+    def _value_int(self, token: tuple):
+        self._value(int(token[1]))
+
+    def _value_float(self, token: tuple):
+        self._value(float(token[1]))
+
+    def _value_bool(self, token: tuple):
+        self._value(token[1] == 'true')
+
+    def _value_string(self, token: tuple):
+        self._value(token[1][1:-1])
+
+    # List of numbers lexed as a whole
+    def _numeric_list(self, token: tuple):
+        hierarchy = self.hierarchy
+        value = numeric.list_from_string(token[1], self.numeric_lists)
+        if value is None or len(hierarchy) == 0 or (type(hierarchy[-1]) != _List and not self.current_property_tag):
+            # Not a list of ints only or floats only, e.g. "[1, 2.5]", or misplaced
+            self._numeric_list_tokens(token)
+            return
+        self._value(value)
+        line_breaks = lexer.list_line_breaks(token)
+        if line_breaks:
+            self.current_line += len(line_breaks)
+            self.current_line_pos = line_breaks[-1]
+
+    def _numeric_list_tokens(self, token: tuple):
+        # Handle the tokens of a list of numbers one by one
+        self._feed([(tag, text, flags, pos + token[3]) for tag, text, flags, pos in lexer.lex(token[1])])
+
+    def _value(self, value):
+        current_node = self.hierarchy[-1] if len(self.hierarchy) > 0 else None
+        if type(current_node) == _List:
+            if current_node.separator_expected:
+                raise exceptions.ParseException('Expected token ","', self.current_line, self.current_pos)
+            current_node.value.append(value)
+            current_node.separator_expected = True
+        else:
+            if not self.current_property_tag or current_node is None:
+                raise exceptions.ParseException('Unexpected value "{}"'.format(str(value)),
+                                                self.current_line, self.current_pos)
+            if self.doc.index is not None:
+                self._unindex_replaced(current_node, self.current_property_tag)
+            current_node.properties[self.current_property_tag] = value
+            self.current_property_tag = None
+            self.separator_expected = True
+            self.separator_allowed = True
+
+    def _unindex_replaced(self, obj: objects.BaseObject, key: str):
+        # A property assigned again drops its value, the objects in it were indexed when their blocks closed
+        properties = obj.properties
+        if key in properties:
+            index = self.doc.index
+            for nested in document.iter_objects(properties[key]):
+                index.remove(nested)
+
+    # Line break
+    def _br(self, token: tuple):
+        self.current_line += 1
+        self.current_line_pos = token[3]
+        self.current_pos = 0
+        self.separator_expected = False
+
+    # Separator (Semicolon)
+    def _property_separator(self, token: tuple):
+        if not self.separator_allowed:
+            raise exceptions.ParseException('Unexpected token ";"', self.current_line, self.current_pos)
+        self.separator_expected = False
+
+
+class TracingParser(Parser):
+    """
+    Parser reporting the phases, tokens, objects and lists of every parse to a tracer, see tracing.Tracer
+    Only used when a tracer is passed, so parsing without a tracer does not pay for the instrumentation.
+    """
+
+    __slots__ = (
+        'tracer',
+        # Number of lists started by tokens, see _numeric_list()
+        '_list_starts'
+    )
+
+    def __init__(self, tracer: tracing.Tracer, object_type: objects.BaseObject = objects.BoostedObject,
+                 object_created_hook: typing.Callable = None, numeric_lists: str = None,
+                 intern_names: str = 'document', shared_keys: bool = False, build_index: bool = False):
+        """
+        :param tracer: Tracer to report to
+        See Parser for the other parameters
+        """
+        Parser.__init__(self, object_type, object_created_hook, numeric_lists, intern_names, shared_keys,
+                        build_index)
+        self.tracer = tracer
+        self._list_starts = 0
+        hook = self.object_created_hook
+        if hook is not None:
+            def timed_hook(obj):
+                start = time.perf_counter()
+                hook(obj)
+                tracer.hook_called(obj, time.perf_counter() - start)
+            self.object_created_hook = timed_hook
+
+    def parse(self, text: str or typing.Iterable[tuple], doc: document.Document = None) -> document.Document:
+        tracer = self.tracer
+        counter = time.perf_counter
+        tracer.phase_started(tracing.Phase.Total)
+        start = counter()
+        try:
+            if isinstance(text, str):
+                tracer.phase_started(tracing.Phase.Lex)
+                lex_start = counter()
+                tokens = lexer.lex(text, numeric_lists=self.numeric_lists is not None)
+                lex_time = [counter() - lex_start]
+                tracer.phase_finished(tracing.Phase.Lex, lex_time[0])
+                counts = collections.Counter(token[0] for token in tokens)
             else:
-                if not ctx.current_property_tag:
-                    raise exceptions.ParseException('Unexpected value "{}"'.format(str(value)),
-                                                    ctx.current_line, ctx.current_pos)
-                current_node.properties[ctx.current_property_tag] = value
-                ctx.current_property_tag = None
-                ctx.separator_expected = True
-                ctx.separator_allowed = True
-        # Line break
-        elif grammar.Tag.Br == token[0]:
-            ctx.current_line += 1
-            ctx.current_line_pos = token[3]
-            ctx.current_pos = 0
-            ctx.separator_expected = False
-        # Separator (Semicolon)
-        elif grammar.Tag.PropertySeparator == token[0]:
-            if not ctx.separator_allowed:
-                raise exceptions.ParseException('Unexpected token ";"', ctx.current_line, ctx.current_pos)
-            ctx.separator_expected = False
-
-    # Detect missing closing curly brace(s)
-    if len(ctx.hierarchy) > 0:
-        raise exceptions.ParseException('Expected token "}"', ctx.current_line, ctx.current_pos)
-
-    return doc
+                lex_time = [0.0]
+                counts = collections.Counter()
+                tokens = _timed_tokens(text, counts, lex_time)
+            tracer.phase_started(tracing.Phase.Parse)
+            parse_start = counter()
+            try:
+                return Parser.parse(self, tokens, doc)
+            finally:
+                tracer.phase_finished(tracing.Phase.Parse, counter() - parse_start)
+                tracer.tokens_lexed(dict(counts), lex_time[0])
+        finally:
+            tracer.phase_finished(tracing.Phase.Total, counter() - start)
+
+    def _block_start(self, token: tuple):
+        Parser._block_start(self, token)
+        self.tracer.object_created(self.hierarchy[-1], len(self.hierarchy))
+
+    def _list_start(self, token: tuple):
+        Parser._list_start(self, token)
+        self._list_starts += 1
+        self.tracer.list_created(len(self.hierarchy))
+
+    def _numeric_list(self, token: tuple):
+        list_starts = self._list_starts
+        Parser._numeric_list(self, token)
+        # Lists that are not converted as a whole are reported by _list_start()
+        if list_starts == self._list_starts:
+            self.tracer.list_created(len(self.hierarchy) + 1)
+
+
+def _timed_tokens(tokens: typing.Iterable[tuple], counts: collections.Counter,
+                  lex_time: list) -> typing.Iterator[tuple]:
+    """
+    Pass on the tokens of a token stream, counting them by tag and adding the time spent lexing to lex_time[0]
+    """
+    counter = time.perf_counter
+    tokens = iter(tokens)
+    while True:
+        start = counter()
+        token = next(tokens, None)
+        lex_time[0] += counter() - start
+        if token is None:
+            return
+        counts[token[0]] += 1
+        yield token
+
+
+def parse(text: str or typing.Iterable[tuple], object_type: objects.BaseObject=objects.BoostedObject,
+          object_created_hook: typing.Callable = None, doc: document.Document=None, numeric_lists: str = None,
+          intern_names: str = 'document', shared_keys: bool = False, build_index: bool = False,
+          tracer: tracing.Tracer = None):
+    """
+    Parse a Unke string and return resulting document object
+    Use a Parser instance instead to parse many documents with the same settings.
+    With a tracer, e.g. tracing.Stats, the parse is instrumented, see TracingParser.
+    :param text: Text to parse or an iterable of tokens, e.g. a generator returned by lexer.iter_lex()
+    :param object_type: Class to be used to instantiate objects
+    :param doc: Document to use
+    :param object_created_hook: Function to be called after an object was created
+    :param numeric_lists: Return lists of ints only or floats only as 'array' (array.array) or 'numpy' arrays
+    :param intern_names: Store each object and property name once per 'document' or process ('global')
+    :param shared_keys: Share the keys of the property dicts of objects with the same name
+    :param build_index: Index the objects of the document by name and properties, see Document.find_all()
+    :param tracer: Tracer to report the phases, tokens, objects and lists to
+    :return: Unke document
+    """
+    if tracer is not None:
+        return TracingParser(tracer, object_type, object_created_hook, numeric_lists, intern_names, shared_keys,
+                             build_index).parse(text, doc)
+    return Parser(object_type, object_created_hook, numeric_lists, intern_names, shared_keys,
+                  build_index).parse(text, doc)
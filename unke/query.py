@@ -0,0 +1,429 @@
+# -*- coding: utf-8
+
+import functools
+import itertools
+import operator
+import re
+import typing
+
+from . import document
+from . import events
+from . import objects
+from . import numeric
+from . import columnar
+
+
+# Query syntax:
+#   Root/Item/Child       Objects named Child that are children of Item, which is a child of the root object Root
+#   //ListItem            Objects named ListItem at any depth, including property values and list items
+#   Root.f[*].name        Property name of all items of the list in property f of Root
+#   Step names can be *, filters can follow every step:
+#   [*] all items of a list, [2] (or [-1]) single item of a list,
+#   [prop] objects having the property, [prop>7] objects whose property compares true, see _operators
+
+(
+    _Child,
+    _Descendant,
+    _Property
+) = range(3)
+
+_axes = {'/': _Child, '//': _Descendant, '.': _Property}
+
+_operators = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+(
+    _All,
+    _Index,
+    _Has,
+    _Compare
+) = range(4)
+
+_token_regex = re.compile(
+    r'\s*(?:'
+    r'(?P<number>[-+]?[0-9]*\.[0-9]+|[-+]?[0-9]+)|'
+    r'(?P<string>"[^"]*"|\'[^\']*\')|'
+    r'(?P<name>[A-Za-z_]+)|'
+    r'(?P<symbol>//|/|\.|\[|\]|\*|==|!=|<=|>=|=|<|>)'
+    r')\s*'
+)
+
+
+class _Step:
+    """
+    Step of a compiled query, only used internally by Query
+    """
+    __slots__ = ('axis', 'name', 'filters')
+
+    def __init__(self, axis: int, name: str):
+        self.axis = axis
+        # None matches any name
+        self.name = name
+        # Tuples of a filter type and its arguments
+        self.filters = []
+
+
+class Query:
+    """
+    Compiled query, see compile()
+    A query can be used any number of times on documents as well as on event streams.
+    """
+    __slots__ = ('path', '_steps')
+
+    def __init__(self, path: str):
+        """
+        :param path: Query, e.g. "Root/Item[id>7]" or "//ListItem"
+        """
+        self.path = path
+        self._steps = _compile_steps(path)
+
+    def find_all(self, target: document.Document or objects.BaseObject) -> list:
+        """
+        Find all values matching the query in a document
+        :param target: Document, or object to use as root object
+        :return: List of matching objects and values, children come before properties
+        """
+        root = target.root if isinstance(target, document.Document) else target
+        if root is None:
+            return []
+        first = self._steps[0]
+        values = _descendants(root, True) if _Descendant == first.axis else (root,)
+        return _evaluate(self._steps, 1, _filter(first, [value for value in values if _name_matches(first, value)]))
+
+    def find_first(self, target: document.Document or objects.BaseObject):
+        """
+        Find the first value matching the query in a document
+        :param target: Document, or object to use as root object
+        :return: First matching object or value, None if nothing matches
+        """
+        values = self.find_all(target)
+        return values[0] if len(values) > 0 else None
+
+    def match_events(self, event_stream: typing.Iterable[tuple],
+                     object_type: objects.BaseObject = objects.BoostedObject) -> typing.Iterator:
+        """
+        Find all values matching the query in a stream of parse events without building the document
+        Only matching objects and lists, and objects and lists that a filter has to be applied to, are built
+        from the events. Other parts of the document are skipped.
+        Like in the document, a property assigned again only keeps its last value, so the matches in the
+        properties of an object are held back until the object is closed. The matches in children are
+        yielded right away.
+        :param event_stream: Events of a whole document, e.g. returned by events.iterparse()
+        :param object_type: Class to be used to instantiate the objects that are built
+        :return: Generator of matching objects and values, the ones of the children of an object before the
+                 ones of its properties like in find_all()
+        """
+        steps = self._steps
+        last = len(steps) - 1
+        # Steps whose values have to be built: the last step and steps with filters
+        needs_value = [index == last or len(step.filters) > 0 for index, step in enumerate(steps)]
+        start_object = events.Event.StartObject
+        property_event = events.Event.Property
+        event_stream = iter(event_stream)
+        # The steps applying to the values in each open object or list as (is object, step indexes, output,
+        # matches by property). The output collects the matches of the children or items, None for matches
+        # that are yielded. The first frame stands for the document, the root object is its child.
+        inactive = (False, (), None, None)
+        hierarchy = [(True, (0,), None, None)]
+        for event in event_stream:
+            kind, key, value = event
+            if events.Event.EndObject == kind or events.Event.EndList == kind:
+                is_object_frame, active, output, properties = hierarchy.pop()
+                if properties:
+                    for matches in properties.values():
+                        if output is None:
+                            yield from matches
+                        else:
+                            output.extend(matches)
+                continue
+            is_object_frame, active, output, properties = hierarchy[-1]
+            if not active:
+                if property_event != kind:
+                    hierarchy.append(inactive)
+                continue
+            if key is not None:
+                # The matches of a value assigned before are dropped, the property keeps its position
+                output = properties[key] = []
+
+            is_object = start_object == kind
+            entering = []
+            inherited = []
+            build = False
+            for index in active:
+                step = steps[index]
+                if _Descendant == step.axis:
+                    inherited.append(index)
+                    if not is_object or (step.name is not None and step.name != value):
+                        continue
+                elif _Child == step.axis:
+                    if not is_object or key is not None or not is_object_frame or \
+                            (step.name is not None and step.name != value):
+                        continue
+                elif not is_object_frame or key is None or (step.name is not None and step.name != key):
+                    continue
+                entering.append(index)
+                build = build or needs_value[index]
+
+            if build:
+                # Build the value and find the matches within it in the built value
+                node = value if property_event == kind else events.materialize(event, event_stream, object_type)
+                seen = set()
+                matches = itertools.chain(
+                    *(_unique(_evaluate(steps, index + 1, _filter(steps[index], [node])), seen) for index in entering),
+                    *(_unique(_evaluate(steps, index, [node]), seen) for index in inherited)
+                )
+                if output is None:
+                    yield from matches
+                else:
+                    output.extend(matches)
+            elif property_event != kind:
+                if len(entering) > 0:
+                    inherited = sorted(set(index + 1 for index in entering) | set(inherited))
+                if len(inherited) == 0:
+                    hierarchy.append(inactive)
+                else:
+                    hierarchy.append((is_object, tuple(inherited), output, {} if is_object else None))
+
+    def iterparse(self, source: str or typing.IO or typing.Iterable[tuple], chunk_size: int = 65536,
+                  object_type: objects.BaseObject = objects.BoostedObject) -> typing.Iterator:
+        """
+        Parse a Unke document incrementally and yield the values matching the query, see match_events()
+        :param source: Filename, text or binary file object, or iterable of tokens
+        :param chunk_size: Number of characters or bytes to read at once from files
+        :param object_type: Class to be used to instantiate the objects that are built
+        :return: Generator of matching objects and values in document order
+        """
+        return self.match_events(events.iterparse(source, chunk_size), object_type)
+
+    def __repr__(self):
+        return 'Query({!r})'.format(self.path)
+
+
+@functools.lru_cache(maxsize=256)
+def compile(path: str) -> Query:
+    """
+    Compile a query, compiled queries are cached
+    :param path: Query, e.g. "Root/Item[id>7]" or "//ListItem"
+    :return: Query
+    """
+    return Query(path)
+
+
+def find_all(path: str, target: document.Document or objects.BaseObject) -> list:
+    """
+    Find all values matching a query in a document, see Query.find_all()
+    :param path: Query
+    :param target: Document, or object to use as root object
+    :return: List of matching objects and values
+    """
+    return compile(path).find_all(target)
+
+
+def _compile_steps(path: str) -> list:
+    tokens = []
+    pos = 0
+    while pos < len(path):
+        match = _token_regex.match(path, pos)
+        if match is None or match.end() == pos:
+            raise ValueError('Invalid query "{}" at position {}'.format(path, pos))
+        tokens.append((match.lastgroup, match.group(match.lastgroup), match.start(match.lastgroup)))
+        pos = match.end()
+    # Filters look ahead up to four tokens
+    tokens.extend([(None, None, len(path))] * 5)
+
+    def error(token: tuple):
+        return ValueError('Invalid query "{}" at position {}'.format(path, token[2]))
+
+    steps = []
+    i = 0
+    while tokens[i][0] is not None:
+        # Axis, the first step is a child of the document unless it starts with //
+        if tokens[i][0] == 'symbol' and tokens[i][1] in _axes:
+            axis = _axes[tokens[i][1]]
+            if len(steps) == 0 and _Property == axis:
+                raise error(tokens[i])
+            i += 1
+        elif len(steps) == 0:
+            axis = _Child
+        else:
+            raise error(tokens[i])
+        # Name
+        if tokens[i][0] == 'name':
+            step = _Step(axis, tokens[i][1])
+        elif tokens[i][1] == '*':
+            step = _Step(axis, None)
+        else:
+            raise error(tokens[i])
+        i += 1
+        # Filters
+        while tokens[i][1] == '[':
+            if tokens[i + 1][1] == '*' and tokens[i + 2][1] == ']':
+                step.filters.append((_All,))
+                i += 3
+            elif tokens[i + 1][0] == 'number' and tokens[i + 2][1] == ']' and '.' not in tokens[i + 1][1]:
+                step.filters.append((_Index, int(tokens[i + 1][1])))
+                i += 3
+            elif tokens[i + 1][0] == 'name' and tokens[i + 2][1] == ']':
+                step.filters.append((_Has, tokens[i + 1][1]))
+                i += 3
+            elif tokens[i + 1][0] == 'name' and tokens[i + 2][1] in _operators and tokens[i + 4][1] == ']':
+                step.filters.append((
+                    _Compare, tokens[i + 1][1], _operators[tokens[i + 2][1]], _literal(tokens[i + 3], error)
+                ))
+                i += 5
+            else:
+                raise error(tokens[i + 1])
+        steps.append(step)
+    if len(steps) == 0:
+        raise error(tokens[i])
+    return steps
+
+
+def _literal(token: tuple, error: typing.Callable):
+    kind, text = token[0], token[1]
+    if kind == 'number':
+        return float(text) if '.' in text else int(text)
+    if kind == 'string':
+        return text[1:-1]
+    if kind == 'name' and text in ('true', 'false'):
+        return text == 'true'
+    raise error(token)
+
+
+def _name_matches(step: _Step, value) -> bool:
+    return isinstance(value, objects.BaseObject) and (step.name is None or step.name == value.name)
+
+
+def _nested(value) -> typing.Iterator:
+    # Objects and lists directly nested in an object or list, containers that were never accessed are skipped
+    if isinstance(value, objects.BaseObject):
+        children = value._children or ()
+        properties = value._properties
+        return itertools.chain(children, properties.values()) if properties else iter(children)
+    if type(value) == list:
+        return iter(value)
+    return iter(())
+
+
+def _descendants(value, include_self: bool = False) -> typing.Iterator[objects.BaseObject]:
+    # Objects nested in a value at any depth, children before properties
+    if include_self and isinstance(value, objects.BaseObject):
+        yield value
+    stack = [_nested(value)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, objects.BaseObject):
+                yield item
+                stack.append(_nested(item))
+                break
+            if type(item) == list:
+                stack.append(iter(item))
+                break
+        else:
+            stack.pop()
+
+
+def _select(step: _Step, values: list) -> list:
+    # Values reached from the values by the axis and name of a step
+    result = []
+    append = result.append
+    name = step.name
+    if _Descendant == step.axis:
+        for value in values:
+            result.extend(item for item in _descendants(value) if name is None or item.name == name)
+        return result
+    for value in values:
+        if not isinstance(value, objects.BaseObject):
+            continue
+        if _Child == step.axis:
+            children = value._children
+            if not children:
+                continue
+            if name is None:
+                result.extend(children)
+                continue
+            for child in children:
+                if child.name == name:
+                    append(child)
+        else:
+            properties = value._properties
+            if not properties:
+                continue
+            if name is None:
+                result.extend(properties.values())
+            elif name in properties:
+                append(properties[name])
+    return result
+
+
+def _filter(step: _Step, values: list) -> list:
+    for query_filter in step.filters:
+        kind = query_filter[0]
+        if _All == kind:
+            values = [item for value in values for item in _items(value)]
+        elif _Index == kind:
+            index = query_filter[1]
+            values = [items[index] for items in map(_items, values) if -len(items) <= index < len(items)]
+        elif _Has == kind:
+            values = [value for value in values
+                      if isinstance(value, objects.BaseObject) and value._properties
+                      and query_filter[1] in value._properties]
+        else:
+            values = _compare(values, query_filter[1], query_filter[2], query_filter[3])
+    return values
+
+
+def _items(value) -> list or tuple:
+    # Items of a list or of a numeric list as regular list, no items for other values
+    if type(value) == list:
+        return value
+    if isinstance(value, numeric.array_types):
+        return value.tolist()
+    return ()
+
+
+def _compare(values: list, key: str, compare: typing.Callable, literal) -> list:
+    result = []
+    literal_is_bool = type(literal) == bool
+    for value in values:
+        if not isinstance(value, objects.BaseObject):
+            continue
+        properties = value._properties
+        if not properties or key not in properties:
+            continue
+        property_value = properties[key]
+        # Booleans are only compared with booleans, other types that cannot be compared do not match
+        if (type(property_value) == bool) != literal_is_bool:
+            continue
+        try:
+            if compare(property_value, literal):
+                result.append(value)
+        except TypeError:
+            pass
+    return result
+
+
+def _unique(values: list, seen: set) -> typing.Iterator:
+    # Objects reached more than once, e.g. through nested descendant steps, are only returned once
+    for value in values:
+        if isinstance(value, objects.BaseObject):
+            key = value if type(value) == columnar.ColumnarObject else id(value)
+            if key in seen:
+                continue
+            seen.add(key)
+        yield value
+
+
+def _evaluate(steps: list, start: int, values: list) -> list:
+    for step in itertools.islice(steps, start, None):
+        values = _filter(step, _select(step, values))
+        if _Descendant == step.axis:
+            values = list(_unique(values, set()))
+    return values
@@ -0,0 +1,798 @@
+# -*- coding: utf-8
+
+import bisect
+import mmap
+import operator
+import os
+import shutil
+import tempfile
+import typing
+
+from . import grammar
+from . import lexer
+from . import parser
+from . import document
+from . import objects
+from . import numeric
+from . import exceptions
+from . import dump
+
+
+class _ObjectSource:
+    """
+    Source span of an object and the state of the object when it was loaded
+    """
+    __slots__ = ('obj', 'start', 'end', 'name', 'name_span', 'children', 'properties', 'property_spans',
+                 'key', 'property_start')
+
+    def __init__(self, obj: objects.BaseObject, start: int, name_span: tuple or None):
+        # The source keeps the object alive, so its id stays unique
+        self.obj = obj
+        # Span of the whole object, from its name or opening brace to behind its closing brace
+        self.start = start
+        self.end = None
+        self.name = obj.name
+        # Span of the name, None if the name is not right in front of the opening brace
+        self.name_span = name_span
+        self.children = None
+        self.properties = None
+        # Property name: list of (property start, value start, value end), one per assignment
+        self.property_spans = {}
+        # Property the object is assigned to and position of the property tag
+        self.key = None
+        self.property_start = None
+
+
+class _ListSource:
+    """
+    Source span of a list and its items when it was loaded
+    """
+    __slots__ = ('value', 'start', 'end', 'items', 'item_spans', 'key', 'property_start')
+
+    def __init__(self, value: list, start: int):
+        # The source keeps the list alive, so its id stays unique
+        self.value = value
+        # Span of the whole list, from its opening to behind its closing bracket
+        self.start = start
+        self.end = None
+        self.items = None
+        # (item start, item start, item end) for each item
+        self.item_spans = []
+        # Property the list is assigned to and position of the property tag
+        self.key = None
+        self.property_start = None
+
+
+class SourceMap:
+    """
+    Source spans of the objects and lists of a document loaded with position tracking
+    Positions are byte offsets in the file. Objects and lists are identified by their id,
+    so copies of a document must not be saved with save_changes().
+    """
+    __slots__ = ('filename', 'stat', 'root', 'objects', 'lists', 'separators')
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        # Modification time and size of the file when it was loaded or saved
+        self.stat = None
+        self.root = None
+        # Id: source of the objects and lists
+        self.objects = {}
+        self.lists = {}
+        # Positions of the separators not following a property value, they are only allowed depending on
+        # the values further in front of them
+        self.separators = []
+
+
+class _TrackingParser(parser.Parser):
+    """
+    Parser recording the source spans of the objects, lists and values
+    """
+    __slots__ = ('data', 'source', '_sources', '_name_token', '_value_token', '_property_start',
+                 '_separator_inherited')
+
+    def __init__(self, data: bytes, source: SourceMap, object_type: objects.BaseObject,
+                 object_created_hook: typing.Callable):
+        parser.Parser.__init__(self, object_type, object_created_hook)
+        self.data = data
+        self.source = source
+
+    def _reset(self, doc: document.Document):
+        parser.Parser._reset(self, doc)
+        # Sources of the open objects and lists
+        self._sources = []
+        # Last object tag, value and property tag tokens
+        self._name_token = None
+        self._value_token = None
+        self._property_start = None
+        # Set to false by a property value until the next token that is neither a separator nor a line break
+        self._separator_inherited = True
+
+    def _add_span(self, source: _ObjectSource or _ListSource):
+        if len(self._sources) == 0:
+            return
+        parent = self._sources[-1]
+        if type(parent) == _ListSource:
+            parent.item_spans.append((source.start, source.start, source.end))
+        elif source.key is not None:
+            parent.property_spans.setdefault(source.key, []).append((source.property_start, source.start, source.end))
+
+    def _object_tag(self, token: tuple):
+        parser.Parser._object_tag(self, token)
+        self._name_token = token
+        self._separator_inherited = True
+
+    def _property_tag(self, token: tuple):
+        parser.Parser._property_tag(self, token)
+        self._property_start = token[3]
+        self._separator_inherited = True
+
+    def _block_start(self, token: tuple):
+        key = self.current_property_tag
+        name_token = self._name_token
+        parser.Parser._block_start(self, token)
+        self._name_token = None
+        self._separator_inherited = True
+        obj = self.hierarchy[-1]
+
+        start = token[3]
+        name_span = None
+        if name_token is not None and name_token[1] == obj.name:
+            name_end = name_token[3] + len(name_token[1])
+            if self.data[name_end:start].strip() == b'':
+                start = name_token[3]
+                name_span = (start, name_end)
+        source = _ObjectSource(obj, start, name_span)
+        if key and len(self._sources) > 0 and type(self._sources[-1]) == _ObjectSource:
+            source.key = key
+            source.property_start = self._property_start
+        if len(self._sources) == 0:
+            self.source.root = source
+        self.source.objects[id(obj)] = source
+        self._sources.append(source)
+
+    def _block_end(self, token: tuple):
+        parser.Parser._block_end(self, token)
+        source = self._sources.pop()
+        source.end = token[3] + 1
+        source.children = list(source.obj.children)
+        source.properties = dict(source.obj.properties)
+        self._add_span(source)
+        self._separator_inherited = True
+
+    def _list_start(self, token: tuple):
+        parser.Parser._list_start(self, token)
+        l = self.hierarchy[-1]
+        self._separator_inherited = True
+        source = _ListSource(l.value, token[3])
+        if l.property is not None:
+            source.key = l.property
+            source.property_start = self._property_start
+        self.source.lists[id(l.value)] = source
+        self._sources.append(source)
+
+    def _list_end(self, token: tuple):
+        parser.Parser._list_end(self, token)
+        source = self._sources.pop()
+        source.end = token[3] + 1
+        source.items = list(source.value)
+        self._add_span(source)
+        self._separator_inherited = source.key is None
+
+    def _list_separator(self, token: tuple):
+        parser.Parser._list_separator(self, token)
+        self._separator_inherited = True
+
+    def _property_separator(self, token: tuple):
+        parser.Parser._property_separator(self, token)
+        if self._separator_inherited:
+            self.source.separators.append(token[3])
+
+    def _value_int(self, token: tuple):
+        self._value_token = token
+        parser.Parser._value_int(self, token)
+
+    def _value_float(self, token: tuple):
+        self._value_token = token
+        parser.Parser._value_float(self, token)
+
+    def _value_bool(self, token: tuple):
+        self._value_token = token
+        parser.Parser._value_bool(self, token)
+
+    def _value_string(self, token: tuple):
+        self._value_token = token
+        parser.Parser._value_string(self, token)
+
+    def _value(self, value):
+        key = self.current_property_tag
+        parser.Parser._value(self, value)
+        token = self._value_token
+        span = (token[3], token[3] + len(token[1].encode('utf-8')))
+        parent = self._sources[-1]
+        if type(parent) == _ListSource:
+            parent.item_spans.append((span[0], span[0], span[1]))
+            self._separator_inherited = True
+        else:
+            self._separator_inherited = False
+            parent.property_spans.setdefault(key, []).append((self._property_start, span[0], span[1]))
+
+
+def _lex_bytes(data: bytes) -> typing.Iterator[tuple]:
+    """
+    Lex UTF-8 encoded data with the token positions counted in bytes
+    Only the text patterns match non-ASCII whitespace, so data containing it is decoded and lexed as a string.
+    """
+    if lexer._text_whitespace_bytes_regex.search(data) is None:
+        return lexer.iter_lex_bytes(data)
+    return _byte_positions(str(data, 'utf-8'))
+
+
+def _byte_positions(text: str) -> typing.Iterator[tuple]:
+    pos = byte_pos = 0
+    for tag, value, flags, token_pos in lexer.lex(text):
+        byte_pos += len(text[pos:token_pos].encode('utf-8'))
+        pos = token_pos
+        yield tag, value, flags, byte_pos
+
+
+def _track(data: bytes, source: SourceMap, object_type: objects.BaseObject,
+           object_created_hook: typing.Callable) -> document.Document:
+    try:
+        doc = _TrackingParser(data, source, object_type, object_created_hook).parse(_lex_bytes(data))
+    except exceptions.ParseException as e:
+        error = e
+    else:
+        doc.source = source
+        return doc
+    # Report the error with the position counted in characters
+    parser.parse(str(data, 'utf-8'), object_type)
+    raise error
+
+
+def _stat(filename: str) -> tuple:
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load(filename: str, object_type: objects.BaseObject = objects.BoostedObject,
+         object_created_hook: typing.Callable = None) -> document.Document:
+    """
+    Load Unke file and track the source spans of its objects, lists and values, see save_changes()
+    :param filename: Filename to open
+    :param object_type: Class to be used to instantiate objects
+    :param object_created_hook: Function to be called after an object was created
+    :return: Unke document
+    """
+    source = SourceMap(os.path.abspath(filename))
+    source.stat = _stat(source.filename)
+    with open(source.filename, 'rb') as file:
+        data = file.read()
+    return _track(data, source, object_type, object_created_hook)
+
+
+def _transplant_object(parsed_source: SourceMap, source: SourceMap, parsed: objects.BaseObject,
+                       obj: objects.BaseObject):
+    entry = parsed_source.objects[id(parsed)]
+    entry.obj = obj
+    entry.name = obj.name
+    entry.children = list(obj.children)
+    entry.properties = dict(obj.properties)
+    source.objects[id(obj)] = entry
+    if len(parsed.children) == len(obj.children):
+        for parsed_child, child in zip(parsed.children, obj.children):
+            _transplant_object(parsed_source, source, parsed_child, child)
+    for key, value in obj.properties.items():
+        if key in parsed.properties:
+            _transplant_value(parsed_source, source, parsed.properties[key], value)
+
+
+def _transplant_value(parsed_source: SourceMap, source: SourceMap, parsed, value):
+    if isinstance(parsed, objects.BaseObject) and isinstance(value, objects.BaseObject):
+        _transplant_object(parsed_source, source, parsed, value)
+    elif type(parsed) == list and type(value) == list:
+        entry = parsed_source.lists[id(parsed)]
+        entry.value = value
+        entry.items = list(value)
+        source.lists[id(value)] = entry
+        if len(parsed) == len(value):
+            for parsed_item, item in zip(parsed, value):
+                _transplant_value(parsed_source, source, parsed_item, item)
+
+
+def _equal(parsed, value) -> bool:
+    # Names are compared as they are written, objects without name are written with the name None
+    if isinstance(value, objects.BaseObject):
+        return isinstance(parsed, objects.BaseObject) and str(parsed.name) == str(value.name) and \
+            len(parsed.children) == len(value.children) and \
+            all(_equal(parsed_child, child) for parsed_child, child in zip(parsed.children, value.children)) and \
+            list(parsed.properties) == list(value.properties) and \
+            all(_equal(parsed.properties[key], item) for key, item in value.properties.items())
+    if isinstance(value, numeric.array_types):
+        # Numeric lists are parsed back as regular lists
+        value = value.tolist()
+    if type(value) == list:
+        return type(parsed) == list and len(parsed) == len(value) and \
+            all(_equal(parsed_item, item) for parsed_item, item in zip(parsed, value))
+    return type(parsed) == type(value) and parsed == value
+
+
+def _remap_object(entry: _ObjectSource, shift: typing.Callable):
+    entry.start = shift(entry.start)
+    entry.end = shift(entry.end)
+    if entry.name_span is not None:
+        entry.name_span = (shift(entry.name_span[0]), shift(entry.name_span[1]))
+    entry.property_spans = {
+        key: [(shift(start), shift(value_start), shift(end)) for start, value_start, end in spans]
+        for key, spans in entry.property_spans.items()
+    }
+
+
+def _remap_list(entry: _ListSource, shift: typing.Callable):
+    entry.start = shift(entry.start)
+    entry.end = shift(entry.end)
+    entry.item_spans = [(shift(start), shift(value_start), shift(end)) for start, value_start, end in entry.item_spans]
+
+
+_whitespace = (b' ', b'\t', b'\r', b'\n', b'\x0b', b'\x0c')
+_space_bytes = frozenset(b' \t\r\n\x0b\x0c')
+# Characters of names and numbers, two tokens ending and starting with them would run into each other
+_word_bytes = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.')
+_comment_bytes = frozenset(b'/*')
+
+# Size of the chunks unchanged parts of a file are copied in
+_copy_chunk_size = 1 << 20
+
+# Kinds of edits: text that is not tracked, an object name, a serialized value and serialized children and properties
+(_Text, _Name, _Value, _Items) = range(4)
+
+
+class _Edits:
+    """
+    Collects the edits turning the loaded file into the current document
+    """
+    __slots__ = ('data', 'source', 'indent', 'newline', 'edits', 'structural_start', 'objects', 'lists')
+
+    def __init__(self, data: bytes, source: SourceMap, indent: int):
+        self.data = data
+        self.source = source
+        self.indent = indent
+        # Serialized values use the line breaks of the file
+        line_break = data.find(b'\n')
+        self.newline = '\r\n' if line_break > 0 and data[line_break - 1:line_break] == b'\r' else '\n'
+        # List of (start, end, replacement, kind, value the replacement stands for)
+        self.edits = []
+        # Position of the first edit adding or removing objects, lists or properties
+        self.structural_start = None
+        # Objects and lists kept in place, with their sources
+        self.objects = []
+        self.lists = []
+
+    def _line_whitespace(self, pos: int) -> str:
+        line_start = self.data.rfind(b'\n', 0, pos) + 1
+        line = self.data[line_start:pos]
+        return line[:len(line) - len(line.lstrip(b' \t'))].decode('utf-8')
+
+    def _structural(self, pos: int):
+        if self.structural_start is None or pos < self.structural_start:
+            self.structural_start = pos
+
+    def serialize(self, value, whitespace_pos: int) -> bytes:
+        """
+        Serialize a value indented like the line of a position
+        """
+        text = dump.value_to_string(value, 0, self.indent, no_leading_indent=True)
+        return text.replace('\n', self.newline + self._line_whitespace(whitespace_pos)).encode('utf-8')
+
+    def _replace(self, start: int, end: int, value, whitespace_pos: int, structural: bool = True):
+        if structural:
+            self._structural(start)
+        self.edits.append((start, end, self.serialize(value, whitespace_pos), _Value, value))
+
+    def _delete(self, start: int, end: int):
+        data = self.data
+        self._structural(start)
+        line_start = data.rfind(b'\n', 0, start) + 1
+        line_end = data.find(b'\n', end)
+        if line_end < 0:
+            line_end = len(data)
+        if data[line_start:start].strip() == b'' and data[end:line_end].strip(b' \t\r;') == b'':
+            # Remove the whole lines
+            self.edits.append((line_start, min(line_end + 1, len(data)), b'', _Text, None))
+            return
+        # Remove the whitespace in front of the property and a separator following it as well
+        while data[start - 1:start] in (b' ', b'\t'):
+            start -= 1
+        after = end
+        while data[after:after + 1] in (b' ', b'\t'):
+            after += 1
+        if data[after:after + 1] == b';':
+            end = after + 1
+        self.edits.append((start, end, b'', _Text, None))
+
+    def _insert(self, obj: objects.BaseObject, source: _ObjectSource, children: list, keys: list):
+        data = self.data
+        close = source.end - 1
+        whitespace = self._line_whitespace(source.start)
+        item_whitespace = whitespace + ' ' * self.indent
+        newline = self.newline
+        items = [dump.object_to_string(child, 0, self.indent, no_leading_indent=True) for child in children]
+        for key in keys:
+            items.append('{}: {}'.format(key, dump.value_to_string(
+                obj.properties[key], 0, self.indent, no_leading_indent=True
+            )))
+        # The whitespace in front of the closing brace is replaced, since a line break following whitespace
+        # is no line break token. Deletions reaching into that whitespace are merged into the insertion.
+        start = close
+        while True:
+            while start > source.start and data[start - 1:start] in _whitespace:
+                start -= 1
+            deletions = [edit for edit in self.edits if edit[2] == b'' and edit[0] < start <= edit[1]]
+            if len(deletions) == 0:
+                break
+            for deletion in deletions:
+                self.edits.remove(deletion)
+                start = min(start, deletion[0])
+        self._structural(start)
+        self.edits.append((start, close, (''.join(
+            newline + item_whitespace + item.replace('\n', newline + item_whitespace) for item in items
+        ) + newline + whitespace).encode('utf-8'), _Items, (obj, source, children, keys)))
+
+    def document(self, doc: document.Document):
+        root = self.source.root
+        if doc.root is None or root is None:
+            raise ValueError('Documents without root cannot be saved')
+        if doc.root is not root.obj:
+            self._replace(root.start, root.end, doc.root, root.start)
+        else:
+            self.object(doc.root, root)
+
+    def object(self, obj: objects.BaseObject, source: _ObjectSource):
+        # Removed children and properties are deleted and new ones are inserted in front of the closing brace.
+        # The whole object is replaced if the rest was renamed without a name span or reordered.
+        old_properties = source.properties
+        if obj.name == source.name and len(obj.children) == len(source.children) and \
+                all(map(operator.is_, obj.children, source.children)) and list(obj.properties) == list(old_properties):
+            # Most objects keep their children and properties, only the values are compared then
+            self.objects.append((obj, source))
+            for child in obj.children:
+                self.object(child, self.source.objects[id(child)])
+            for key, value in obj.properties.items():
+                self.value(value, old_properties[key], source.property_spans[key][-1])
+            return
+
+        old_children = [id(child) for child in source.children]
+        old_ids = set(old_children)
+        kept_children = [child for child in obj.children if id(child) in old_ids]
+        new_children = obj.children[len(kept_children):]
+        kept_ids = {id(child) for child in kept_children}
+        kept_keys = [key for key in obj.properties if key in old_properties]
+        new_keys = list(obj.properties)[len(kept_keys):]
+        reordered = [child_id for child_id in old_children if child_id in kept_ids] != \
+            [id(child) for child in kept_children]
+        if (obj.name != source.name and source.name_span is None) or reordered or \
+                any(id(child) in old_ids for child in new_children) or \
+                any(child_id not in self.source.objects for child_id in old_children) or \
+                [key for key in old_properties if key in obj.properties] != kept_keys or \
+                any(key in old_properties for key in new_keys):
+            self._replace(source.start, source.end, obj, source.start)
+            return
+
+        self.objects.append((obj, source))
+        if obj.name != source.name:
+            self.edits.append((source.name_span[0], source.name_span[1], str(obj.name).encode('utf-8'), _Name, None))
+        for child_id in old_children:
+            if child_id not in kept_ids:
+                child_source = self.source.objects[child_id]
+                if child_source.name is not None and child_source.name_span is None:
+                    # The name in front of the object would be left behind
+                    raise ValueError('The changes cannot be saved without reformatting "{}"'.format(
+                        self.source.filename
+                    ))
+                self._delete(child_source.start, child_source.end)
+        for child in kept_children:
+            self.object(child, self.source.objects[id(child)])
+        for key in old_properties:
+            if key not in obj.properties:
+                for span in source.property_spans[key]:
+                    self._delete(span[0], span[2])
+        for key in kept_keys:
+            self.value(obj.properties[key], old_properties[key], source.property_spans[key][-1])
+
+        if len(new_children) > 0 or len(new_keys) > 0:
+            self._insert(obj, source, new_children, new_keys)
+
+    def value(self, value, old_value, span: tuple):
+        if isinstance(value, objects.BaseObject):
+            if value is old_value and id(value) in self.source.objects:
+                self.object(value, self.source.objects[id(value)])
+                return
+        elif type(value) == list:
+            if value is old_value and id(value) in self.source.lists:
+                self.list(value, self.source.lists[id(value)])
+                return
+        elif type(value) == type(old_value) and value == old_value:
+            return
+        # Primitive values replacing each other do not change which separators are allowed
+        structural = isinstance(value, objects.BaseObject) or type(value) == list or \
+            isinstance(old_value, objects.BaseObject) or type(old_value) == list
+        self._replace(span[1], span[2], value, span[0], structural)
+
+    def separators(self):
+        """
+        Replace the separators not following a property value behind the first structural edit by line breaks
+        Whether such a separator is allowed depends on the last property value in front of it, which may have changed.
+        """
+        if self.structural_start is None:
+            return
+        data = self.data
+        edits = sorted(self.edits, key=lambda edit: (edit[0], edit[1]))
+        starts = [edit[0] for edit in edits]
+        for pos in self.source.separators:
+            if pos < self.structural_start:
+                continue
+            i = bisect.bisect_right(starts, pos)
+            if i > 0 and edits[i - 1][1] > pos:
+                # Removed or replaced anyway
+                continue
+            start = pos
+            while data[start - 1:start] in (b' ', b'\t'):
+                start -= 1
+            self.edits.append((start, pos + 1, self.newline.encode('utf-8'), _Text, None))
+
+    def list(self, value: list, source: _ListSource):
+        if len(value) != len(source.items):
+            self._replace(source.start, source.end, value, source.start)
+            return
+        self.lists.append((value, source))
+        for item, old_item, span in zip(value, source.items, source.item_spans):
+            self.value(item, old_item, span)
+
+
+class _Spliced:
+    """
+    The loaded data with the edits applied, read around the edits without copying the data
+    """
+    __slots__ = ('pieces', 'starts', 'size')
+
+    def __init__(self, data: bytes, edits: list):
+        # (data, position in the data) of each piece and the position of the piece in the new data
+        self.pieces = []
+        self.starts = []
+        pos = 0
+        size = 0
+        for start, end, replacement, kind, value in edits + [(len(data), len(data), b'', _Text, None)]:
+            for piece, piece_start, piece_end in ((data, pos, start), (replacement, 0, len(replacement))):
+                if piece_end > piece_start:
+                    self.pieces.append((piece, piece_start))
+                    self.starts.append(size)
+                    size += piece_end - piece_start
+            pos = end
+        self.size = size
+
+    def byte(self, pos: int) -> int:
+        """
+        Get the byte at a position of the new data, -1 outside of it
+        """
+        if pos < 0 or pos >= self.size:
+            return -1
+        i = bisect.bisect_right(self.starts, pos) - 1
+        piece, piece_start = self.pieces[i]
+        return piece[piece_start + pos - self.starts[i]]
+
+    def apart(self, pos: int) -> bool:
+        """
+        Check that the tokens in front of and behind a position do not run into each other
+        """
+        before = self.byte(pos - 1)
+        after = self.byte(pos)
+        if before in _word_bytes and (after in _word_bytes or after == ord(':')):
+            return False
+        if before in _comment_bytes and after in _comment_bytes:
+            return False
+        if before in _space_bytes and after in _space_bytes:
+            # A line break is only a token at the start of whitespace, otherwise it is swallowed by the whitespace
+            start = pos - 1
+            while self.byte(start - 1) in _space_bytes:
+                start -= 1
+            return not self._line_break(pos) or self._line_break(start)
+        return True
+
+    def _line_break(self, pos: int) -> bool:
+        return self.byte(pos) == ord('\n') or (self.byte(pos) == ord('\r') and self.byte(pos + 1) == ord('\n'))
+
+
+def _parse_fragment(text: bytes, filename: str) -> tuple:
+    """
+    Parse serialized text wrapped into a root object and track its positions
+    :return: Tuple of the wrapping root object and the source map
+    """
+    fragment_source = SourceMap(filename)
+    fragment = _TrackingParser(text, fragment_source, objects.BoostedObject, None).parse(lexer.iter_lex_bytes(text))
+    return fragment.root, fragment_source
+
+
+def _shift_fragment(fragment_source: SourceMap, offset: int):
+    def shift(pos):
+        return pos + offset
+    for entry in fragment_source.objects.values():
+        _remap_object(entry, shift)
+    for entry in fragment_source.lists.values():
+        _remap_list(entry, shift)
+    fragment_source.separators = [shift(pos) for pos in fragment_source.separators]
+
+
+def _validate(data: bytes, edits: list, filename: str) -> list:
+    """
+    Check the edits without parsing the file again
+    Every replacement is parsed on its own and compared with the value it stands for. The text around the
+    edits is only checked for tokens running into each other.
+    :param data: Loaded data
+    :param edits: Sorted edits
+    :param filename: Filename the positions refer to
+    :return: List of (edit, position in the new data, parsed root object, source map) for each edit
+    """
+    error = ValueError('The changes cannot be saved without reformatting "{}", the text around them would be '
+                       'read differently'.format(filename))
+    if any(edit[0] < previous[1] for previous, edit in zip(edits, edits[1:])):
+        raise error
+    spliced = _Spliced(data, edits)
+    checked = []
+    offset = 0
+    for edit in edits:
+        start, end, replacement, kind, value = edit
+        new_start = start + offset
+        offset += len(replacement) - (end - start)
+        if not spliced.apart(new_start) or not spliced.apart(new_start + len(replacement)):
+            raise error
+        fragment = fragment_source = None
+        try:
+            if _Name == kind:
+                if [token[0] for token in lexer.iter_lex_bytes(replacement)] != [grammar.Tag.ObjectTag]:
+                    raise error
+            elif _Value == kind:
+                fragment, fragment_source = _parse_fragment(b'R{x:' + replacement + b'\n}', filename)
+                if not _equal(fragment.properties.get('x'), value):
+                    raise error
+                _shift_fragment(fragment_source, new_start - 4)
+            elif _Items == kind:
+                obj, source, children, keys = value
+                fragment, fragment_source = _parse_fragment(b'R{' + replacement + b'}', filename)
+                if len(fragment.children) != len(children) or list(fragment.properties) != keys or \
+                        not all(_equal(parsed, child) for parsed, child in zip(fragment.children, children)) or \
+                        not all(_equal(fragment.properties[key], obj.properties[key]) for key in keys):
+                    raise error
+                _shift_fragment(fragment_source, new_start - 2)
+        except exceptions.ParseException:
+            raise error from None
+        checked.append((edit, new_start, fragment, fragment_source))
+    return checked
+
+
+def _track_edits(collector: _Edits, checked: list, filename: str) -> SourceMap:
+    """
+    Build the source map of the saved file
+    The positions of the objects, lists and values kept in place are shifted by the size of the edits in front of
+    them, the ones of the replacements are taken from their parse.
+    """
+    new_source = SourceMap(filename)
+    edits = [edit for edit, new_start, fragment, fragment_source in checked]
+    starts = [edit[0] for edit in edits]
+    ends = [edit[1] for edit in edits]
+    # Size difference of the data in front of each edit
+    offsets = [0]
+    for start, end, replacement, kind, value in edits:
+        offsets.append(offsets[-1] + len(replacement) - (end - start))
+
+    def shift(pos):
+        i = bisect.bisect_right(ends, pos)
+        # Text inserted at a position is put behind it
+        while i > 0 and edits[i - 1][0] == pos:
+            i -= 1
+        return pos + offsets[i]
+
+    # Positions in front of the first edit changing the size stay the same
+    resized = next((edit[0] for edit, offset in zip(edits, offsets[1:]) if offset != 0), None)
+    for obj, entry in collector.objects:
+        entry.name = obj.name
+        entry.children = list(obj.children)
+        entry.properties = dict(obj.properties)
+        entry.property_spans = {key: spans for key, spans in entry.property_spans.items() if key in obj.properties}
+        if resized is not None and entry.end > resized:
+            _remap_object(entry, shift)
+        new_source.objects[id(obj)] = entry
+    for value, entry in collector.lists:
+        entry.items = list(value)
+        if resized is not None and entry.end > resized:
+            _remap_list(entry, shift)
+        new_source.lists[id(value)] = entry
+    for pos in collector.source.separators:
+        i = bisect.bisect_right(starts, pos)
+        if i == 0 or edits[i - 1][1] <= pos:
+            new_source.separators.append(shift(pos))
+
+    for (start, end, replacement, kind, value), new_start, fragment, fragment_source in checked:
+        if _Value == kind:
+            _transplant_value(fragment_source, new_source, fragment.properties['x'], value)
+        elif _Items == kind:
+            obj, source, children, keys = value
+            for parsed, child in zip(fragment.children, children):
+                _transplant_object(fragment_source, new_source, parsed, child)
+            for key in keys:
+                _transplant_value(fragment_source, new_source, fragment.properties[key], obj.properties[key])
+                source.property_spans[key] = fragment_source.objects[id(fragment)].property_spans[key]
+        else:
+            continue
+        new_source.separators.extend(fragment_source.separators)
+    new_source.separators.sort()
+    return new_source
+
+
+def save_changes(doc: document.Document, filename: str = None, indent: int = 4) -> int:
+    """
+    Save the changes made to a document loaded with position tracking
+    Only the byte ranges of changed properties, objects and list items are rewritten, everything else,
+    including comments and formatting, is left untouched. Changed values and new properties or children
+    are serialized with the indentation of their surroundings. The file is memory-mapped rather than read,
+    only the serialized values are parsed to check them and to track their positions. The positions behind
+    them are shifted by the size of the changes.
+    If all changes keep their size, they are written in place. Otherwise the file is written to a temporary
+    file that replaces it, so it is never left half written.
+    Changes that would alter how the text around them is read raise a ValueError, the document can be saved
+    with dump() then.
+    :param doc: Document loaded with position tracking, e.g. by load(filename, track_positions=True)
+    :param filename: Filename to save to, the file the document was loaded from if None
+    :param indent: Indentation in spaces of serialized values
+    :return: Number of changed byte ranges
+    """
+    source = doc.source
+    if source is None:
+        raise ValueError('The document was not loaded with position tracking')
+    if _stat(source.filename) != source.stat:
+        raise ValueError('The file "{}" was changed since it was loaded'.format(source.filename))
+
+    target = source.filename if filename is None else os.path.abspath(filename)
+    temp_filename = None
+    with open(source.filename, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        collector = _Edits(data, source, indent)
+        collector.document(doc)
+        collector.separators()
+        edits = sorted(collector.edits, key=lambda edit: (edit[0], edit[1]))
+        checked = _validate(data, edits, target)
+        if target != source.filename or any(len(edit[2]) != edit[1] - edit[0] for edit in edits):
+            # Write to a temporary file first, so the file is never left half written
+            file_descriptor, temp_filename = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'wb') as temp_file:
+                    pos = 0
+                    for start, end, replacement, kind, value in edits + [(len(data), len(data), b'', _Text, None)]:
+                        # The unchanged parts are copied chunk by chunk
+                        while pos < start:
+                            chunk_end = min(start, pos + _copy_chunk_size)
+                            temp_file.write(data[pos:chunk_end])
+                            pos = chunk_end
+                        temp_file.write(replacement)
+                        pos = end
+                shutil.copymode(source.filename, temp_filename)
+            except BaseException:
+                os.remove(temp_filename)
+                raise
+
+    if temp_filename is not None:
+        try:
+            os.replace(temp_filename, target)
+        except BaseException:
+            os.remove(temp_filename)
+            raise
+    elif len(edits) > 0:
+        # Changes keeping their size are written in place
+        with open(target, 'r+b') as file:
+            for start, end, replacement, kind, value in edits:
+                file.seek(start)
+                file.write(replacement)
+
+    new_source = _track_edits(collector, checked, target)
+    new_source.root = new_source.objects[id(doc.root)]
+    new_source.stat = _stat(target)
+    doc.source = new_source
+    return len(edits)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8
+
+import time
+import typing
+
+from . import grammar
+
+
+class Phase:
+    """
+    Phases reported to Tracer.phase_started() and Tracer.phase_finished()
+    """
+    # Whole parse, from the first token to the finished document
+    Total = 'total'
+    # Lexing a string before it is parsed, token streams are lexed while they are parsed
+    Lex = 'lex'
+    # Handling the tokens, including lexing token streams and calling the object created hook
+    Parse = 'parse'
+
+
+# Tag names by tag, e.g. {0: 'BlockStart'}
+tag_names = {value: name for name, value in vars(grammar.Tag).items() if not name.startswith('_')}
+
+
+class Tracer:
+    """
+    Receiver of the events of an instrumented parse, see unke.loads()
+    All callbacks do nothing, subclasses override the ones they need, e.g. to attach an external profiler
+    to the phases. Durations are in seconds as measured by time.perf_counter().
+    """
+
+    def phase_started(self, phase: str):
+        """
+        :param phase: Phase, see Phase
+        """
+        pass
+
+    def phase_finished(self, phase: str, duration: float):
+        """
+        :param phase: Phase, see Phase
+        :param duration: Wall time of the phase, including the phases and callbacks nested in it
+        """
+        pass
+
+    def chunk_read(self, size: int, duration: float):
+        """
+        Called for every chunk read from a file, files are read while their tokens are lexed
+        :param size: Number of bytes read
+        :param duration: Time spent reading
+        """
+        pass
+
+    def tokens_lexed(self, counts: dict, duration: float):
+        """
+        Called once per parse after the last token was lexed
+        :param counts: Number of tokens by tag, see grammar.Tag
+        :param duration: Time spent lexing, including reading from a file while lexing
+        """
+        pass
+
+    def object_created(self, obj, depth: int):
+        """
+        :param obj: Object that was opened, its properties and children are not parsed yet
+        :param depth: Number of objects and lists the object is nested in, including itself
+        """
+        pass
+
+    def list_created(self, depth: int):
+        """
+        :param depth: Number of objects and lists the list is nested in, including itself
+        """
+        pass
+
+    def hook_called(self, obj, duration: float):
+        """
+        :param obj: Object the object created hook was called with
+        :param duration: Time spent in the hook
+        """
+        pass
+
+
+class Stats(Tracer):
+    """
+    Tracer collecting parse statistics
+    The statistics of all parses a Stats instance is passed to add up, so it can also sum up a batch of files.
+    """
+
+    def __init__(self):
+        self.parses = 0
+        # Wall time of all parses
+        self.total_time = 0.0
+        self.read_time = 0.0
+        # Lexing time, including the time spent reading while lexing
+        self.lexed_time = 0.0
+        self.hook_time = 0.0
+        self.bytes_read = 0
+        # Number of tokens by tag, see grammar.Tag
+        self.token_counts = {}
+        self.objects_created = 0
+        self.lists_created = 0
+        self.max_depth = 0
+        self.hook_calls = 0
+
+    @property
+    def lex_time(self) -> float:
+        """
+        Time spent lexing, not including reading
+        """
+        return max(self.lexed_time - self.read_time, 0.0)
+
+    @property
+    def parse_time(self) -> float:
+        """
+        Time spent handling the tokens, not including lexing, reading and the object created hook
+        """
+        return max(self.total_time - self.read_time - self.lex_time - self.hook_time, 0.0)
+
+    def phase_finished(self, phase: str, duration: float):
+        if Phase.Total == phase:
+            self.parses += 1
+            self.total_time += duration
+
+    def chunk_read(self, size: int, duration: float):
+        self.bytes_read += size
+        self.read_time += duration
+
+    def tokens_lexed(self, counts: dict, duration: float):
+        for tag, count in counts.items():
+            self.token_counts[tag] = self.token_counts.get(tag, 0) + count
+        self.lexed_time += duration
+
+    def object_created(self, obj, depth: int):
+        self.objects_created += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def list_created(self, depth: int):
+        self.lists_created += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def hook_called(self, obj, duration: float):
+        self.hook_calls += 1
+        self.hook_time += duration
+
+    def to_dict(self) -> dict:
+        """
+        :return: Statistics as dict, the phase times in seconds and the token counts by tag name
+        """
+        return {
+            'parses': self.parses,
+            'time': {
+                'total': self.total_time,
+                'read': self.read_time,
+                'lex': self.lex_time,
+                'parse': self.parse_time,
+                'hook': self.hook_time
+            },
+            'bytes_read': self.bytes_read,
+            'tokens': {tag_names[tag]: count for tag, count in sorted(self.token_counts.items())},
+            'objects_created': self.objects_created,
+            'lists_created': self.lists_created,
+            'max_depth': self.max_depth,
+            'hook_calls': self.hook_calls
+        }
+
+    def __repr__(self):
+        return 'Stats({} parses, {} objects, {} tokens, {:.6f} s)'.format(
+            self.parses, self.objects_created, sum(self.token_counts.values()), self.total_time
+        )
+
+
+class TracedFile:
+    """
+    Read-only file object wrapper reporting every read to a tracer, see Tracer.chunk_read()
+    For text files the bytes consumed from the underlying binary buffer are reported, otherwise the size of the chunk.
+    """
+    __slots__ = ('file', 'tracer', '_buffer')
+
+    def __init__(self, file: typing.IO, tracer: Tracer):
+        """
+        :param file: Text or binary file object
+        :param tracer: Tracer to report to
+        """
+        self.file = file
+        self.tracer = tracer
+        self._buffer = getattr(file, 'buffer', None)
+
+    def read(self, size: int = -1) -> str or bytes:
+        buffer = self._buffer
+        position = buffer.tell() if buffer is not None else 0
+        start = time.perf_counter()
+        chunk = self.file.read(size)
+        duration = time.perf_counter() - start
+        self.tracer.chunk_read(buffer.tell() - position if buffer is not None else len(chunk), duration)
+        return chunk